@@ -4,15 +4,12 @@ Script to add popular cocktails to the database
 """
 import sys
 from database.db_manager import DatabaseManager
+from database.importer import CatalogImporter
 
 def add_new_cocktails(db_path: str):
     """Add popular cocktails that are missing"""
     db = DatabaseManager(db_path)
     
-    # Check which cocktails already exist
-    existing = db.execute_query("SELECT name FROM cocktails")
-    existing_names = {c['name'].lower() for c in existing}
-    
     # Define new cocktails to add
     new_cocktails = [
         {
@@ -41,7 +38,7 @@ def add_new_cocktails(db_path: str):
             'ingredients': [
                 {'liquid': 'Vodka', 'amount': 4.5, 'unit': 'cl'},
                 {'liquid': 'Lime juice', 'amount': 1.5, 'unit': 'cl'},
-                {'liquid': 'Soda water', 'amount': 12, 'unit': 'cl'},  # Using soda as substitute for ginger beer
+                {'liquid': 'Ginger beer', 'amount': 12, 'unit': 'cl'},
             ]
         },
         {
@@ -166,59 +163,22 @@ def add_new_cocktails(db_path: str):
         },
     ]
     
-    # Get liquid name to ID mapping
-    liquids = db.get_all_liquids()
-    liquid_map = {l['name'].lower(): l['id'] for l in liquids}
-    
-    added_count = 0
-    skipped_count = 0
-    
-    for cocktail in new_cocktails:
-        name = cocktail['name']
-        
-        # Check if cocktail already exists
-        if name.lower() in existing_names:
-            print(f"⏭️  Skipping '{name}' - already exists")
-            skipped_count += 1
-            continue
-        
-        try:
-            # Add cocktail
-            cocktail_id = db.add_cocktail(
-                name=name,
-                timing=cocktail.get('timing'),
-                taste=cocktail.get('taste'),
-                preparation=cocktail.get('preparation'),
-                glass_type=cocktail.get('glass_type'),
-                garnish=cocktail.get('garnish'),
-                description=cocktail.get('description')
-            )
-            
-            # Add ingredients
-            for ingredient in cocktail['ingredients']:
-                liquid_name = ingredient['liquid']
-                liquid_id = liquid_map.get(liquid_name.lower())
-                
-                if not liquid_id:
-                    print(f"⚠️  Warning: Liquid '{liquid_name}' not found for {name}")
-                    continue
-                
-                db.add_cocktail_ingredient(
-                    cocktail_id=cocktail_id,
-                    liquid_id=liquid_id,
-                    amount=ingredient['amount'],
-                    unit=ingredient['unit'],
-                    is_optional=ingredient.get('is_optional', False)
-                )
-            
-            print(f"✅ Added '{name}' (ID: {cocktail_id})")
-            added_count += 1
-            
-        except Exception as e:
-            print(f"❌ Error adding '{name}': {e}")
-    
-    print(f"\n📊 Summary: Added {added_count} cocktails, Skipped {skipped_count} existing")
-    return added_count
+    # Soda water is poured when no ginger beer is installed
+    ginger_beer_id = db.get_or_create_liquid('Ginger beer', 'mixer')
+    soda_water_id = db.get_or_create_liquid('Soda water', 'mixer')
+    db.set_liquid_substitution(ginger_beer_id, soda_water_id, 1.0)
+
+    # Existing cocktails are kept; ingredients with unknown liquids are dropped
+    importer = CatalogImporter(db, skip_existing=True, missing_liquids='drop')
+    report = importer.import_records(new_cocktails)
+
+    for name in report.skipped:
+        print(f"⏭️  Skipping '{name}' - already exists")
+    for name in report.added:
+        print(f"✅ Added '{name}'")
+
+    print(f"\n{report.summary()}")
+    return len(report.added)
 
 
 if __name__ == '__main__':
@@ -6,15 +6,12 @@ Script to add cocktails using available liquids:
 """
 import sys
 from database.db_manager import DatabaseManager
+from database.importer import CatalogImporter
 
 def add_simple_cocktails(db_path: str):
     """Add cocktails using available liquids"""
     db = DatabaseManager(db_path)
     
-    # Check which cocktails already exist
-    existing = db.execute_query("SELECT name FROM cocktails")
-    existing_names = {c['name'].lower() for c in existing}
-    
     # Get liquid name to ID mapping
     liquids = db.get_all_liquids()
     liquid_map = {l['name'].lower(): l['id'] for l in liquids}
@@ -236,70 +233,15 @@ def add_simple_cocktails(db_path: str):
         },
     ]
     
-    added_count = 0
-    skipped_count = 0
-    missing_ingredients = 0
-    
-    for cocktail in new_cocktails:
-        name = cocktail['name']
-        
-        # Check if cocktail already exists
-        if name.lower() in existing_names:
-            print(f"⏭️  Skipping '{name}' - already exists")
-            skipped_count += 1
-            continue
-        
-        # Check if all ingredients are available
-        all_ingredients_available = True
-        missing = []
-        for ingredient in cocktail['ingredients']:
-            liquid_name = ingredient['liquid']
-            if liquid_name.lower() not in liquid_map:
-                all_ingredients_available = False
-                missing.append(liquid_name)
-        
-        if not all_ingredients_available:
-            print(f"⚠️  Skipping '{name}' - missing: {', '.join(missing)}")
-            missing_ingredients += 1
-            continue
-        
-        try:
-            # Add cocktail
-            cocktail_id = db.add_cocktail(
-                name=name,
-                timing=cocktail.get('timing'),
-                taste=cocktail.get('taste'),
-                preparation=cocktail.get('preparation'),
-                glass_type=cocktail.get('glass_type'),
-                garnish=cocktail.get('garnish'),
-                description=cocktail.get('description')
-            )
-            
-            # Add ingredients
-            for ingredient in cocktail['ingredients']:
-                liquid_name = ingredient['liquid']
-                liquid_id = liquid_map.get(liquid_name.lower())
-                
-                db.add_cocktail_ingredient(
-                    cocktail_id=cocktail_id,
-                    liquid_id=liquid_id,
-                    amount=ingredient['amount'],
-                    unit=ingredient['unit'],
-                    is_optional=ingredient.get('is_optional', False)
-                )
-            
-            print(f"✅ Added '{name}' (ID: {cocktail_id})")
-            added_count += 1
-            
-        except Exception as e:
-            print(f"❌ Error adding '{name}': {e}")
-    
-    print(f"\n📊 Summary:")
-    print(f"   ✅ Added: {added_count} cocktails")
-    print(f"   ⏭️  Skipped (already exist): {skipped_count}")
-    print(f"   ⚠️  Skipped (missing ingredients): {missing_ingredients}")
-    
-    return added_count
+    # Existing cocktails are kept; cocktails needing unknown liquids are skipped
+    importer = CatalogImporter(db, skip_existing=True, missing_liquids='skip')
+    report = importer.import_records(new_cocktails)
+
+    for name in report.added:
+        print(f"✅ Added '{name}'")
+
+    print(f"\n{report.summary()}")
+    return len(report.added)
 
 
 if __name__ == '__main__':
@@ -1,55 +1,217 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
-from models import Cocktail, CocktailWithAvailability, MakeCocktailRequest, ApiResponse
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from models import (Cocktail, CocktailSearchResult, CocktailWithAvailability, MakeCocktailRequest, ApiResponse,
+                    SimilarCocktail)
+from api.responses import AVAILABILITY_GROUPS, JsonBody, conditional_json
+from services.availability import RESPONSE_FIELDS
 
 router = APIRouter(prefix="/cocktails", tags=["Cocktails"])
 
+MAX_PAGE_SIZE = 500
+MAX_SEARCH_RESULTS = 100
+MAX_SIMILAR_RESULTS = 50
 
-@router.get("", response_model=List[CocktailWithAvailability])
-async def get_all_cocktails(mixer_service):
-    """Get all cocktails with availability information"""
-    return mixer_service.get_available_cocktails()
 
+class IngredientImport(BaseModel):
+    """Ingredient of an imported cocktail (liquid referenced by name)"""
+    ingredient: str
+    amount: float
+    unit: str = "cl"
+    is_optional: bool = False
 
-@router.get("/available", response_model=List[CocktailWithAvailability])
-async def get_available_cocktails(mixer_service):
-    """Get only cocktails that can be made with current liquids"""
-    return mixer_service.get_makeable_cocktails()
 
+class CocktailImport(BaseModel):
+    """Cocktail recipe to import"""
+    name: str
+    timing: Optional[str] = None
+    taste: Optional[str] = None
+    preparation: Optional[str] = None
+    glass_type: Optional[str] = None
+    garnish: Optional[str] = None
+    description: Optional[str] = None
+    ingredients: List[IngredientImport] = Field(default_factory=list)
 
-@router.get("/{cocktail_name}", response_model=CocktailWithAvailability)
-async def get_cocktail(cocktail_name: str, mixer_service):
-    """Get specific cocktail details"""
-    cocktails = mixer_service.get_available_cocktails()
 
-    # Find the cocktail by name
-    cocktail_data = next(
-        (c for c in cocktails if c.name.lower() == cocktail_name.lower()), None)
+class CatalogImportRequest(BaseModel):
+    """Request to bulk import cocktails"""
+    cocktails: List[CocktailImport]
+    skip_existing: bool = False  # Keep existing cocktails instead of updating them
+    missing_liquids: Literal["create", "drop", "skip"] = "create"
+    dry_run: bool = False
+
+
+def _cocktail_response(db, cocktail_name: str) -> dict:
+    """Response for a single cocktail, 404 if it does not exist"""
+    entry = db.find_cocktail(cocktail_name)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cocktail '{cocktail_name}' not found"
+        )
+    return entry.response
+
 
-    if not cocktail_data:
+def _similar_response(db, cocktail_name: str, available: bool, limit: int) -> List[dict]:
+    """Similar cocktails, 404 if the cocktail does not exist"""
+    similar = db.find_similar_cocktails(cocktail_name, available=available or None, limit=limit)
+    if similar is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Cocktail '{cocktail_name}' not found"
         )
+    return similar
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated fields= projection"""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in RESPONSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(RESPONSE_FIELDS)})"
+        )
+    return selected
+
+
+@router.get("", response_model=List[CocktailWithAvailability])
+async def get_all_cocktails(request: Request, db_service, *,
+                            taste: Optional[str] = None,
+                            timing: Optional[str] = None,
+                            preparation: Optional[str] = None,
+                            glass_type: Optional[str] = None,
+                            available: Optional[bool] = None,
+                            contains_liquid_id: List[int] = Query(default=[]),
+                            cursor: Optional[str] = None,
+                            limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+                            fields: Optional[str] = None):
+    """
+    Get all cocktails with availability information
+
+    Optional filters (taste, timing, preparation, glass_type, available,
+    contains_liquid_id - repeatable, all must be used), cursor pagination
+    (limit, then cursor=X-Next-Cursor of the previous page) and a fields=
+    projection such as fields=name,is_available. X-Total-Count holds the
+    number of matches over all pages.
+    """
+    projection = _parse_fields(fields)
+    filters = {
+        name: value for name, value in
+        (('taste', taste), ('timing', timing), ('preparation', preparation), ('glass_type', glass_type))
+        if value
+    }
+
+    def build_page() -> JsonBody:
+        try:
+            page = db_service.sync.query_cocktails(
+                filters=filters, available=available, liquid_ids=contains_liquid_id,
+                cursor=cursor, limit=limit, fields=projection
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        headers = {"X-Total-Count": str(page.total)}
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        return JsonBody(page.items, headers)
+
+    # Build and encode the (large) catalog on a database thread, not the event loop
+    return await conditional_json(request, db_service, AVAILABILITY_GROUPS, build_page, bulk=True)
+
+
+@router.get("/available", response_model=List[CocktailWithAvailability])
+async def get_available_cocktails(request: Request, mixer_service, db_service):
+    """Get only cocktails that can be made with current liquids"""
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS, mixer_service.get_makeable_cocktails, bulk=True)
+
+
+@router.get("/search", response_model=List[CocktailSearchResult])
+async def search_cocktails(request: Request, db_service, *,
+                           q: str = Query(min_length=1, max_length=200),
+                           available: Optional[bool] = None,
+                           limit: int = Query(default=20, ge=1, le=MAX_SEARCH_RESULTS)):
+    """
+    Full-text search over cocktail names, descriptions, garnishes and ingredients
+
+    Every word of q must match the start of a word (q=gin lim finds
+    "Gin Gimlet" via "Lime Juice"). Results are ranked by relevance and can
+    be restricted to makeable (available=true) or unavailable cocktails.
+    """
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS, db_service.sync.search_cocktails, q, available, limit)
+
+
+@router.post("/import", response_model=ApiResponse)
+async def import_cocktails(request: CatalogImportRequest, db_service):
+    """Bulk import (upsert) cocktails in a single transaction"""
+    try:
+        report = await db_service.run_bulk(
+            db_service.sync.import_cocktails,
+            [cocktail.model_dump() for cocktail in request.cocktails],
+            skip_existing=request.skip_existing,
+            missing_liquids=request.missing_liquids,
+            dry_run=request.dry_run
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Import failed: {str(e)}"
+        )
+
+    return ApiResponse(
+        success=True,
+        message=f"Imported {report['rows']} rows ({report['rows_per_second']} rows/s)",
+        data=report
+    )
 
-    return cocktail_data
+
+@router.get("/{cocktail_name}", response_model=CocktailWithAvailability)
+async def get_cocktail(request: Request, cocktail_name: str, db_service):
+    """Get specific cocktail details (by name or slug)"""
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS, _cocktail_response, db_service.sync, cocktail_name)
+
+
+@router.get("/{cocktail_name}/similar", response_model=List[SimilarCocktail])
+async def get_similar_cocktails(request: Request, cocktail_name: str, db_service, *,
+                                available: bool = True,
+                                limit: int = Query(default=5, ge=1, le=MAX_SIMILAR_RESULTS)):
+    """
+    Cocktails with the most similar ingredients (e.g. alternatives to an unavailable one)
+
+    Only makeable cocktails by default; available=false includes all.
+    Scores are the Jaccard similarity of the liquids used.
+    """
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS, _similar_response, db_service.sync, cocktail_name,
+        available, limit)
 
 
 @router.post("/{cocktail_name}/make", response_model=ApiResponse)
-async def make_cocktail(cocktail_name: str, request: MakeCocktailRequest, mixer_service):
+async def make_cocktail(cocktail_name: str, request: MakeCocktailRequest, mixer_service, db_service):
     """Start making a cocktail"""
-    # Check if cocktail exists
-    can_make, missing = mixer_service.can_make_cocktail(cocktail_name)
+    # Look the cocktail up once; the recipe is passed down to the mixing thread
+    entry = await db_service.find_cocktail(cocktail_name)
+
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cocktail '{cocktail_name}' not found"
+        )
 
-    if not can_make:
+    if not entry.is_available:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot make cocktail. Missing ingredients: {', '.join(missing)}"
+            detail=f"Cannot make cocktail. Missing ingredients: {', '.join(entry.missing_ingredients)}"
         )
 
     # Start making the cocktail
-    success = mixer_service.make_cocktail(
-        cocktail_name, request.size_multiplier)
+    success = await db_service.run(
+        mixer_service.make_cocktail, entry.name, request.size_multiplier, entry)
 
     if not success:
         raise HTTPException(
@@ -59,9 +221,9 @@ async def make_cocktail(cocktail_name: str, request: MakeCocktailRequest, mixer_
 
     return ApiResponse(
         success=True,
-        message=f"Started making {cocktail_name}",
+        message=f"Started making {entry.name}",
         data={
-            "cocktail_name": cocktail_name,
+            "cocktail_name": entry.name,
             "size_multiplier": request.size_multiplier
         }
     )
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
-from typing import List
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from models import ApiResponse
+from api.responses import AVAILABILITY_GROUPS, conditional_json
 
 router = APIRouter(prefix="/liquids", tags=["Liquids"])
 
@@ -10,13 +12,169 @@ class Liquid(BaseModel):
     name: str
 
 
+class LiquidSuggestion(BaseModel):
+    """Autocomplete match for a liquid"""
+    id: int
+    name: str
+    cocktail_count: int  # Cocktails using this liquid
+    alias: Optional[str] = None  # Set when only an alias matched
+
+
+class LiquidRecommendation(BaseModel):
+    """Liquid worth buying next"""
+    liquid_id: int
+    liquid: str
+    unlocks: int  # Cocktails missing only this liquid
+    cocktails: List[str]  # Their names
+    closer: int  # Cocktails this liquid would leave one liquid short
+
+
+class LiquidSubstitute(BaseModel):
+    """Liquid that may be poured instead of another"""
+    liquid_id: int
+    liquid: Optional[str] = None
+    ratio: float  # ml poured per ml the recipe asks for
+
+
+class LiquidSubstitutionUpdate(BaseModel):
+    """Substitution rule settings"""
+    ratio: float = Field(default=1.0, gt=0, le=10)
+
+
+class LiquidAliasCreate(BaseModel):
+    """Alternative name for a liquid"""
+    alias: str = Field(min_length=1, max_length=100)
+
+
+class LiquidCalibration(BaseModel):
+    """Current flow rate of a liquid and statistics over its calibration history"""
+    liquid_id: int
+    ml_per_second: Optional[float] = None
+    calibrated_at: Optional[str] = None
+    sample_count: int = 0
+    mean_ml_per_second: Optional[float] = None
+    stddev_ml_per_second: Optional[float] = None
+
+
+def _liquid_models(liquids: List[dict]) -> List[Liquid]:
+    return [Liquid(**liquid) for liquid in liquids]
+
+
 @router.get("", response_model=List[Liquid])
-async def get_all_liquids(db_service):
+async def get_all_liquids(request: Request, db_service):
     """Get all unique liquids from cocktail database with IDs"""
-    return db_service.get_all_liquids_with_ids()
+    return await conditional_json(
+        request, db_service, ('catalog',),
+        lambda: _liquid_models(db_service.sync.get_all_liquids_with_ids()))
 
 
 @router.get("/installed", response_model=List[Liquid])
-async def get_installed_liquids(db_service):
+async def get_installed_liquids(request: Request, db_service):
     """Get liquids currently installed in pumps with IDs"""
-    return db_service.get_installed_liquids_with_ids()
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS,
+        lambda: _liquid_models(db_service.sync.get_installed_liquids_with_ids()))
+
+
+@router.get("/suggest", response_model=List[LiquidSuggestion])
+async def suggest_liquids(request: Request, db_service, *,
+                          prefix: str = Query(min_length=1, max_length=100),
+                          limit: int = Query(default=10, ge=1, le=50)):
+    """Autocomplete liquids by a prefix of any word of their name or alias, most used first"""
+    return await conditional_json(
+        request, db_service, ('catalog',), db_service.sync.suggest_liquids, prefix, limit)
+
+
+@router.get("/recommendations", response_model=List[LiquidRecommendation])
+async def get_liquid_recommendations(request: Request, db_service, *,
+                                     limit: int = Query(default=10, ge=1, le=100)):
+    """Liquids to buy next, ranked by how many cocktails they unlock with the installed pumps"""
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS, db_service.sync.get_next_bottles, limit)
+
+
+@router.post("/{liquid_id}/aliases", response_model=ApiResponse)
+async def add_liquid_alias(liquid_id: int, request: LiquidAliasCreate, db_service):
+    """Add an alternative name that the autocomplete matches for a liquid"""
+    if not await db_service.get_liquid_by_id(liquid_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Liquid {liquid_id} not found"
+        )
+
+    try:
+        await db_service.add_liquid_alias(liquid_id, request.alias.strip())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    return ApiResponse(
+        success=True,
+        message=f"Added alias '{request.alias.strip()}'",
+        data={"liquid_id": liquid_id, "alias": request.alias.strip()}
+    )
+
+
+async def _require_liquids(db_service, *liquid_ids: int):
+    """404 unless every liquid exists"""
+    for liquid_id in liquid_ids:
+        if not await db_service.get_liquid_by_id(liquid_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Liquid {liquid_id} not found"
+            )
+
+
+@router.get("/{liquid_id}/substitutes", response_model=List[LiquidSubstitute])
+async def get_liquid_substitutes(request: Request, liquid_id: int, db_service):
+    """Liquids that may be poured instead of this one (including chains), nearest first"""
+    await _require_liquids(db_service, liquid_id)
+    return await conditional_json(
+        request, db_service, ('catalog',), db_service.sync.get_liquid_substitutes, liquid_id)
+
+
+@router.put("/{liquid_id}/substitutes/{substitute_id}", response_model=ApiResponse)
+async def set_liquid_substitute(liquid_id: int, substitute_id: int, update: LiquidSubstitutionUpdate, db_service):
+    """Allow a substitute to be poured when a recipe asks for this liquid (one direction only)"""
+    await _require_liquids(db_service, liquid_id, substitute_id)
+    try:
+        await db_service.set_liquid_substitution(liquid_id, substitute_id, update.ratio)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return ApiResponse(
+        success=True,
+        message=f"Liquid {substitute_id} may now replace liquid {liquid_id}",
+        data={"liquid_id": liquid_id, "substitute_id": substitute_id, "ratio": update.ratio}
+    )
+
+
+@router.delete("/{liquid_id}/substitutes/{substitute_id}", response_model=ApiResponse)
+async def delete_liquid_substitute(liquid_id: int, substitute_id: int, db_service):
+    """Remove a substitution rule"""
+    if not await db_service.delete_liquid_substitution(liquid_id, substitute_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Liquid {substitute_id} is not a substitute for liquid {liquid_id}"
+        )
+    return ApiResponse(success=True, message=f"Liquid {substitute_id} no longer replaces liquid {liquid_id}")
+
+
+@router.get("/{liquid_id}/calibration", response_model=LiquidCalibration)
+async def get_liquid_calibration(liquid_id: int, db_service):
+    """Get the latest calibration and history statistics for a liquid"""
+    if not await db_service.get_liquid_by_id(liquid_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Liquid {liquid_id} not found"
+        )
+
+    latest = await db_service.get_latest_calibration(liquid_id)
+    stats = await db_service.get_calibration_stats(liquid_id) or {}
+    return LiquidCalibration(
+        liquid_id=liquid_id,
+        ml_per_second=latest['ml_per_second'] if latest else None,
+        calibrated_at=latest['created_at'] if latest else None,
+        sample_count=stats.get('sample_count', 0),
+        mean_ml_per_second=stats.get('mean_ml_per_second'),
+        stddev_ml_per_second=stats.get('stddev_ml_per_second'),
+    )
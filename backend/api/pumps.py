@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import asyncio
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 from typing import List, Optional, Union
 from models import Pump, PumpUpdate, ApiResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+from api.responses import AVAILABILITY_GROUPS, conditional_json, json_response, render_json
 
 router = APIRouter(prefix="/pumps", tags=["Pumps"])
 
@@ -12,6 +14,51 @@ class PumpConfigUpdate(BaseModel):
     ml_per_second: Optional[float] = None
 
 
+class PumpBulkItem(PumpConfigUpdate):
+    """Configuration change for one pump in a bulk update"""
+    id: int
+    ml_per_second: Optional[float] = Field(None, gt=0)  # Left unchanged if omitted
+
+    @field_validator('ml_per_second')
+    @classmethod
+    def flow_rate_not_null(cls, value: Optional[float]) -> float:
+        if value is None:
+            raise ValueError("ml_per_second may be omitted but not null")
+        return value
+
+
+class PumpBulkUpdate(BaseModel):
+    """Update several pumps at once"""
+    pumps: List[PumpBulkItem]
+
+
+class PumpPreviewItem(BaseModel):
+    """Hypothetical liquid for one pump"""
+    id: int
+    liquid_id: Optional[int] = None  # None empties the pump
+
+
+class PumpPreviewRequest(BaseModel):
+    """Pump reassignments to preview"""
+    pumps: List[PumpPreviewItem]
+
+
+class PumpPreview(BaseModel):
+    """Availability changes of a pump reassignment"""
+    gained: List[str]  # Cocktails that would become makeable
+    lost: List[str]  # Cocktails that could no longer be made
+    makeable_count: int
+    current_makeable_count: int
+
+
+class PumpOptimizeRequest(BaseModel):
+    """Request to suggest liquids for the pumps"""
+    pinned_pumps: List[int] = Field(default_factory=list)  # Pumps that keep their current liquid
+    time_budget_seconds: float = Field(default=2.0, gt=0, le=30)  # At most; stops early once restarts stop improving
+    use_popularity: bool = False  # Weight cocktails by how often they were mixed
+    apply: bool = False  # Write the suggested assignments
+
+
 class PumpTestRequest(BaseModel):
     """Request to test pump"""
     duration_seconds: float = 10.0
@@ -19,34 +66,129 @@ class PumpTestRequest(BaseModel):
 
 
 @router.get("", response_model=List[Pump])
-async def get_pumps(db_service):
+async def get_pumps(request: Request, db_service):
     """Get all pump configurations with liquid IDs"""
-    pumps_data = db_service.get_pumps()
-    # Add liquid_id to each pump if not present
+    return await conditional_json(
+        request, db_service, AVAILABILITY_GROUPS, db_service.sync.get_pump_records)
+
+
+@router.put("", response_model=ApiResponse)
+async def update_pumps(request: PumpBulkUpdate, db_service, gpio_controller):
+    """Update liquid ID and/or flow rate of several pumps in one transaction"""
+    pump_ids = [item.id for item in request.pumps]
+    if len(set(pump_ids)) != len(pump_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each pump may only appear once per request"
+        )
+
+    # Verify all pumps exist before writing anything
+    existing_ids = {pump['id'] for pump in await db_service.get_pumps()}
+    missing = [pump_id for pump_id in pump_ids if pump_id not in existing_ids]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pumps not found: {', '.join(str(pump_id) for pump_id in missing)}"
+        )
+
+    # Only apply the fields that were provided (liquid_id may be explicitly null)
+    updates = [
+        {'id': item.id, **item.model_dump(include=item.model_fields_set - {'id'})}
+        for item in request.pumps
+    ]
+
+    try:
+        pumps_data = await db_service.update_pumps(updates)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update pump configuration: {str(e)}"
+        )
+
+    # Sync GPIO flow rates with the committed state (includes auto-applied calibrations)
     for pump in pumps_data:
-        if 'liquid_id' not in pump and pump.get('liquid'):
-            # Backward compatibility: get ID from name
-            pump['liquid_id'] = db_service.get_id_for_liquid(pump['liquid'])
-    return [Pump(**pump) for pump in pumps_data]
+        gpio_controller.set_pump_flow_rate(pump['id'], pump['ml_per_second'])
+
+    return ApiResponse(
+        success=True,
+        message=f"Updated {len(pumps_data)} pumps",
+        data={"pumps": [Pump(**pump).model_dump() for pump in pumps_data]}
+    )
+
+
+@router.post("/preview", response_model=PumpPreview)
+async def preview_pumps(request: PumpPreviewRequest, db_service):
+    """Show the cocktails gained and lost by reassigning pumps, without changing anything"""
+    try:
+        return await db_service.preview_pumps([item.model_dump() for item in request.pumps])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/optimize", response_model=ApiResponse)
+async def optimize_pumps(request: PumpOptimizeRequest, db_service, gpio_controller):
+    """Suggest (and optionally apply) the liquid per pump that makes the most cocktails"""
+    existing_ids = {pump['id'] for pump in await db_service.get_pumps()}
+    missing = [pump_id for pump_id in request.pinned_pumps if pump_id not in existing_ids]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pumps not found: {', '.join(str(pump_id) for pump_id in missing)}"
+        )
+
+    # CPU-bound search that may take its whole budget: keep it off the event loop,
+    # the regular database workers and the bulk worker serving the catalog
+    result = await db_service.run_search(
+        db_service.sync.optimize_pumps, request.pinned_pumps,
+        request.time_budget_seconds, request.use_popularity
+    )
+
+    changes = [
+        {'id': assignment['pump_id'], 'liquid_id': assignment['liquid_id']}
+        for assignment in result['assignments'] if assignment['changed']
+    ]
+    if request.apply and changes:
+        try:
+            pumps_data = await db_service.update_pumps(changes)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to update pump configuration: {str(e)}"
+            )
+        for pump in pumps_data:
+            gpio_controller.set_pump_flow_rate(pump['id'], pump['ml_per_second'])
+
+    verb = "Applied" if request.apply else "Suggested"
+    return ApiResponse(
+        success=True,
+        message=f"{verb} {len(changes)} pump changes: {result['current_makeable_count']} -> "
+                f"{result['makeable_count']} makeable cocktails",
+        data=result
+    )
 
 
 @router.get("/{pump_id}", response_model=Pump)
 async def get_pump(pump_id: int, db_service):
     """Get specific pump configuration"""
-    pump_data = db_service.get_pump_by_id(pump_id)
+    pumps = await db_service.get_pump_records()
+    pump_data = next((pump for pump in pumps if pump['id'] == pump_id), None)
     if not pump_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Pump {pump_id} not found"
         )
-    return Pump(**pump_data)
+    return json_response(render_json(pump_data))
 
 
 @router.put("/{pump_id}", response_model=ApiResponse)
 async def update_pump(pump_id: int, update: PumpConfigUpdate, db_service, gpio_controller):
     """Update pump configuration (liquid ID and/or flow rate)"""
     # Verify pump exists
-    pump = db_service.get_pump_by_id(pump_id)
+    pump = await db_service.get_pump_by_id(pump_id)
     if not pump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,13 +201,13 @@ async def update_pump(pump_id: int, update: PumpConfigUpdate, db_service, gpio_c
     
     # Check if liquid_id was provided (even if None/null)
     if update.model_fields_set and 'liquid_id' in update.model_fields_set:
-        success = db_service.update_pump_liquid(pump_id, update.liquid_id)
+        success = await db_service.update_pump_liquid(pump_id, update.liquid_id)
         if update.liquid_id:
-            liquid_name = db_service.get_liquid_by_id(update.liquid_id)
+            liquid_name = await db_service.get_liquid_by_id(update.liquid_id)
     
     # Check if ml_per_second was provided
     if success and update.model_fields_set and 'ml_per_second' in update.model_fields_set:
-        success = db_service.update_pump_flow_rate(pump_id, update.ml_per_second)
+        success = await db_service.update_pump_flow_rate(pump_id, update.ml_per_second)
 
         # We also need to update the pump configuration in GPIO controller
         if success:
@@ -92,7 +234,7 @@ async def update_pump(pump_id: int, update: PumpConfigUpdate, db_service, gpio_c
 async def test_pump(pump_id: int, request: PumpTestRequest, db_service, gpio_controller):
     """Test pump for calibration (run for specified duration)"""
     # Verify pump exists
-    pump = db_service.get_pump_by_id(pump_id)    
+    pump = await db_service.get_pump_by_id(pump_id)    
     if not pump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -135,7 +277,7 @@ async def test_pump(pump_id: int, request: PumpTestRequest, db_service, gpio_con
 async def stop_pump(pump_id: int, db_service, gpio_controller):
     """Stop a pump immediately"""
     # Verify pump exists
-    pump = db_service.get_pump_by_id(pump_id)
+    pump = await db_service.get_pump_by_id(pump_id)
     if not pump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -204,7 +346,7 @@ async def stop_all_pumps(gpio_controller):
 async def update_pump_liquid(pump_id: int, update: PumpUpdate, db_service):
     """Assign or remove liquid from a pump (legacy endpoint)"""
     # Verify pump exists
-    pump = db_service.get_pump_by_id(pump_id)
+    pump = await db_service.get_pump_by_id(pump_id)
     if not pump:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -212,7 +354,7 @@ async def update_pump_liquid(pump_id: int, update: PumpUpdate, db_service):
         )
 
     # Update pump liquid
-    success = db_service.update_pump_liquid(pump_id, update.liquid)
+    success = await db_service.update_pump_liquid(pump_id, update.liquid_id)
 
     if not success:
         raise HTTPException(
@@ -223,7 +365,7 @@ async def update_pump_liquid(pump_id: int, update: PumpUpdate, db_service):
     return ApiResponse(
         success=True,
         message=f"Pump {pump_id} updated successfully",
-        data={"pump_id": pump_id, "liquid": update.liquid}
+        data={"pump_id": pump_id, "liquid_id": update.liquid_id}
     )
 
 
@@ -237,7 +379,7 @@ async def test_all_pumps(request: PumpTestRequest, db_service, gpio_controller):
         )
 
     try:
-        pumps = db_service.get_all_pumps()
+        pumps = await db_service.get_pumps()
         tested = 0
         duration_ms = int(request.duration_seconds * 1000)
 
@@ -246,8 +388,7 @@ async def test_all_pumps(request: PumpTestRequest, db_service, gpio_controller):
                 gpio_controller.start_pump(pump['id'], duration_ms)
                 tested += 1
                 # Wait for pump to finish plus small delay
-                import time
-                time.sleep(request.duration_seconds + 0.5)
+                await asyncio.sleep(request.duration_seconds + 0.5)
             except Exception as e:
                 print(f"Failed to test pump {pump['id']}: {e}")
 
@@ -272,7 +413,7 @@ async def purge_all_pumps(request: PumpTestRequest, db_service, gpio_controller)
         )
 
     try:
-        pumps = db_service.get_all_pumps()
+        pumps = await db_service.get_pumps()
         purged = 0
         duration_ms = int(request.duration_seconds * 1000)
 
@@ -283,8 +424,7 @@ async def purge_all_pumps(request: PumpTestRequest, db_service, gpio_controller)
                     gpio_controller.start_pump(pump['id'], duration_ms)
                     purged += 1
                     # Wait for pump to finish plus small delay
-                    import time
-                    time.sleep(request.duration_seconds + 0.5)
+                    await asyncio.sleep(request.duration_seconds + 0.5)
                 except Exception as e:
                     print(f"Failed to purge pump {pump['id']}: {e}")
 
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import secrets
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    # Optional: responses are encoded with the standard json module instead
+    HAS_ORJSON = False
+
+# Generations restart at zero with the process, so ETags carry a per-boot prefix
+BOOT_ID = secrets.token_hex(4)
+
+# Table groups that cocktail availability, pump and installed-liquid responses depend on
+AVAILABILITY_GROUPS = ('catalog', 'pumps')
+
+# Clients may keep responses but must revalidate them (cheap with If-None-Match)
+CACHE_CONTROL = "no-cache"
+
+# Encoded bodies kept by ResponseCache (one per URL)
+RESPONSE_CACHE_SIZE = 256
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError
+
+
+def render_json(data: Any) -> bytes:
+    """Encode response data like FastAPI's JSONResponse (with orjson if installed)"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(data, default=_orjson_default)
+        except TypeError:
+            pass  # Types only jsonable_encoder knows; fall through
+    return json.dumps(
+        jsonable_encoder(data),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class JsonBody(NamedTuple):
+    """Data to encode plus extra headers for its response (e.g. pagination)"""
+    data: Any
+    headers: Dict[str, str]
+
+
+def render_result(func: Callable, *args) -> Tuple[bytes, Dict[str, str]]:
+    """Call func and encode its result, so both can run off the event loop (headers from a JsonBody)"""
+    result = func(*args)
+    if isinstance(result, JsonBody):
+        return render_json(result.data), result.headers
+    return render_json(result), {}
+
+
+def json_response(body: bytes, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """Wrap already-encoded JSON in a response (skips response_model validation)"""
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def make_etag(generation: Tuple[int, ...], resource: str) -> str:
+    """Strong ETag for a resource (path and query) at a data generation"""
+    digest = hashlib.blake2s(resource.encode(), digest_size=6).hexdigest()
+    return f'"{BOOT_ID}-{".".join(str(number) for number in generation)}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match already names this ETag
+
+    "*" is not a match here: it matches any current representation, so
+    only once the resource is known to exist (see conditional_json).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class ResponseCache:
+    """
+    Encoded JSON bodies (and their extra headers) keyed by URL, each valid for a single ETag
+
+    Only used from the event loop, so it needs no locking. The least
+    recently used URL is dropped beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, bytes, Dict[str, str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Cached body and headers for key if they were built for this ETag"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != etag:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key: str, etag: str, body: bytes, headers: Dict[str, str]):
+        self._entries[key] = (etag, body, headers)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(body) for _, body, _ in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "encoder": "orjson" if HAS_ORJSON else "json",
+        }
+
+
+response_cache = ResponseCache()
+
+
+async def conditional_json(request: Request, db_service, groups: Tuple[str, ...],
+                           func: Callable, *args, bulk: bool = False) -> Response:
+    """
+    Serve func(*args) as JSON with an ETag for the data generation of groups
+
+    func may return a JsonBody to add headers to the response.
+
+    If the client already has that generation of the URL, answer 304 Not
+    Modified. Otherwise the body comes from response_cache, or func runs
+    and is encoded on a database thread (the bulk pool for whole-catalog
+    work) and cached until the generation changes. If-None-Match: * is
+    answered with 304 only after that, so a missing resource (func raising
+    a 404) is still reported.
+    """
+    key = str(request.url.path)
+    if request.url.query:
+        key += "?" + request.url.query
+
+    # Read before building: the body is never older than its ETag claims
+    etag = make_etag(db_service.sync.get_generation(*groups), key)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    cached = response_cache.get(key, etag)
+    if cached is None:
+        run = db_service.run_bulk if bulk else db_service.run
+        cached = await run(render_result, func, *args)
+        response_cache.put(key, etag, *cached)
+
+    if request.headers.get("if-none-match", "").strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    body, extra_headers = cached
+    return json_response(body, headers={**headers, **extra_headers})
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends
-from models import MixerStatus, ApiResponse, Pump
+from models import MixerStatus, ApiResponse
 from typing import List, Optional
 from pydantic import BaseModel
+from api.responses import json_response, render_json, response_cache
 
 router = APIRouter(prefix="/status", tags=["Status"])
 
@@ -16,29 +17,19 @@ class MixerStartRequest(BaseModel):
 async def get_status(mixer_service, db_service, gpio_controller):
     """Get current mixer status"""
     status_data = mixer_service.get_status()
-    pumps_data = db_service.get_pumps()
-
-    # Convert pump dicts to Pump objects
-    pumps = [
-        Pump(
-            id=p['id'],
-            pin=p['pin'],
-            ml_per_second=p['ml_per_second'],
-            liquid=p.get('liquid'),
-            liquid_id=p.get('liquid_id')
-        )
-        for p in pumps_data
-    ]
-
-    return MixerStatus(
-        state=status_data['state'],
-        is_mixing=status_data['state'] == 'mixing',
-        current_cocktail=status_data.get('current_cocktail'),
-        progress=status_data.get('progress_percent', 0),
-        error_message=status_data.get('error_message'),
-        arduino_connected=gpio_controller.is_connected,
-        pumps=pumps
-    )
+    pumps = await db_service.get_pump_records()
+
+    # Polled by the UI: encoded as MixerStatus serializes, without validating
+    # the already validated pump records again on every request
+    return json_response(render_json({
+        'state': status_data['state'],
+        'is_mixing': status_data['state'] == 'mixing',
+        'current_cocktail': status_data.get('current_cocktail'),
+        'progress': status_data.get('progress_percent', 0.0),
+        'error_message': status_data.get('error_message'),
+        'arduino_connected': gpio_controller.is_connected,
+        'pumps': pumps,
+    }))
 
 
 @router.post("/cancel", response_model=ApiResponse)
@@ -75,7 +66,7 @@ async def get_diagnostics(db_service, gpio_controller):
     try:
         # Check database
         try:
-            pumps = db_service.get_pumps()
+            pumps = await db_service.get_pumps()
             db_ok = True
         except Exception:
             db_ok = False
@@ -92,6 +83,9 @@ async def get_diagnostics(db_service, gpio_controller):
             "gpio": "CONNECTED" if gpio_ok else "DISCONNECTED",
             "total_pumps": len(pumps),
             "pumps_configured": pumps_with_liquid,
+            "database_connections": await db_service.get_connection_stats(),
+            "units_ml": await db_service.get_units(),
+            "response_cache": response_cache.get_stats(),
             "timestamp": "2025-11-22T00:00:00Z"
         }
 
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cocktail availability with and without the availability index.
+
+Compares the previous MixerService.get_available_cocktails() (a liquid
+lookup per ingredient and Pydantic models for every recipe) with the
+AvailabilityIndex answers for the full list, the makeable list, a single
+can-make check, a pump change (including the near-miss bookkeeping), a
+what-if preview of that change and the next-bottle ranking.
+
+Usage (from the backend directory):
+    python benchmarks/bench_availability.py [sizes...]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_catalog_load import populate  # noqa: E402
+from models import Cocktail, CocktailWithAvailability, Ingredient  # noqa: E402
+from services.database import DatabaseService  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 5000]
+INSTALLED = list(range(1, 9))
+
+
+def legacy_available_cocktails(db: DatabaseService, installed_liquid_ids: set):
+    """The previous get_available_cocktails() implementation (one SQL lookup per ingredient)"""
+    result = []
+    for cocktail_data in db.get_cocktails():
+        ingredients = [Ingredient(**ing) for ing in cocktail_data.get('ingredients', [])]
+        cocktail = Cocktail(name=cocktail_data['name'], timing=cocktail_data.get('timing'),
+                            taste=cocktail_data.get('taste'), ingredients=ingredients,
+                            preparation=cocktail_data.get('preparation'))
+        required, names = set(), {}
+        for ing in ingredients:
+            liquid = db.db.get_liquid_by_name(ing.ingredient)
+            if liquid:
+                required.add(liquid['id'])
+                names[liquid['id']] = ing.ingredient
+        missing = required - installed_liquid_ids
+        result.append(CocktailWithAvailability(
+            **cocktail.model_dump(),
+            is_available=not missing,
+            missing_ingredients=sorted(names[lid] for lid in missing)
+        ))
+    return result
+
+
+def timed(func, repeats: int = 5) -> float:
+    """Best wall time of func() in milliseconds"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(sizes):
+    print(f"{'cocktails':>10} {'legacy (ms)':>12} {'index all':>10} {'available':>10} "
+          f"{'can make (us)':>14} {'pump swap (us)':>15} {'preview (us)':>13} {'next bottles':>13}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseService(str(Path(tmp) / "bench.db"))
+            populate(db.db, size)
+            index = db.get_availability()
+            index.set_installed(INSTALLED)
+
+            legacy = timed(lambda: legacy_available_cocktails(db, set(INSTALLED)), repeats=1)
+            index_all = timed(index.cocktails)
+            index_available = timed(lambda: index.cocktails(available_only=True))
+            # ms per 1000 checks == us per check
+            can_make = timed(lambda: [index.check(cocktail_id) for cocktail_id in range(1, 1001)])
+            swap = timed(lambda: (index.set_installed(INSTALLED[:-1] + [42]), index.set_installed(INSTALLED))) / 2 * 1000
+            preview = timed(lambda: index.preview(INSTALLED[:-1] + [42])) * 1000
+            next_bottles = timed(lambda: index.next_bottles(10))
+
+            print(f"{size:>10} {legacy:>12.1f} {index_all:>10.2f} {index_available:>10.2f} "
+                  f"{can_make:>14.2f} {swap:>15.1f} {preview:>13.1f} {next_bottles:>13.2f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how catalog load time scales with the number of cocktails.
+
+Compares the old N+1 load (one query for the cocktail list plus one
+ingredient query per cocktail), both with a connection per query and with
+pooled connections, against the single JOIN used by
+DatabaseManager.get_all_cocktails().
+
+Usage (from the backend directory):
+    python benchmarks/bench_catalog_load.py [sizes...]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.db_manager import DatabaseManager  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 5000, 20000]
+LIQUID_COUNT = 200
+REPEATS = 3
+
+
+def populate(db: DatabaseManager, cocktail_count: int):
+    """Fill an empty database with random cocktails"""
+    rng = random.Random(cocktail_count)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO liquids (name, category) VALUES (?, ?)",
+            [(f"Liquid {i}", "spirit") for i in range(LIQUID_COUNT)]
+        )
+        conn.executemany(
+            "INSERT INTO cocktails (name, taste, preparation) VALUES (?, 'Fresh', 'Shake')",
+            [(f"Cocktail {i:06d}",) for i in range(cocktail_count)]
+        )
+        rows = []
+        for cocktail_id in range(1, cocktail_count + 1):
+            for liquid_id in rng.sample(range(1, LIQUID_COUNT + 1), rng.randint(2, 6)):
+                rows.append((cocktail_id, liquid_id, rng.choice([1, 2, 4.5]), 'cl'))
+        conn.executemany(
+            "INSERT INTO cocktail_ingredients (cocktail_id, liquid_id, amount, unit) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+
+def load_n_plus_one(db: DatabaseManager):
+    """The previous get_all_cocktails() implementation"""
+    cocktails = db.execute_query(
+        "SELECT id, name, timing, taste, preparation, glass_type, garnish, description FROM cocktails ORDER BY name"
+    )
+    for cocktail in cocktails:
+        cocktail['ingredients'] = db.get_cocktail_ingredients(cocktail['id'])
+    return cocktails
+
+
+def best_of(func, repeats: int = REPEATS) -> float:
+    """Return the fastest of several runs in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main(sizes):
+    print(f"{'cocktails':>10} {'N+1 unpooled':>14} {'N+1 pooled':>12} {'JOIN':>10} {'speedup':>8}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "bench.db")
+            db = DatabaseManager(db_path)
+            unpooled = DatabaseManager(db_path, pooled=False)
+            populate(db, size)
+
+            assert load_n_plus_one(db) == db.get_all_cocktails()
+
+            unpooled_ms = best_of(lambda: load_n_plus_one(unpooled))
+            pooled_ms = best_of(lambda: load_n_plus_one(db))
+            join_ms = best_of(db.get_all_cocktails)
+            db.close()
+
+        print(f"{size:>10} {unpooled_ms:>11.1f} ms {pooled_ms:>9.1f} ms {join_ms:>7.1f} ms "
+              f"{unpooled_ms / join_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
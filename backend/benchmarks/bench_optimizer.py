@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pump assignment optimizer quality against its time budget.
+
+For synthetic catalogs, prints the makeable cocktails of the greedy start
+(budget 0) and of the local search after each time budget, with the number
+of moves scored. Run it on the Pi itself to pick a budget for
+POST /pumps/optimize.
+
+Usage (from the backend directory):
+    python benchmarks/bench_optimizer.py [sizes...]
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_catalog_load import populate  # noqa: E402
+from services.database import DatabaseService  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 5000]
+BUDGETS = [0.0, 0.5, 2.0, 5.0]
+SLOTS = 8
+
+
+def main(sizes):
+    print(f"{'cocktails':>10} {'budget (s)':>11} {'makeable':>9} {'moves':>9} {'elapsed (s)':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseService(str(Path(tmp) / "bench.db"))
+            populate(db.db, size)
+            optimizer = db.get_pump_optimizer()
+
+            for budget in BUDGETS:
+                plan = optimizer.optimize(SLOTS, time_budget=budget)
+                print(f"{size:>10} {budget:>11.1f} {len(plan.makeable):>9} {plan.evaluations:>9} "
+                      f"{plan.elapsed_seconds:>12.2f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
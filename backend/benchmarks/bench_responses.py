@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GET /cocktails requests per second.
+
+Sends sequential requests through the ASGI app (no network) against a
+synthetic catalog and compares:
+
+    response_model  the previous route: CocktailWithAvailability models
+                    validated and encoded by FastAPI on every request
+    encode          build and encode the body on every request (cache off)
+    cached          pre-serialized bytes from the response cache
+    304             revalidation with If-None-Match
+
+Run it on the Pi itself for Pi-class numbers.
+
+Requires httpx (pip install httpx).
+
+Usage (from the backend directory):
+    python benchmarks/bench_responses.py [cocktails] [requests]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from load_status import create_database  # noqa: E402
+from models import CocktailWithAvailability  # noqa: E402
+
+URL = "/api/v1/cocktails"
+
+
+async def requests_per_second(client: httpx.AsyncClient, url: str, count: int,
+                              headers: dict = None, before_each=None) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        if before_each:
+            before_each()
+        response = await client.get(url, headers=headers)
+        if response.status_code not in (200, 304):
+            response.raise_for_status()
+    return count / (time.perf_counter() - start)
+
+
+async def main(cocktail_count: int, count: int):
+    import main as backend
+    from api.responses import HAS_ORJSON, response_cache
+
+    @backend.app.get("/bench/cocktails", response_model=List[CocktailWithAvailability])
+    async def legacy_cocktails():
+        cocktails = await backend.async_db_service.run_bulk(backend.mixer_service.get_available_cocktails)
+        return [CocktailWithAvailability(**cocktail) for cocktail in cocktails]
+
+    async with backend.app.router.lifespan_context(backend.app):
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://kiosk") as client:
+            first = await client.get(URL)
+            etag = first.headers["etag"]
+            print(f"{cocktail_count} cocktails, {len(first.content) / 1024:.0f} KiB per response, "
+                  f"encoder: {'orjson' if HAS_ORJSON else 'json'}\n")
+
+            results = {
+                "response_model": await requests_per_second(client, "/bench/cocktails", count),
+                "encode": await requests_per_second(client, URL, count, before_each=response_cache.clear),
+                "cached": await requests_per_second(client, URL, count),
+                "304": await requests_per_second(client, URL, count, headers={"If-None-Match": etag}),
+            }
+
+    baseline = results["response_model"]
+    print(f"{'mode':<16} {'req/s':>10} {'speedup':>9}")
+    for mode, rate in results.items():
+        print(f"{mode:<16} {rate:>10.1f} {rate / baseline:>8.1f}x")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    cocktails, count = (args + [100, 200][len(args):])[:2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = str(Path(tmp) / "bench.db")
+        create_database(os.environ["DB_PATH"], cocktails)
+        asyncio.run(main(cocktails, count))
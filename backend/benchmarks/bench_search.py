@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-text cocktail search against a LIKE scan.
+
+Times DatabaseService.search_cocktails() (FTS5 + availability index) for a
+selective query, next to the equivalent LIKE '%term%' scan over cocktails,
+liquids and ingredients, and for a broad query matching a fifth of the
+catalog with and without the availability filter. The populate column
+includes re-indexing the queued cocktails.
+
+Usage (from the backend directory):
+    python benchmarks/bench_search.py [sizes...]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_availability import INSTALLED, timed  # noqa: E402
+from bench_catalog_load import populate  # noqa: E402
+from services.database import DatabaseService  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+SELECTIVE = "Cocktail 00123"
+BROAD = "Liquid 7"
+
+
+def like_search(db: DatabaseService, text: str, limit: int = 20):
+    """Search without the FTS index: substring match over every cocktail and ingredient"""
+    pattern = f"%{text}%"
+    return db.db.execute_query("""
+        SELECT DISTINCT c.id FROM cocktails c
+        LEFT JOIN cocktail_ingredients ci ON ci.cocktail_id = c.id
+        LEFT JOIN liquids l ON l.id = ci.liquid_id
+        WHERE c.name LIKE ? OR c.description LIKE ? OR c.garnish LIKE ? OR l.name LIKE ?
+        LIMIT ?
+    """, (pattern, pattern, pattern, pattern, limit))
+
+
+def main(sizes):
+    print(f"{'cocktails':>10} {'populate (s)':>13} {'LIKE (ms)':>10} {'FTS (ms)':>10} "
+          f"{'broad':>8} {'broad avail.':>13}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseService(str(Path(tmp) / "bench.db"))
+            start = time.perf_counter()
+            populate(db.db, size)
+            db.db.refresh_search_index()
+            populate_seconds = time.perf_counter() - start
+            db.get_availability().set_installed(INSTALLED)
+
+            like = timed(lambda: like_search(db, SELECTIVE), repeats=3)
+            selective = timed(lambda: db.search_cocktails(SELECTIVE))
+            broad = timed(lambda: db.search_cocktails(BROAD))
+            broad_available = timed(lambda: db.search_cocktails(BROAD, available=True))
+
+            print(f"{size:>10} {populate_seconds:>13.2f} {like:>10.2f} {selective:>10.2f} "
+                  f"{broad:>8.2f} {broad_available:>13.2f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: similar-cocktail lookup with the MinHash index against a pairwise scan.
+
+Times a pairwise Jaccard comparison with every cocktail, the SimilarityIndex
+lookup, the full /cocktails/{name}/similar answer (makeable only), a full
+index build and the incremental update after one recipe was imported.
+Recall is the share of the exact top 5 scores the index also returns.
+
+Usage (from the backend directory):
+    python benchmarks/bench_similar.py [sizes...]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_availability import INSTALLED, timed  # noqa: E402
+from bench_catalog_load import populate  # noqa: E402
+from services.database import DatabaseService  # noqa: E402
+from services.similarity import SimilarityIndex  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+SAMPLES = 50
+TOP = 5
+
+
+def liquid_sets(cocktails):
+    return {cocktail['id']: frozenset(ing['liquid_id'] for ing in cocktail['ingredients']) for cocktail in cocktails}
+
+
+def pairwise_similar(sets, cocktail_id):
+    """Jaccard similarity with every other cocktail"""
+    liquids = sets[cocktail_id]
+    scores = [(len(liquids & other) / len(liquids | other), other_id)
+              for other_id, other in sets.items() if other_id != cocktail_id]
+    scores.sort(key=lambda score: (-score[0], score[1]))
+    return scores
+
+
+def main(sizes):
+    print(f"{'cocktails':>10} {'pairwise (ms)':>14} {'index (ms)':>11} {'endpoint (ms)':>14} "
+          f"{'recall':>7} {'build (s)':>10} {'update (ms)':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseService(str(Path(tmp) / "bench.db"))
+            populate(db.db, size)
+            db.get_availability().set_installed(INSTALLED)
+            cocktails = db.get_cocktails()
+            sets = liquid_sets(cocktails)
+            sample = [cocktail['id'] for cocktail in cocktails[::max(1, size // SAMPLES)]]
+
+            start = time.perf_counter()
+            index = SimilarityIndex(cocktails)
+            build = time.perf_counter() - start
+            db.get_similarity_index()
+
+            pairwise = timed(lambda: [pairwise_similar(sets, cocktail_id) for cocktail_id in sample],
+                             repeats=1) / len(sample)
+            lookup = timed(lambda: [index.similar(cocktail_id) for cocktail_id in sample]) / len(sample)
+            names = [cocktail['name'] for cocktail in cocktails[::max(1, size // SAMPLES)]]
+            endpoint = timed(lambda: [db.find_similar_cocktails(name) for name in names]) / len(names)
+
+            found = 0
+            for cocktail_id in sample:
+                exact = [score for score, _ in pairwise_similar(sets, cocktail_id)[:TOP]]
+                approximate = [hit['score'] for hit in index.similar(cocktail_id)[:TOP]]
+                found += sum(1 for a, b in zip(exact, approximate) if abs(a - b) < 1e-9)
+            recall = found / (len(sample) * TOP)
+
+            db.import_cocktails([{'name': 'Cocktail 000001', 'ingredients': [
+                {'ingredient': 'Liquid 1', 'amount': 2, 'unit': 'cl', 'is_optional': False},
+                {'ingredient': 'Liquid 2', 'amount': 2, 'unit': 'cl', 'is_optional': False},
+            ]}])
+            db.get_cocktails()
+            update = timed(lambda: db.get_similarity_index(), repeats=1)
+
+            print(f"{size:>10} {pairwise:>14.2f} {lookup:>11.3f} {endpoint:>14.3f} "
+                  f"{recall:>7.2f} {build:>10.2f} {update:>12.1f}")
+            db.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start with and without the catalog snapshot.
+
+For each catalog size, times what the lifespan startup does with the
+catalog (DatabaseService(...) + load_cocktails()) and a first lookup by
+name, once loading from the database (and writing the snapshot) and once
+mapping the up-to-date snapshot. The snapshot answers the lookup from its
+name index; without it the lookup builds the availability index. The
+index column is what remains of that build for the first listing request,
+which reads every cocktail either way.
+
+Usage (from the backend directory):
+    python benchmarks/bench_snapshot.py [sizes...]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_catalog_load import populate  # noqa: E402
+from services.database import DatabaseService  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+
+def cold_start(db_path: str):
+    """Open the database like the lifespan startup; return (service, startup ms, first lookup ms, index ms)"""
+    start = time.perf_counter()
+    db = DatabaseService(db_path)
+    db.load_cocktails()
+    startup = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    assert db.get_cocktail_by_name("Cocktail 000000")
+    lookup = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    db.get_availability()
+    index = (time.perf_counter() - start) * 1000
+    return db, startup, lookup, index
+
+
+def main(sizes):
+    print(f"{'cocktails':>10} {'snapshot':>9} {'db start (ms)':>14} {'lookup':>7} {'index':>8} "
+          f"{'mmap start (ms)':>16} {'lookup':>7} {'index':>8}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "bench.db")
+            db = DatabaseService(db_path)
+            populate(db.db, size)
+            db.close()
+
+            # No snapshot yet: the catalog is read from SQLite and the snapshot written
+            db, db_start, db_lookup, db_index = cold_start(db_path)
+            db.close()
+            snapshot_kib = os.path.getsize(db.snapshot_path) / 1024
+
+            db, map_start, map_lookup, map_index = cold_start(db_path)
+            db.close()
+
+            print(f"{size:>10} {snapshot_kib:>7.0f}KiB {db_start:>14.1f} {db_lookup:>7.2f} {db_index:>8.1f} "
+                  f"{map_start:>16.1f} {map_lookup:>7.2f} {map_index:>8.1f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: read paths of every layer against large synthetic catalogs.
+
+For each catalog size a scratch database is generated with
+generate_catalog.py (and reused on later runs), then a fresh process
+times the DatabaseManager, DatabaseService and MixerService read paths and
+the HTTP endpoints (through the ASGI app with its real lifespan) against
+it. Per case it reports the median and p95 latency, the peak memory
+allocated during one call and what was still allocated after it, result
+included (tracemalloc), and the process's peak RSS after the case. The
+first call of a case is not timed, so lazily built indexes are measured
+by their own "build" cases. Save the results with --json and pass them
+as --baseline on a later run to see the change per case.
+
+Requires httpx (pip install httpx) for the HTTP cases.
+
+Usage (from the backend directory):
+    python benchmarks/bench_suite.py [sizes...] [--json results.json] [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: peak RSS is reported as 0
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+MIN_RUNS = 3
+MAX_RUNS = 50
+TIME_BUDGET = 2.0  # Seconds of timed runs per case (at least MIN_RUNS)
+
+
+def peak_rss_mib() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == 'darwin' else 1)  # Bytes on macOS, KiB elsewhere
+
+
+def measure(func: Callable, setup: Optional[Callable] = None) -> Dict[str, float]:
+    """Latency percentiles over several runs after a warm-up call, then the allocations of one traced run"""
+    if setup:
+        setup()
+    func()
+
+    timings = []
+    spent = 0.0
+    while len(timings) < MAX_RUNS and (len(timings) < MIN_RUNS or spent < TIME_BUDGET):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed * 1000)
+        spent += elapsed
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    timings.sort()
+    return {
+        'runs': len(timings),
+        'p50_ms': statistics.median(timings),
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'alloc_peak_kib': (peak - before) / 1024,
+        'retained_kib': (current - before) / 1024,
+        'peak_rss_mib': peak_rss_mib(),
+    }
+
+
+def run_cases(db_path: str) -> List[dict]:
+    """Time every case against one database (run in a fresh process per catalog)"""
+    os.environ["DB_PATH"] = db_path
+    from fastapi.testclient import TestClient
+
+    import main as backend
+    from api.responses import response_cache
+    from database.db_manager import DatabaseManager
+    from services.arduino import ArduinoService
+    from services.database import DatabaseService
+    from services.gpio_controller import GPIOController
+    from services.mixer import MixerService
+
+    results = []
+
+    def case(layer: str, name: str, func: Callable, setup: Optional[Callable] = None):
+        results.append({'layer': layer, 'case': name, **measure(func, setup)})
+
+    db = DatabaseManager(db_path)
+    cocktails = db.get_all_cocktails()
+    name = cocktails[len(cocktails) // 2]['name']
+    installed = [pump['liquid_id'] for pump in db.get_all_pumps() if pump['liquid_id'] is not None]
+
+    case('manager', 'get_all_cocktails', db.get_all_cocktails)
+    case('manager', 'get_cocktail_by_name', lambda: db.get_cocktail_by_name(name))
+    case('manager', 'search_cocktails', lambda: db.search_cocktails("gin lemon", limit=20))
+    case('manager', 'get_installed_liquid_ids', db.get_installed_liquid_ids)
+    del cocktails
+    db.close()
+
+    service = DatabaseService(db_path)
+
+    def remove_snapshot():
+        if service.snapshot_path.exists():
+            service.snapshot_path.unlink()
+
+    case('service', 'startup (SQLite)', lambda: DatabaseService(db_path).load_cocktails(), remove_snapshot)
+    case('service', 'startup (snapshot)', lambda: DatabaseService(db_path).load_cocktails())
+    service.load_cocktails()
+    case('service', 'availability index build', service.get_availability,
+         lambda: service._cache.pop('availability', None))
+    case('service', 'query_cocktails (limit 50)', lambda: service.query_cocktails(limit=50))
+    case('service', 'query_cocktails (all)', lambda: service.query_cocktails())
+    case('service', 'find_cocktail', lambda: service.find_cocktail(name))
+    case('service', 'search_cocktails', lambda: service.search_cocktails("gin lemon"))
+    case('service', 'suggest_liquids', lambda: service.suggest_liquids("gi"))
+    case('service', 'get_next_bottles', lambda: service.get_next_bottles(10))
+    case('service', 'similarity index build', service.get_similarity_index,
+         lambda: service._cache.pop('similarity', None))
+    case('service', 'find_similar_cocktails', lambda: service.find_similar_cocktails(name))
+    case('service', 'preview_pumps', lambda: service.preview_pumps([{'id': 1, 'liquid_id': None}]))
+    case('service', 'pump swap (set_installed)', lambda: service.get_availability().set_installed(installed[1:]),
+         lambda: service.get_availability().set_installed(installed))
+    service.get_availability().set_installed(installed)  # Not reapplied until the pumps change
+
+    mixer = MixerService(service, GPIOController(), ArduinoService(port=""))
+    case('mixer', 'get_available_cocktails', mixer.get_available_cocktails)
+    case('mixer', 'get_makeable_cocktails', mixer.get_makeable_cocktails)
+    case('mixer', 'can_make_cocktail', lambda: mixer.can_make_cocktail(name))
+    service.close()
+
+    with TestClient(backend.app) as client:
+        def get(url: str) -> Callable:
+            return lambda: client.get(url).raise_for_status()
+
+        endpoints = [
+            ("GET /cocktails", "/api/v1/cocktails"),
+            ("GET /cocktails?limit=50", "/api/v1/cocktails?limit=50"),
+            ("GET /cocktails/available", "/api/v1/cocktails/available"),
+            ("GET /cocktails/{name}", f"/api/v1/cocktails/{quote(name)}"),
+            ("GET /cocktails/search", "/api/v1/cocktails/search?q=gin%20lemon"),
+            ("GET /cocktails/{name}/similar", f"/api/v1/cocktails/{quote(name)}/similar"),
+            ("GET /liquids/suggest", "/api/v1/liquids/suggest?prefix=gi"),
+            ("GET /liquids/recommendations", "/api/v1/liquids/recommendations"),
+            ("GET /pumps", "/api/v1/pumps"),
+            ("GET /status", "/api/v1/status"),
+        ]
+        for label, url in endpoints:
+            case('http', label, get(url), response_cache.clear)
+        case('http', "GET /cocktails (cached)", get("/api/v1/cocktails"))
+
+    return results
+
+
+def run_size(size: int, directory: Path, regenerate: bool) -> dict:
+    """Generate (or reuse) the catalog for a size and time it in a fresh process"""
+    from generate_catalog import generate
+
+    db_path = directory / f"cocktails-{size}.db"
+    if regenerate or not db_path.exists():
+        for stale in directory.glob(f"cocktails-{size}.*"):
+            stale.unlink()
+        generated = generate(str(db_path), size)
+        print(f"Generated {generated['cocktails']} cocktails with {generated['liquids']} liquids "
+              f"in {generated['seconds']:.1f}s", file=sys.stderr)
+
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as out:
+        out_path = out.name
+    try:
+        subprocess.run([sys.executable, __file__, "--worker", str(db_path), "--out", out_path],
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(out_path) as f:
+            return {'size': size, 'cases': json.load(f)}
+    finally:
+        os.unlink(out_path)
+
+
+def print_results(result: dict, baseline: Optional[dict]):
+    previous = {}
+    if baseline:
+        for old in baseline.get('results', []):
+            if old['size'] == result['size']:
+                previous = {(case['layer'], case['case']): case for case in old['cases']}
+
+    peak = max(case['peak_rss_mib'] for case in result['cases'])
+    print(f"\n== {result['size']} cocktails (peak RSS {peak:.0f} MiB) ==")
+    print(f"{'layer':<8} {'case':<32} {'p50 (ms)':>10} {'p95 (ms)':>10} {'alloc (KiB)':>12} "
+          f"{'retained':>10} {'RSS (MiB)':>10}" + (f" {'vs base':>8}" if previous else ""))
+    for case in result['cases']:
+        line = (f"{case['layer']:<8} {case['case']:<32} {case['p50_ms']:>10.3f} {case['p95_ms']:>10.3f} "
+                f"{case['alloc_peak_kib']:>12.0f} {case['retained_kib']:>10.0f} {case['peak_rss_mib']:>10.0f}")
+        old = previous.get((case['layer'], case['case']))
+        if old and old['p50_ms'] > 0:
+            line += f" {case['p50_ms'] / old['p50_ms']:>7.2f}x"
+        print(line)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the backend read paths")
+    parser.add_argument('sizes', type=int, nargs='*', default=DEFAULT_SIZES, help="Catalog sizes")
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help="Where the scratch databases are kept")
+    parser.add_argument('--regenerate', action='store_true', help="Generate the catalogs even if they exist")
+    parser.add_argument('--json', help="Write the results to this file")
+    parser.add_argument('--baseline', help="Results of an earlier run (--json) to compare with")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        results = run_cases(args.worker)
+        with open(args.out, "w") as f:
+            json.dump(results, f)
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = []
+    for size in args.sizes:
+        result = run_size(size, Path(args.dir), args.regenerate)
+        print_results(result, baseline)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request CPU and allocations of Pydantic validation on read paths.
+
+Builds the response of a read endpoint the way the previous routes did
+(Pydantic models built per request, then validated and serialized again
+by FastAPI against the route's response_model) and the way they do now
+(records validated once per data generation, encoded as they are), and
+reports the CPU time and the peak of allocated memory per request. HTTP
+and routing overhead are left out, they are the same for both.
+
+    /cocktails/available  Ingredient -> Cocktail -> model_dump() ->
+                          CocktailWithAvailability per cocktail, against
+                          the availability index dicts
+    /status               Pump and MixerStatus models per poll, against
+                          the cached pump records
+    /pumps/{id}           a Pump model, against the cached pump record
+
+Run it on the Pi itself for Pi-class numbers.
+
+Usage (from the backend directory):
+    python benchmarks/bench_validation.py [cocktails] [requests]
+"""
+import functools
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.responses import json_response, render_json  # noqa: E402
+from bench_catalog_load import populate  # noqa: E402
+from models import Cocktail, CocktailWithAvailability, Ingredient, MixerStatus, Pump  # noqa: E402
+from services.database import DatabaseService  # noqa: E402
+
+PUMP_COUNT = 8
+STATUS = {"state": "idle", "current_cocktail": None, "progress_percent": 0.0, "error_message": None}
+
+
+def run_sync(coroutine):
+    """Result of a coroutine that never suspends (serialize_response of an async route)"""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+@functools.lru_cache
+def response_field(response_model):
+    """The response field FastAPI creates once per route"""
+    return create_response_field(name="Response", type_=response_model)
+
+
+def fastapi_response(response_model, content) -> JSONResponse:
+    """What FastAPI does with a route's return value: validate, serialize and encode it"""
+    return JSONResponse(run_sync(serialize_response(field=response_field(response_model),
+                                                    response_content=content)))
+
+
+def legacy_available_cocktails(db: DatabaseService) -> JSONResponse:
+    installed = set(db.db.get_installed_liquid_ids())
+    result = []
+    for cocktail_data in db.get_cocktails():
+        ingredients = [Ingredient(**ing) for ing in cocktail_data.get('ingredients', [])]
+        cocktail = Cocktail(name=cocktail_data['name'], timing=cocktail_data.get('timing'),
+                            taste=cocktail_data.get('taste'), ingredients=ingredients,
+                            preparation=cocktail_data.get('preparation'))
+        missing = sorted(ing['ingredient'] for ing in cocktail_data['ingredients']
+                         if ing['liquid_id'] not in installed)
+        result.append(CocktailWithAvailability(**cocktail.model_dump(), is_available=not missing,
+                                               missing_ingredients=missing))
+    return fastapi_response(List[CocktailWithAvailability], result)
+
+
+def legacy_status(db: DatabaseService) -> JSONResponse:
+    pumps = [Pump(id=p['id'], pin=p['pin'], ml_per_second=p['ml_per_second'], liquid=p.get('liquid'),
+                  liquid_id=p.get('liquid_id')) for p in db.get_pumps()]
+    status = MixerStatus(state=STATUS['state'], is_mixing=False, current_cocktail=STATUS['current_cocktail'],
+                         progress=STATUS['progress_percent'], error_message=STATUS['error_message'],
+                         arduino_connected=False, pumps=pumps)
+    return fastapi_response(MixerStatus, status)
+
+
+def status(db: DatabaseService):
+    return json_response(render_json({
+        'state': STATUS['state'], 'is_mixing': False, 'current_cocktail': STATUS['current_cocktail'],
+        'progress': STATUS['progress_percent'], 'error_message': STATUS['error_message'],
+        'arduino_connected': False, 'pumps': db.get_pump_records(),
+    }))
+
+
+def legacy_pump(db: DatabaseService) -> JSONResponse:
+    pump = next(pump for pump in db.get_pumps() if pump['id'] == PUMP_COUNT)
+    return fastapi_response(Pump, Pump(**pump))
+
+
+def pump(db: DatabaseService):
+    return json_response(render_json(next(pump for pump in db.get_pump_records() if pump['id'] == PUMP_COUNT)))
+
+
+def per_request(func, count: int):
+    """(CPU microseconds, peak KiB allocated) per call of func()"""
+    func()  # Caches and lazy imports
+    start = time.process_time()
+    for _ in range(count):
+        func()
+    cpu = (time.process_time() - start) / count * 1e6
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    response = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del response
+    return cpu, (peak - before) / 1024
+
+
+def main(cocktail_count: int, count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(str(Path(tmp) / "bench.db"))
+        populate(db.db, cocktail_count)
+        with db.db.transaction():
+            for pump_id in range(1, PUMP_COUNT + 1):
+                db.db.execute_update("INSERT INTO pumps (id, pin, liquid_id) VALUES (?, ?, ?)",
+                                     (pump_id, pump_id + 1, pump_id))
+
+        cases = [
+            ("/cocktails/available", lambda: legacy_available_cocktails(db),
+             lambda: json_response(render_json(db.get_availability().cocktails())), max(1, count // 100)),
+            ("/status", lambda: legacy_status(db), lambda: status(db), count),
+            ("/pumps/{id}", lambda: legacy_pump(db), lambda: pump(db), count),
+        ]
+
+        print(f"{cocktail_count} cocktails, {PUMP_COUNT} pumps\n")
+        print(f"{'endpoint':<22} {'models (us)':>12} {'records':>10} {'saved':>7} "
+              f"{'models (KiB)':>13} {'records':>10} {'saved':>7}")
+        for endpoint, legacy, current, repeats in cases:
+            assert legacy().body == current().body, endpoint
+            legacy_cpu, legacy_alloc = per_request(legacy, repeats)
+            cpu, alloc = per_request(current, repeats)
+            print(f"{endpoint:<22} {legacy_cpu:>12.1f} {cpu:>10.1f} {1 - cpu / legacy_cpu:>7.0%} "
+                  f"{legacy_alloc:>13.1f} {alloc:>10.1f} {1 - alloc / legacy_alloc:>7.0%}")
+        db.close()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    cocktails, count = (args + [1000, 2000][len(args):])[:2]
+    main(cocktails, count)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Generate a large synthetic catalog into a scratch database.
+
+Liquid usage follows a Zipf distribution: the liquid of popularity rank r
+is picked with weight 1 / r^s, so a few liquids (gin, lemon juice, ...)
+appear in a large share of the recipes and most only in a handful, like
+in real recipe collections. Ingredient counts, units and the taste,
+timing, preparation and glass values follow the shipped catalog. The
+recipes are written with CatalogImporter (the import path used by the
+API), and the pumps are loaded with the most used liquids.
+
+Usage (from the backend directory):
+    python benchmarks/generate_catalog.py 10000 [--db PATH] [--liquids N] [--zipf S] [--seed N]
+"""
+import argparse
+import bisect
+import itertools
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.db_manager import DatabaseManager  # noqa: E402
+from database.importer import CatalogImporter  # noqa: E402
+
+DEFAULT_ZIPF = 1.1
+PUMP_COUNT = 8
+
+# Most used liquids of the shipped catalog, most used first, with their category
+COMMON_LIQUIDS = [
+    ("Gin", "spirit"), ("Lemon juice", "juice"), ("Simple syrup", "syrup"), ("Vodka", "spirit"),
+    ("Orange juice", "juice"), ("Lime juice", "juice"), ("Soda water", "mixer"), ("Sweet Vermouth", "wine"),
+    ("Light Rum", "spirit"), ("Triple Sec", "liqueur"), ("Maraschino", "liqueur"), ("Rye Whiskey", "spirit"),
+    ("Benedictine", "liqueur"), ("Grapefruit juice", "juice"), ("Angostura bitters", "bitters"),
+    ("Cognac", "spirit"), ("Campari", "liqueur"), ("Bourbon Whiskey", "spirit"), ("Dry Vermouth", "wine"),
+    ("Champagne", "wine"), ("Cranberry juice", "juice"), ("Egg white", "other"), ("Grenadine", "syrup"),
+    ("Orange bitters", "bitters"), ("Tequila", "spirit"), ("Scotch Whisky", "spirit"), ("Cynar", "liqueur"),
+    ("Old Tom Gin", "spirit"), ("Absinthe", "spirit"), ("Brandy", "spirit"), ("Ginger beer", "mixer"),
+    ("Tonic water", "mixer"), ("Cola", "mixer"), ("Pineapple juice", "juice"), ("Coffee liqueur", "liqueur"),
+    ("Amaretto", "liqueur"), ("Aperol", "liqueur"), ("Dark Rum", "spirit"), ("Mezcal", "spirit"),
+    ("Honey syrup", "syrup"), ("Agave syrup", "syrup"), ("Cream", "other"), ("Coconut cream", "other"),
+    ("Peach schnapps", "liqueur"), ("Blue Curacao", "liqueur"), ("Chartreuse", "liqueur"),
+]
+# Generated liquids beyond the common ones, e.g. "Smoked Cherry Liqueur"
+FLAVOURS = ["Blood Orange", "Cherry", "Elderflower", "Passion Fruit", "Raspberry", "Pear", "Apricot",
+            "Ginger", "Vanilla", "Cinnamon", "Smoked", "Spiced", "Hibiscus", "Rhubarb", "Yuzu", "Mango"]
+STYLES = [("Liqueur", "liqueur"), ("Syrup", "syrup"), ("Juice", "juice"), ("Bitters", "bitters"),
+          ("Rum", "spirit"), ("Gin", "spirit"), ("Vodka", "spirit"), ("Soda", "mixer"), ("Shrub", "syrup")]
+
+INGREDIENT_COUNTS = {2: 19, 3: 45, 4: 27, 5: 6, 6: 1, 7: 1}
+TASTES = {"Fresh": 55, "Boozy": 14, "Sweet": 11, "Bitter sweet": 8, "Sour": 5, "Salty": 2}
+TIMINGS = {"All day": 53, "Pre-dinner": 26, "After dinner": 16, "Longdrink": 4}
+PREPARATIONS = {"Stirred": 37, "Shaken": 44, "Build": 13, "Blend": 1}
+GLASSES = {None: 76, "Highball": 13, "Old Fashioned": 3, "Cocktail glass": 3, "Martini glass": 2,
+           "Wine glass": 1, "Hurricane glass": 1}
+GARNISHES = [None, None, "Lemon twist", "Lime wheel", "Orange peel", "Cherry", "Mint sprig", "Olive"]
+AMOUNTS = {"spirit": [3, 4, 4.5, 5, 6], "liqueur": [1, 1.5, 2, 3], "wine": [2, 3, 6, 9], "juice": [1.5, 2, 3, 6],
+           "syrup": [1, 1.5, 2], "mixer": [6, 8, 10, 12], "other": [1, 2, 3]}
+NAME_WORDS = (["Midnight", "Golden", "Velvet", "Smoky", "Jungle", "Harbor", "Crimson", "Silver", "Royal", "Tropical",
+               "Bitter", "Wild", "Coastal", "Garden", "Winter", "Summer", "Electric", "Copper", "Rusty", "Lucky"],
+              ["Sour", "Mule", "Fizz", "Spritz", "Negroni", "Smash", "Collins", "Daisy", "Flip", "Punch",
+               "Julep", "Cobbler", "Highball", "Martini", "Sling", "Rickey", "Swizzle", "Buck", "Crusta", "Toddy"])
+
+
+def default_liquid_count(cocktail_count: int) -> int:
+    """Liquids for a catalog size: 110 for 1k recipes, 200 for 10k, 1100 for 100k"""
+    return 100 + cocktail_count // 100
+
+
+def liquid_names(count: int) -> List[tuple]:
+    """(name, category) of count liquids, most popular first"""
+    generated = (
+        (f"{flavour} {style}", category)
+        for (style, category), flavour in itertools.product(STYLES, FLAVOURS)
+    )
+    numbered = ((f"House {style} {number}", category)
+                for number in itertools.count(1) for style, category in STYLES)
+    return list(itertools.islice(itertools.chain(COMMON_LIQUIDS, generated, numbered), count))
+
+
+def _weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def generate_records(cocktail_count: int, liquids: List[tuple], zipf: float = DEFAULT_ZIPF,
+                     seed: int = 0) -> Iterator[dict]:
+    """Cocktail records as accepted by CatalogImporter, liquids drawn by Zipf rank"""
+    rng = random.Random(seed)
+    cumulative = list(itertools.accumulate(1 / rank ** zipf for rank in range(1, len(liquids) + 1)))
+    total = cumulative[-1]
+    names = set()
+
+    for number in range(cocktail_count):
+        name = f"{rng.choice(NAME_WORDS[0])} {rng.choice(NAME_WORDS[1])}"
+        if name in names:
+            name = f"{name} No. {number}"
+        names.add(name)
+
+        chosen = []
+        size = min(_weighted(rng, INGREDIENT_COUNTS), len(liquids))
+        while len(chosen) < size:
+            index = bisect.bisect_left(cumulative, rng.random() * total)
+            if index not in chosen:
+                chosen.append(index)
+
+        ingredients = []
+        for index in chosen:
+            liquid, category = liquids[index]
+            if category == "bitters":
+                amount, unit = rng.choice([1, 2, 3]), "dashes"
+            else:
+                amount, unit = rng.choice(AMOUNTS[category]), "cl"
+            ingredients.append({'ingredient': liquid, 'amount': amount, 'unit': unit,
+                                'is_optional': category == "bitters" and rng.random() < 0.3})
+
+        yield {
+            'name': name,
+            'taste': _weighted(rng, TASTES),
+            'timing': _weighted(rng, TIMINGS),
+            'preparation': _weighted(rng, PREPARATIONS),
+            'glass_type': _weighted(rng, GLASSES),
+            'garnish': rng.choice(GARNISHES),
+            'description': f"{name} with {', '.join(ingredient['ingredient'] for ingredient in ingredients)}",
+            'ingredients': ingredients,
+        }
+
+
+def generate(db_path: str, cocktail_count: int, liquid_count: Optional[int] = None,
+             zipf: float = DEFAULT_ZIPF, seed: int = 0) -> dict:
+    """
+    Write a synthetic catalog into a new database
+
+    Raises:
+        FileExistsError: If db_path already exists
+    """
+    path = Path(db_path)
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+
+    liquids = liquid_names(liquid_count or default_liquid_count(cocktail_count))
+    db = DatabaseManager(str(path))
+    with db.transaction():
+        for name, category in liquids:
+            db.add_liquid(name, category)
+    liquid_ids = {liquid['name']: liquid['id'] for liquid in db.get_all_liquids()}
+
+    start = time.perf_counter()
+    report = CatalogImporter(db).import_records(generate_records(cocktail_count, liquids, zipf, seed))
+    seconds = time.perf_counter() - start
+
+    with db.transaction():
+        for pump_id, (name, _) in enumerate(liquids[:PUMP_COUNT], start=1):
+            db.execute_update("INSERT INTO pumps (id, pin, liquid_id) VALUES (?, ?, ?)",
+                              (pump_id, pump_id + 1, liquid_ids[name]))
+    db.close()
+
+    return {'cocktails': len(report.added), 'liquids': len(liquids), 'rows': report.rows, 'seconds': seconds}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic cocktail catalog")
+    parser.add_argument('cocktails', type=int, help="Number of recipes, e.g. 1000, 10000 or 100000")
+    parser.add_argument('--db', help="Database to create (default: cocktails-<N>.db in the temp directory)")
+    parser.add_argument('--liquids', type=int, help="Number of liquids (default: 100 + cocktails / 100)")
+    parser.add_argument('--zipf', type=float, default=DEFAULT_ZIPF, help="Zipf exponent of liquid usage")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    db_path = args.db or str(Path(tempfile.gettempdir()) / f"cocktails-{args.cocktails}.db")
+    try:
+        result = generate(db_path, args.cocktails, args.liquids, args.zipf, args.seed)
+    except FileExistsError as e:
+        print(f"{e}; remove it or pass --db")
+        return 1
+
+    print(f"Wrote {result['cocktails']} cocktails with {result['liquids']} liquids to {db_path} "
+          f"({result['rows']} rows in {result['seconds']:.1f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Load test: /status latency while catalog queries run.
+
+Polls GET /status while several clients hammer GET /cocktails against a
+synthetic catalog and reports the /status latency percentiles. It runs
+twice: once with database calls made inline on the event loop (the
+previous behaviour) and once through AsyncDatabaseService. With the
+executor, the /status p99 should stay close to the idle baseline.
+
+Requires httpx (pip install httpx).
+
+Usage (from the backend directory):
+    python benchmarks/load_status.py [cocktails] [catalog_clients] [polls]
+"""
+import asyncio
+import functools
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_catalog_load import populate  # noqa: E402
+from database.db_manager import DatabaseManager  # noqa: E402
+
+PUMP_COUNT = 8
+
+
+class InlineDatabaseService:
+    """Same interface as AsyncDatabaseService, but blocks the event loop"""
+
+    def __init__(self, db_service):
+        self.sync = db_service
+
+    async def run(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    run_bulk = run
+
+    def __getattr__(self, name):
+        attr = getattr(self.sync, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return attr(*args, **kwargs)
+
+        return method
+
+
+def create_database(path: str, cocktail_count: int):
+    """Create a synthetic catalog with every pump loaded"""
+    db = DatabaseManager(path)
+    populate(db, cocktail_count)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO pumps (id, pin, liquid_id) VALUES (?, ?, ?)",
+            [(pump_id, pump_id + 1, pump_id) for pump_id in range(1, PUMP_COUNT + 1)]
+        )
+        conn.commit()
+    db.close()
+
+
+def provide(service):
+    """Dependency override returning a fixed service (no parameters for FastAPI to inspect)"""
+    return lambda: service
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def poll_status(client: httpx.AsyncClient, polls: int):
+    """Return /status latencies in milliseconds"""
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        response = await client.get("/api/v1/status")
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def run_scenario(app, catalog_clients: int, polls: int):
+    """Measure /status latencies while catalog_clients fetch /cocktails in a loop"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://kiosk", timeout=None) as client:
+        stop = asyncio.Event()
+        catalog_requests = 0
+
+        async def catalog_client():
+            nonlocal catalog_requests
+            while not stop.is_set():
+                (await client.get("/api/v1/cocktails")).raise_for_status()
+                catalog_requests += 1
+
+        workers = [asyncio.create_task(catalog_client()) for _ in range(catalog_clients)]
+        latencies = await poll_status(client, polls)
+        stop.set()
+        await asyncio.gather(*workers)
+
+    return latencies, catalog_requests
+
+
+async def main(cocktail_count: int, catalog_clients: int, polls: int):
+    import main as backend
+
+    async with backend.app.router.lifespan_context(backend.app):
+        print(f"\n{'mode':<8} {'catalog clients':>16} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10} {'/cocktails':>11}")
+        modes = {
+            "inline": InlineDatabaseService(backend.db_service),
+            "async": backend.async_db_service,
+        }
+        for mode, service in modes.items():
+            backend.app.dependency_overrides[backend.get_db_service] = provide(service)
+            for clients in (0, catalog_clients):
+                latencies, catalog_requests = await run_scenario(backend.app, clients, polls)
+                print(f"{mode:<8} {clients:>16} {statistics.median(latencies):>10.1f} "
+                      f"{percentile(latencies, 99):>10.1f} {max(latencies):>10.1f} {catalog_requests:>11}")
+        backend.app.dependency_overrides.clear()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    cocktails, clients, polls = (args + [1000, 4, 100][len(args):])[:3]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_PATH"] = str(Path(tmp) / "load.db")
+        create_database(os.environ["DB_PATH"], cocktails)
+        asyncio.run(main(cocktails, clients, polls))
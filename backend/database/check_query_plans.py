@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Check that the hot lookup queries are served by indexes.
+
+Runs each hot DatabaseManager lookup, captures the SQL it executes and
+fails if EXPLAIN QUERY PLAN reports a full table scan for any of them.
+
+Usage (from the backend directory):
+    python -m database.check_query_plans [db_path]
+
+Without a db_path the check runs against a fresh temporary database.
+The same checks run in the test suite (tests/test_query_plans.py).
+"""
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from database.db_manager import DatabaseManager
+
+# (description, method name, arguments)
+HOT_LOOKUPS = [
+    ("liquid by name", "get_liquid_by_name", ("vodka",)),
+    ("liquid by id", "get_liquid_by_id", (1,)),
+    ("cocktail by name", "get_cocktail_by_name", ("mojito",)),
+    ("cocktail by id", "get_cocktail_by_id", (1,)),
+    ("cocktail ingredients", "get_cocktail_ingredients", (1,)),
+    ("pump by id", "get_pump_by_id", (1,)),
+    ("setting", "get_setting", ("cl_to_ml",)),
+    ("latest calibration", "get_latest_calibration", (1,)),
+]
+
+
+def capture_queries(db: DatabaseManager, method: str, args: tuple) -> List[str]:
+    """Run a DatabaseManager method and return the SQL statements it executed"""
+    statements = []
+    with db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            getattr(db, method)(*args)
+        finally:
+            conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+def table_scans(db: DatabaseManager, method: str, args: tuple) -> List[str]:
+    """EXPLAIN QUERY PLAN lines of the full table scans done by a DatabaseManager method"""
+    return [
+        detail
+        for sql in capture_queries(db, method, args)
+        for detail in db.explain_query_plan(sql)
+        if detail.startswith("SCAN")
+    ]
+
+
+def check_query_plans(db: DatabaseManager) -> List[str]:
+    """Return a list of problems, empty if every hot lookup uses an index"""
+    problems = []
+    for description, method, args in HOT_LOOKUPS:
+        for detail in table_scans(db, method, args):
+            problems.append(f"{description} ({method}): {detail}")
+    return problems
+
+
+def main(db_path: str = None) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(db_path or str(Path(tmp) / "plans.db"))
+        problems = check_query_plans(db)
+        db.close()
+
+    for description, method, _ in HOT_LOOKUPS:
+        failed = any(problem.startswith(f"{description} ({method})") for problem in problems)
+        print(f"{'❌' if failed else '✅'} {description}")
+
+    for problem in problems:
+        print(f"   {problem}")
+
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -1,47 +1,376 @@
 import sqlite3
 import os
+import re
+import threading
+import weakref
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from contextlib import contextmanager
 import logging
 
+from database.migrator import apply_migrations
+
 logger = logging.getLogger(__name__)
 
+# Connection tuning applied to every pooled connection
+CACHE_SIZE_KIB = 8192  # Page cache per connection (negative PRAGMA value = KiB)
+MMAP_SIZE_BYTES = 64 * 1024 * 1024  # Memory-map up to 64 MiB of the database file
+BUSY_TIMEOUT_MS = 5000  # Wait for locks instead of failing with "database is locked"
+
+# Table groups with their own data generation counter (see DatabaseManager.get_generation)
+TABLE_GROUPS = {
+    'cocktails': 'catalog',
+    'cocktail_ingredients': 'catalog',
+    'liquids': 'catalog',
+    'liquid_aliases': 'catalog',
+    'liquid_substitutions': 'catalog',
+    'catalog_revision': 'catalog',  # Bumped by triggers on the tables above
+    'pumps': 'pumps',
+    'settings': 'settings',
+    'calibrations': 'calibrations',
+    'calibration_summaries': 'calibrations',
+    'mix_history': 'history',
+    'cocktail_search': 'search',  # Derived from the catalog tables (see refresh_search_index)
+    'cocktail_search_pending': 'search',
+}
+GENERATION_GROUPS = tuple(sorted(set(TABLE_GROUPS.values())))
+# How often a background thread looks for commits made by other processes (PRAGMA data_version)
+EXTERNAL_WRITE_POLL_SECONDS = 0.5
+
+# Calibration rows kept per liquid by compact_calibrations(); older rows are folded into calibration_summaries
+CALIBRATION_HISTORY_KEEP = 10
+
+# Calibrations numbered newest first within each liquid
+_RANKED_CALIBRATIONS = """
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY liquid_id ORDER BY created_at DESC, id DESC) AS position
+    FROM calibrations
+"""
+
+
+def _merge_stats(a: tuple, b: tuple) -> tuple:
+    """Combine two (count, mean, sum of squared deviations) triples"""
+    count_a, mean_a, m2_a = a
+    count_b, mean_b, m2_b = b
+    count = count_a + count_b
+    if count == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta * delta * count_a * count_b / count
+    return count, mean, m2
+
+
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=256)
+def written_groups(query: str) -> frozenset:
+    """Table groups a write statement touches (every group if the table is not known)"""
+    match = _WRITE_TARGET.match(query)
+    group = TABLE_GROUPS.get(match.group(1).lower()) if match else None
+    return frozenset((group,)) if group else frozenset(GENERATION_GROUPS)
+
+
+# BM25 column weights for cocktail_search: name, description, garnish, ingredients
+SEARCH_WEIGHTS = (10.0, 1.0, 2.0, 5.0)
+_SEARCH_TERM = re.compile(r"\w+")
+
+# Re-index the cocktails queued by the cocktail_search triggers (see migration 0004)
+_REFRESH_SEARCH_INDEX = (
+    "DELETE FROM cocktail_search WHERE rowid IN (SELECT cocktail_id FROM cocktail_search_pending)",
+    """
+    INSERT INTO cocktail_search (rowid, name, description, garnish, ingredients)
+    SELECT c.id, c.name, c.description, c.garnish,
+           (SELECT group_concat(l.name, ' ')
+            FROM cocktail_ingredients ci JOIN liquids l ON l.id = ci.liquid_id
+            WHERE ci.cocktail_id = c.id)
+    FROM cocktails c
+    WHERE c.id IN (SELECT cocktail_id FROM cocktail_search_pending)
+    """,
+    "DELETE FROM cocktail_search_pending",
+)
+
+# Search hits whose required ingredients are all installed in active pumps
+_SEARCH_HIT_AVAILABLE = """
+    NOT EXISTS (
+        SELECT 1 FROM cocktail_ingredients ci
+        WHERE ci.cocktail_id = cocktail_search.rowid AND NOT ci.is_optional
+          AND ci.liquid_id NOT IN (SELECT liquid_id FROM pumps WHERE liquid_id IS NOT NULL AND is_active = 1)
+    )
+"""
+
+
+def match_query(text: str) -> Optional[str]:
+    """FTS5 MATCH expression requiring every word of text as a prefix, or None without words"""
+    terms = _SEARCH_TERM.findall(text)
+    return " ".join(f'"{term}"*' for term in terms) if terms else None
+
 
 class DatabaseManager:
     """Manages SQLite database connection and operations"""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pooled: bool = True):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            pooled: Keep one long-lived WAL connection per thread instead of
+                opening a new connection for every query
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pooled = pooled
+
+        # Pooled connections keyed by thread ident
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._pool_lock = threading.Lock()
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+        # Per-thread state for transaction()
+        self._local = threading.local()
+
+        # Data generations, bumped on commit of a write to the group's tables
+        self._generations = dict.fromkeys(GENERATION_GROUPS, 0)
+        self._generation_lock = threading.Lock()
+        self._watcher: Optional[sqlite3.Connection] = None
+        # Thread polling for external writes, started by the first get_generation()
+        self._watch_lock = threading.Lock()
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
         self._ensure_database()
+        self._data_version = self._read_data_version()
 
     def _ensure_database(self):
-        """Create database and tables if they don't exist"""
-        schema_path = Path(__file__).parent / "schema.sql"
-
+        """Create the database or bring its schema up to date"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
+            applied = apply_migrations(conn)
+
+        if applied:
+            logger.info(f"Database at {self.db_path} migrated to schema version {applied[-1]}")
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a new SQLite connection"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=not self.pooled
+        )
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
 
-            # Read and execute schema
-            if schema_path.exists():
-                with open(schema_path, 'r') as f:
-                    schema = f.read()
-                cursor.executescript(schema)
-
-            conn.commit()
-            logger.info(f"Database initialized at {self.db_path}")
+        if self.pooled:
+            # WAL lets readers and the mixing thread run without blocking each other
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+            conn.execute("PRAGMA temp_store = MEMORY")
+
+        with self._pool_lock:
+            self.connections_opened += 1
+        return conn
+
+    def _get_pooled_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        thread_id = threading.get_ident()
+        conn = self._connections.get(thread_id)
+        if conn is not None:
+            with self._pool_lock:
+                self.connections_reused += 1
+            return conn
+
+        conn = self._open_connection()
+        with self._pool_lock:
+            self._prune_dead_connections()
+            self._connections[thread_id] = conn
+        return conn
+
+    def _prune_dead_connections(self):
+        """Close connections owned by threads that have exited (caller holds the lock)"""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in [tid for tid in self._connections if tid not in alive]:
+            self._connections.pop(thread_id).close()
 
     @contextmanager
     def get_connection(self):
         """Context manager for database connections"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        transaction_conn = getattr(self._local, 'transaction_conn', None)
+        if transaction_conn is not None:
+            # Inside transaction(): reuse its connection, it commits or rolls back
+            yield transaction_conn
+            return
+
+        if self.pooled:
+            conn = self._get_pooled_connection()
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            return
+
+        conn = self._open_connection()
         try:
             yield conn
         finally:
             conn.close()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single transaction
+
+        All DatabaseManager calls made by this thread inside the block share
+        one connection and are committed together at the end (or rolled back
+        if an exception escapes). Nested blocks join the outer transaction.
+        """
+        if self.in_transaction():
+            yield self._local.transaction_conn
+            return
+
+        with self.get_connection() as conn:
+            self._local.transaction_conn = conn
+            self._local.written = set()
+            try:
+                yield conn
+                self._commit(conn, self._local.written)
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._local.transaction_conn = None
+
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside transaction()"""
+        return getattr(self._local, 'transaction_conn', None) is not None
+
+    def get_generation(self, *groups: str) -> tuple:
+        """
+        Current data generation of the given table groups (all groups if none given)
+
+        Generations only increase. A derived cache stores the generation it
+        was built from - read it *before* loading the data - and rebuilds once
+        it changes. Commits by other processes (e.g. the import scripts) are
+        detected by a background thread within EXTERNAL_WRITE_POLL_SECONDS and
+        bump every group.
+
+        Only reads in-memory counters (no I/O, no locks), so it is safe to
+        call from the event loop.
+        """
+        if self._watch_thread is None:
+            self._start_watching()
+        generations = self._generations
+        return tuple(generations[group] for group in (groups or GENERATION_GROUPS))
+
+    def _start_watching(self):
+        """Start the thread that polls for external writes"""
+        with self._watch_lock:
+            if self._watch_thread is not None:
+                return
+            self._stop_watching = threading.Event()
+            self._watch_thread = threading.Thread(
+                target=self._watch_external_writes, args=(weakref.ref(self), self._stop_watching),
+                name=f"data-version-watcher {self.db_path.name}", daemon=True
+            )
+            self._watch_thread.start()
+
+    @staticmethod
+    def _watch_external_writes(manager_ref: weakref.ref, stop: threading.Event):
+        """Check for external writes until stopped (holds no reference, ends with the manager)"""
+        while not stop.wait(EXTERNAL_WRITE_POLL_SECONDS):
+            manager = manager_ref()
+            if manager is None:
+                return
+            try:
+                manager.check_external_writes()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not check {manager.db_path} for external writes: {e}")
+            del manager
+
+    def check_external_writes(self) -> bool:
+        """Bump every generation if another connection committed since we last looked"""
+        with self._generation_lock:
+            return self._check_external_writes_locked()
+
+    def _check_external_writes_locked(self) -> bool:
+        data_version = self._read_data_version()
+        changed = data_version != self._data_version
+        self._data_version = data_version
+        if changed:
+            self._bump_locked(GENERATION_GROUPS)
+        return changed
+
+    def _read_data_version(self) -> int:
+        """PRAGMA data_version of a dedicated connection (changes when any other connection commits)"""
+        if self._watcher is None:
+            self._watcher = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _bump_locked(self, groups):
+        for group in groups:
+            self._generations[group] += 1
+
+    def _commit(self, conn: sqlite3.Connection, groups):
+        """Commit and bump the generations of the written table groups"""
+        if 'catalog' in groups and self._refresh_search_index(conn):
+            groups = set(groups) | {'search'}
+        with self._generation_lock:
+            # Pick up foreign commits first; holding the write lock, nobody else commits before us
+            self._check_external_writes_locked()
+            before = conn.execute("PRAGMA data_version").fetchone()[0]
+            conn.commit()
+            # The new watcher baseline absorbs our own commit, but may also hide a
+            # foreign one made right after it. This connection's data_version does
+            # not change for its own commits, so if it moved, someone else committed
+            # in between: bump everything like check_external_writes() would.
+            self._data_version = self._read_data_version()
+            if conn.execute("PRAGMA data_version").fetchone()[0] != before:
+                groups = GENERATION_GROUPS
+            self._bump_locked(groups)
+
+    def _finish_write(self, conn: sqlite3.Connection, query: str):
+        """Commit a write, or record its table groups until the transaction commits"""
+        if self.in_transaction():
+            self._local.written.update(written_groups(query))
+        else:
+            self._commit(conn, written_groups(query))
+
+    def explain_query_plan(self, query: str, params: tuple = ()) -> List[str]:
+        """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+        rows = self.execute_query(f"EXPLAIN QUERY PLAN {query}", params)
+        return [row['detail'] for row in rows]
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._watch_lock:
+            thread, self._watch_thread = self._watch_thread, None
+            self._stop_watching.set()
+        if thread is not None:
+            thread.join()
+
+        with self._pool_lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+        with self._generation_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get connection pool counters"""
+        return {
+            "pooled": self.pooled,
+            "open_connections": len(self._connections),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+        }
+
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """Execute a SELECT query and return results as list of dicts"""
         with self.get_connection() as conn:
@@ -55,7 +384,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            conn.commit()
+            self._finish_write(conn, query)
             return cursor.rowcount
 
     def execute_insert(self, query: str, params: tuple = ()) -> int:
@@ -63,9 +392,19 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            conn.commit()
+            self._finish_write(conn, query)
             return cursor.lastrowid
 
+    def execute_many(self, query: str, rows: List[tuple]) -> int:
+        """Execute a write query once per parameter tuple and return affected rows"""
+        if not rows:
+            return 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, rows)
+            self._finish_write(conn, query)
+            return cursor.rowcount
+
     # ===== LIQUIDS =====
 
     def get_all_liquids(self) -> List[Dict[str, Any]]:
@@ -81,7 +420,7 @@ class DatabaseManager:
 
     def get_liquid_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a liquid by name (case-insensitive)"""
-        query = "SELECT id, name, category FROM liquids WHERE LOWER(name) = LOWER(?)"
+        query = "SELECT id, name, category FROM liquids WHERE name = ? COLLATE NOCASE"
         results = self.execute_query(query, (name,))
         return results[0] if results else None
 
@@ -97,6 +436,51 @@ class DatabaseManager:
             return liquid['id']
         return self.add_liquid(name, category)
 
+    def get_liquid_usage(self) -> List[Dict[str, Any]]:
+        """Get every liquid with the number of cocktails using it"""
+        query = """
+            SELECT l.id, l.name, COUNT(ci.cocktail_id) AS cocktail_count
+            FROM liquids l
+            LEFT JOIN cocktail_ingredients ci ON ci.liquid_id = l.id
+            GROUP BY l.id
+        """
+        return self.execute_query(query)
+
+    def get_liquid_aliases(self) -> List[Dict[str, Any]]:
+        """Get all liquid aliases"""
+        query = "SELECT liquid_id, alias FROM liquid_aliases ORDER BY liquid_id, alias"
+        return self.execute_query(query)
+
+    def add_liquid_alias(self, liquid_id: int, alias: str) -> int:
+        """Add an alternative name for a liquid and return its ID"""
+        query = "INSERT INTO liquid_aliases (liquid_id, alias) VALUES (?, ?)"
+        return self.execute_insert(query, (liquid_id, alias))
+
+    def get_liquid_substitutions(self) -> List[Dict[str, Any]]:
+        """Get all substitution rules (liquid_id may be replaced by substitute_id)"""
+        query = """
+            SELECT s.liquid_id, s.substitute_id, s.ratio, l.name AS liquid, sub.name AS substitute
+            FROM liquid_substitutions s
+            JOIN liquids l ON l.id = s.liquid_id
+            JOIN liquids sub ON sub.id = s.substitute_id
+            ORDER BY s.id
+        """
+        return self.execute_query(query)
+
+    def set_liquid_substitution(self, liquid_id: int, substitute_id: int, ratio: float = 1.0) -> int:
+        """Allow substitute_id to be poured instead of liquid_id (updates the ratio if the rule exists)"""
+        query = """
+            INSERT INTO liquid_substitutions (liquid_id, substitute_id, ratio)
+            VALUES (?, ?, ?)
+            ON CONFLICT(liquid_id, substitute_id) DO UPDATE SET ratio = excluded.ratio
+        """
+        return self.execute_update(query, (liquid_id, substitute_id, ratio))
+
+    def delete_liquid_substitution(self, liquid_id: int, substitute_id: int) -> bool:
+        """Remove a substitution rule"""
+        query = "DELETE FROM liquid_substitutions WHERE liquid_id = ? AND substitute_id = ?"
+        return self.execute_update(query, (liquid_id, substitute_id)) > 0
+
     # ===== PUMPS =====
 
     def get_all_pumps(self) -> List[Dict[str, Any]]:
@@ -155,39 +539,123 @@ class DatabaseManager:
 
     # ===== COCKTAILS =====
 
-    def get_all_cocktails(self) -> List[Dict[str, Any]]:
-        """Get all cocktails with their ingredients"""
-        query = "SELECT id, name, timing, taste, preparation, glass_type, garnish, description FROM cocktails ORDER BY name"
-        cocktails = self.execute_query(query)
+    def _load_cocktails(self, where: str = "", params: tuple = ()) -> List[Dict[str, Any]]:
+        """Load cocktails and their ingredients with a single JOIN, grouped in one pass"""
+        query = f"""
+            SELECT c.id, c.name, c.timing, c.taste, c.preparation, c.glass_type, c.garnish, c.description,
+                   l.name as ingredient, ci.amount, ci.unit, ci.is_optional, ci.liquid_id
+            FROM cocktails c
+            LEFT JOIN cocktail_ingredients ci ON ci.cocktail_id = c.id
+            LEFT JOIN liquids l ON ci.liquid_id = l.id
+            {where}
+            ORDER BY c.name, c.id, ci.id
+        """
+        cocktails = []
+        current = None
 
-        for cocktail in cocktails:
-            cocktail['ingredients'] = self.get_cocktail_ingredients(cocktail['id'])
+        with self.get_connection() as conn:
+            # Iterate the cursor directly so rows are grouped as they stream in
+            for row in conn.execute(query, params):
+                if current is None or current['id'] != row['id']:
+                    current = {
+                        'id': row['id'],
+                        'name': row['name'],
+                        'timing': row['timing'],
+                        'taste': row['taste'],
+                        'preparation': row['preparation'],
+                        'glass_type': row['glass_type'],
+                        'garnish': row['garnish'],
+                        'description': row['description'],
+                        'ingredients': [],
+                    }
+                    cocktails.append(current)
+
+                # Cocktails without ingredients (or with dangling liquid references) yield NULLs
+                if row['ingredient'] is not None:
+                    current['ingredients'].append({
+                        'ingredient': row['ingredient'],
+                        'amount': row['amount'],
+                        'unit': row['unit'],
+                        'is_optional': row['is_optional'],
+                        'liquid_id': row['liquid_id'],
+                    })
 
         return cocktails
 
-    def get_cocktail_by_id(self, cocktail_id: int) -> Optional[Dict[str, Any]]:
-        """Get a cocktail by ID with ingredients"""
-        query = "SELECT id, name, timing, taste, preparation, glass_type, garnish, description FROM cocktails WHERE id = ?"
-        results = self.execute_query(query, (cocktail_id,))
+    def get_catalog_revision(self) -> int:
+        """Persistent revision of the cocktail catalog, changed by every write get_all_cocktails() can see"""
+        results = self.execute_query("SELECT revision FROM catalog_revision WHERE id = 1")
+        return results[0]['revision'] if results else 0
 
-        if not results:
-            return None
+    def get_all_cocktails(self) -> List[Dict[str, Any]]:
+        """Get all cocktails with their ingredients"""
+        return self._load_cocktails()
 
-        cocktail = results[0]
-        cocktail['ingredients'] = self.get_cocktail_ingredients(cocktail_id)
-        return cocktail
+    def get_cocktail_by_id(self, cocktail_id: int) -> Optional[Dict[str, Any]]:
+        """Get a cocktail by ID with ingredients"""
+        results = self._load_cocktails("WHERE c.id = ?", (cocktail_id,))
+        return results[0] if results else None
 
     def get_cocktail_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a cocktail by name (case-insensitive) with ingredients"""
-        query = "SELECT id, name, timing, taste, preparation, glass_type, garnish, description FROM cocktails WHERE LOWER(name) = LOWER(?)"
-        results = self.execute_query(query, (name,))
+        results = self._load_cocktails("WHERE c.name = ? COLLATE NOCASE", (name,))
+        return results[0] if results else None
 
-        if not results:
-            return None
+    def search_cocktails(self, text: str, limit: Optional[int] = None,
+                         available: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Full-text search over cocktail names, descriptions, garnishes and ingredients
+
+        Args:
+            text: Search words, each matched as a word prefix (all must match)
+            limit: Maximum number of hits (all if None)
+            available: Only makeable (True) or only unavailable (False) cocktails
 
-        cocktail = results[0]
-        cocktail['ingredients'] = self.get_cocktail_ingredients(cocktail['id'])
-        return cocktail
+        Returns:
+            List of {'id', 'score'} dicts, best match first (higher score is better)
+        """
+        match = match_query(text)
+        if match is None:
+            return []
+        self.refresh_search_index()
+
+        conditions = ["cocktail_search MATCH ?"]
+        params: list = [match]
+        if available is not None:
+            conditions.append(_SEARCH_HIT_AVAILABLE if available else f"NOT {_SEARCH_HIT_AVAILABLE}")
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        query = f"""
+            SELECT rowid AS id, -bm25(cocktail_search, {weights}) AS score
+            FROM cocktail_search
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score DESC, rowid
+        """
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.execute_query(query, tuple(params))
+
+    def refresh_search_index(self) -> int:
+        """
+        Re-index cocktails changed since the last refresh
+
+        Writes through this class refresh the index when they commit; this
+        catches up after writes made by other tools. Returns the number of
+        cocktails re-indexed.
+        """
+        if not self.execute_query("SELECT 1 FROM cocktail_search_pending LIMIT 1"):
+            return 0
+        with self.transaction() as conn:
+            refreshed = self._refresh_search_index(conn)
+            self._local.written.add('search')
+        return refreshed
+
+    def _refresh_search_index(self, conn: sqlite3.Connection) -> int:
+        pending = conn.execute("SELECT COUNT(*) FROM cocktail_search_pending").fetchone()[0]
+        if pending:
+            for statement in _REFRESH_SEARCH_INDEX:
+                conn.execute(statement)
+        return pending
 
     def get_cocktail_ingredients(self, cocktail_id: int) -> List[Dict[str, Any]]:
         """Get all ingredients for a cocktail"""
@@ -236,12 +704,120 @@ class DatabaseManager:
             SELECT id, liquid_id, ml_per_second, test_duration_seconds, measured_volume_ml, notes, created_at
             FROM calibrations
             WHERE liquid_id = ?
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, id DESC
             LIMIT 1
         """
         results = self.execute_query(query, (liquid_id,))
         return results[0] if results else None
 
+    def get_latest_calibrations(self) -> List[Dict[str, Any]]:
+        """Get the most recent calibration of every liquid"""
+        query = f"""
+            SELECT id, liquid_id, ml_per_second, test_duration_seconds, measured_volume_ml, notes, created_at
+            FROM ({_RANKED_CALIBRATIONS})
+            WHERE position = 1
+        """
+        return self.execute_query(query)
+
+    def get_calibration_stats(self, liquid_id: int) -> Optional[Dict[str, Any]]:
+        """Get flow rate statistics over the full calibration history (compacted and recent)"""
+        summary = self.execute_query(
+            "SELECT sample_count, mean_ml_per_second, sum_squared_deviation FROM calibration_summaries WHERE liquid_id = ?",
+            (liquid_id,)
+        )
+        recent = self.execute_query(
+            """
+            SELECT COUNT(*) AS sample_count, AVG(ml_per_second) AS mean,
+                   SUM(ml_per_second * ml_per_second) AS sum_squares
+            FROM calibrations
+            WHERE liquid_id = ?
+            """,
+            (liquid_id,)
+        )[0]
+
+        stats = (0, 0.0, 0.0)
+        if summary:
+            row = summary[0]
+            stats = (row['sample_count'], row['mean_ml_per_second'], row['sum_squared_deviation'])
+        if recent['sample_count']:
+            count, mean = recent['sample_count'], recent['mean']
+            stats = _merge_stats(stats, (count, mean, max(recent['sum_squares'] - count * mean * mean, 0.0)))
+
+        count, mean, m2 = stats
+        if count == 0:
+            return None
+        return {
+            'liquid_id': liquid_id,
+            'sample_count': count,
+            'mean_ml_per_second': mean,
+            'stddev_ml_per_second': (m2 / (count - 1)) ** 0.5 if count > 1 else 0.0,
+        }
+
+    def compact_calibrations(self, keep: int = CALIBRATION_HISTORY_KEEP) -> Dict[str, int]:
+        """
+        Fold all but the newest calibrations of each liquid into calibration_summaries
+
+        Args:
+            keep: Number of most recent calibrations to keep per liquid (at least 1)
+
+        Returns:
+            Number of liquids compacted and calibration rows removed
+        """
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+
+        with self.transaction():
+            folded = self.execute_query(
+                f"""
+                SELECT liquid_id, COUNT(*) AS sample_count, AVG(ml_per_second) AS mean,
+                       SUM(ml_per_second * ml_per_second) AS sum_squares,
+                       MIN(created_at) AS first_at, MAX(created_at) AS last_at
+                FROM ({_RANKED_CALIBRATIONS})
+                WHERE position > ?
+                GROUP BY liquid_id
+                """,
+                (keep,)
+            )
+            if not folded:
+                return {'liquids': 0, 'rows': 0}
+
+            summaries = {
+                row['liquid_id']: row
+                for row in self.execute_query("SELECT * FROM calibration_summaries")
+            }
+
+            rows = []
+            for group in folded:
+                count, mean = group['sample_count'], group['mean']
+                stats = (count, mean, max(group['sum_squares'] - count * mean * mean, 0.0))
+                first_at = group['first_at']
+
+                summary = summaries.get(group['liquid_id'])
+                if summary:
+                    stats = _merge_stats(
+                        (summary['sample_count'], summary['mean_ml_per_second'], summary['sum_squared_deviation']),
+                        stats
+                    )
+                    first_at = min(filter(None, (summary['first_calibrated_at'], first_at)), default=None)
+
+                rows.append((group['liquid_id'], *stats, first_at, group['last_at']))
+
+            self.execute_many(
+                """
+                INSERT OR REPLACE INTO calibration_summaries
+                    (liquid_id, sample_count, mean_ml_per_second, sum_squared_deviation,
+                     first_calibrated_at, last_calibrated_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                rows
+            )
+            removed = self.execute_update(
+                f"DELETE FROM calibrations WHERE id IN (SELECT id FROM ({_RANKED_CALIBRATIONS}) WHERE position > ?)",
+                (keep,)
+            )
+
+        return {'liquids': len(rows), 'rows': removed}
+
     # ===== SETTINGS =====
 
     def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
@@ -250,6 +826,11 @@ class DatabaseManager:
         results = self.execute_query(query, (key,))
         return results[0]['value'] if results else default
 
+    def get_all_settings(self) -> Dict[str, str]:
+        """Get all settings as a key -> value dict"""
+        results = self.execute_query("SELECT key, value FROM settings")
+        return {row['key']: row['value'] for row in results}
+
     def set_setting(self, key: str, value: str) -> bool:
         """Set a setting value"""
         query = "INSERT OR REPLACE INTO settings (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)"
@@ -266,6 +847,16 @@ class DatabaseManager:
         """
         return self.execute_insert(query, (cocktail_id, size_multiplier))
 
+    def get_mix_counts(self) -> Dict[int, int]:
+        """Get the number of completed mixes per cocktail ID"""
+        query = """
+            SELECT cocktail_id, COUNT(*) AS mixes
+            FROM mix_history
+            WHERE status = 'completed'
+            GROUP BY cocktail_id
+        """
+        return {row['cocktail_id']: row['mixes'] for row in self.execute_query(query)}
+
     def update_mix_history_status(self, history_id: int, status: str, error_message: Optional[str] = None) -> bool:
         """Update mix history status"""
         query = """
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Bulk catalog import engine
+
+Streams cocktail recipes from JSON / JSON Lines, YAML or CSV and upserts
+them with executemany inside a single transaction. Liquids are resolved
+through an in-memory name -> id map, and existing recipes are compared in
+memory so unchanged cocktails are not rewritten.
+
+Record format (JSON / YAML):
+    {"name": "Mojito", "timing": "All day", "taste": "Fresh",
+     "preparation": "Build", "glass_type": "Highball", "garnish": "...",
+     "description": "...",
+     "ingredients": [{"ingredient": "Light Rum", "amount": 4.5, "unit": "cl",
+                      "is_optional": false}, ...]}
+("liquid" is accepted as an alias for "ingredient".)
+
+CSV has one row per ingredient; consecutive rows with the same name form
+one cocktail:
+    name,timing,taste,preparation,glass_type,garnish,description,ingredient,amount,unit,is_optional
+
+Usage (from the backend directory):
+    python -m database.importer recipes.yaml [--db PATH] [--skip-existing]
+        [--missing-liquids create|drop|skip] [--dry-run]
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+from database.db_manager import DatabaseManager
+
+COCKTAIL_FIELDS = ('name', 'timing', 'taste', 'preparation', 'glass_type', 'garnish', 'description')
+BATCH_SIZE = 1000
+MAX_SQL_PARAMS = 900  # Stay below SQLite's default limit of 999 bound parameters
+JSON_CHUNK_SIZE = 64 * 1024  # Characters read at a time from JSON arrays
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+# Policies for ingredients whose liquid is not in the database
+MISSING_LIQUID_POLICIES = ('create', 'drop', 'skip')
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import run"""
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    liquids_added: List[str] = field(default_factory=list)
+    missing_liquids: Dict[str, List[str]] = field(default_factory=dict)  # liquid -> cocktails
+    rows: int = 0
+    seconds: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['rows_per_second'] = round(self.rows_per_second, 1)
+        return data
+
+    def summary(self) -> str:
+        lines = [
+            f"📊 {'Dry run' if self.dry_run else 'Import'}: {self.rows} rows in {self.seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s)",
+            f"   ✅ Added: {len(self.added)} cocktails",
+            f"   🔄 Updated: {len(self.updated)} cocktails",
+            f"   ⏸️  Unchanged: {len(self.unchanged)} cocktails",
+            f"   ⏭️  Skipped: {len(self.skipped)} cocktails",
+            f"   🧪 New liquids: {len(self.liquids_added)}",
+        ]
+        for liquid, cocktails in sorted(self.missing_liquids.items()):
+            lines.append(f"   ⚠️  Unknown liquid '{liquid}' in: {', '.join(cocktails)}")
+        return "\n".join(lines)
+
+
+# ===== READERS =====
+
+def _iter_json_array(f, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """Decode the items of a top-level JSON array one at a time, reading f in chunks"""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+
+    def more():
+        """Drop the consumed text and append the next chunk"""
+        nonlocal buffer, position, eof
+        chunk = "" if eof else f.read(chunk_size)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+    def peek() -> str:
+        """Next non-whitespace character without consuming it ('' at end of file)"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return buffer[position:position + 1]
+            more()
+
+    if peek() != '[':
+        raise ValueError("Expected a JSON array")
+    position += 1
+    if peek() == ']':
+        return
+
+    while True:
+        peek()  # raw_decode does not skip leading whitespace
+        # An item is complete once followed by a character that cannot continue a number
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                if eof or (end < len(buffer) and buffer[end] not in _NUMBER_CHARS):
+                    break
+            more()
+        position = end
+        yield item
+
+        separator = peek()
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or ']' after item of JSON array, got {separator or 'end of file'!r}")
+        position += 1
+
+
+def read_json(path: Path) -> Iterator[dict]:
+    """
+    Read a JSON array, {"cocktails": [...]} or JSON Lines
+
+    Arrays and JSON Lines are streamed item by item; a {"cocktails": [...]}
+    object is read into memory as a whole.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first in ('[', '{') and path.suffix.lower() not in ('.jsonl', '.ndjson'):
+            if first == '[':
+                yield from _iter_json_array(f)
+            else:
+                yield from json.load(f).get('cocktails', [])
+            return
+
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_yaml(path: Path) -> Iterator[dict]:
+    """Read one or more YAML documents, each a list of cocktails or a single cocktail"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for document in yaml.safe_load_all(f):
+            if isinstance(document, dict):
+                yield from document.get('cocktails', [document])
+            elif document:
+                yield from document
+
+
+def read_csv(path: Path) -> Iterator[dict]:
+    """Read one ingredient per row, grouping consecutive rows by cocktail name"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        current = None
+        for row in csv.DictReader(f):
+            name = (row.get('name') or '').strip()
+            if current is None or (name and name != current['name']):
+                if current is not None:
+                    yield current
+                current = {key: row.get(key) or None for key in COCKTAIL_FIELDS}
+                current['name'] = name
+                current['ingredients'] = []
+
+            if row.get('ingredient'):
+                current['ingredients'].append({
+                    'ingredient': row['ingredient'],
+                    'amount': row.get('amount') or 0,
+                    'unit': row.get('unit') or 'cl',
+                    'is_optional': (row.get('is_optional') or '').strip().lower() in ('1', 'true', 'yes'),
+                })
+        if current is not None:
+            yield current
+
+
+READERS = {'json': read_json, 'jsonl': read_json, 'ndjson': read_json,
+           'yaml': read_yaml, 'yml': read_yaml, 'csv': read_csv}
+
+
+def read_records(path: str, file_format: Optional[str] = None) -> Iterator[dict]:
+    """Stream cocktail records from a file, picking the reader by format or extension"""
+    path = Path(path)
+    file_format = (file_format or path.suffix.lstrip('.')).lower()
+    if file_format not in READERS:
+        raise ValueError(f"Unsupported import format '{file_format}' (use json, yaml or csv)")
+    return READERS[file_format](path)
+
+
+# ===== ENGINE =====
+
+class CatalogImporter:
+    """Upserts cocktail records in batches inside one transaction"""
+
+    def __init__(self, db: DatabaseManager, skip_existing: bool = False,
+                 missing_liquids: str = 'create', batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            db: Target database
+            skip_existing: Leave cocktails that already exist untouched instead of updating them
+            missing_liquids: 'create' unknown liquids, 'drop' the ingredient, or 'skip' the cocktail
+            batch_size: Cocktails per executemany batch
+        """
+        if missing_liquids not in MISSING_LIQUID_POLICIES:
+            raise ValueError(f"missing_liquids must be one of {MISSING_LIQUID_POLICIES}")
+        self.db = db
+        self.skip_existing = skip_existing
+        self.missing_liquids = missing_liquids
+        self.batch_size = batch_size
+
+    def import_records(self, records: Iterable[dict], dry_run: bool = False) -> ImportReport:
+        """Import cocktail records and return a report of what changed"""
+        report = ImportReport(dry_run=dry_run)
+        start = time.perf_counter()
+
+        # In-memory state: liquid name -> id, cocktail name -> (id, comparable recipe)
+        liquid_ids = {liquid['name'].lower(): liquid['id'] for liquid in self.db.get_all_liquids()}
+        existing = {
+            cocktail['name'].lower(): (cocktail['id'], self._comparable(cocktail, cocktail['ingredients']))
+            for cocktail in self.db.get_all_cocktails()
+        }
+
+        with self.db.transaction():
+            batch: Dict[str, Tuple[dict, List[dict]]] = {}
+            for record in records:
+                prepared = self._prepare(record, liquid_ids, report, dry_run)
+                if prepared is None:
+                    continue
+                cocktail, ingredients = prepared
+                report.rows += 1 + len(ingredients)
+
+                key = cocktail['name'].lower()
+                current = existing.get(key)
+                if current is not None and key not in batch:
+                    if self.skip_existing:
+                        report.skipped.append(cocktail['name'])
+                        continue
+                    if current[1] == self._comparable(cocktail, ingredients):
+                        report.unchanged.append(cocktail['name'])
+                        continue
+
+                # A later record with the same name replaces an earlier one in the batch
+                batch[key] = (cocktail, ingredients)
+                if len(batch) >= self.batch_size:
+                    self._flush(batch, existing, report, dry_run)
+                    batch = {}
+
+            self._flush(batch, existing, report, dry_run)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _prepare(self, record: dict, liquid_ids: Dict[str, int], report: ImportReport,
+                 dry_run: bool) -> Optional[Tuple[dict, List[dict]]]:
+        """Normalize a record and resolve its liquids to IDs"""
+        name = (record.get('name') or '').strip()
+        if not name:
+            return None
+
+        cocktail = {key: record.get(key) for key in COCKTAIL_FIELDS}
+        cocktail['name'] = name
+
+        ingredients = []
+        seen_liquids = set()
+        for ingredient in record.get('ingredients') or []:
+            liquid_name = (ingredient.get('ingredient') or ingredient.get('liquid') or '').strip()
+            liquid_id = liquid_ids.get(liquid_name.lower())
+
+            if liquid_id is None:
+                if self.missing_liquids != 'create':
+                    report.missing_liquids.setdefault(liquid_name, []).append(name)
+                    if self.missing_liquids == 'skip':
+                        report.skipped.append(name)
+                        return None
+                    continue
+                # Negative placeholder IDs stand in for liquids a dry run would create
+                liquid_id = -len(report.liquids_added) - 1 if dry_run else self.db.add_liquid(liquid_name)
+                liquid_ids[liquid_name.lower()] = liquid_id
+                report.liquids_added.append(liquid_name)
+
+            # A liquid can only appear once per cocktail (UNIQUE(cocktail_id, liquid_id))
+            if liquid_id in seen_liquids:
+                continue
+            seen_liquids.add(liquid_id)
+
+            ingredients.append({
+                'liquid_id': liquid_id,
+                'amount': float(ingredient.get('amount') or 0),
+                'unit': ingredient.get('unit') or 'cl',
+                'is_optional': bool(ingredient.get('is_optional', False)),
+            })
+
+        return cocktail, ingredients
+
+    @staticmethod
+    def _comparable(cocktail: dict, ingredients: List[dict]) -> tuple:
+        """Recipe as a hashable value for change detection"""
+        return (
+            tuple(cocktail.get(key) for key in COCKTAIL_FIELDS),
+            tuple(
+                (ing['liquid_id'], float(ing['amount']), ing['unit'], bool(ing['is_optional']))
+                for ing in ingredients
+            ),
+        )
+
+    def _flush(self, batch: Dict[str, Tuple[dict, List[dict]]], existing: Dict[str, tuple],
+               report: ImportReport, dry_run: bool):
+        """Write one batch of new and changed cocktails with executemany"""
+        if not batch:
+            return
+
+        inserts = [(key, cocktail) for key, (cocktail, _) in batch.items() if key not in existing]
+        updates = [(key, cocktail) for key, (cocktail, _) in batch.items() if key in existing]
+        report.added.extend(cocktail['name'] for _, cocktail in inserts)
+        report.updated.extend(cocktail['name'] for _, cocktail in updates)
+
+        if dry_run:
+            for key, (cocktail, ingredients) in batch.items():
+                existing[key] = (None, self._comparable(cocktail, ingredients))
+            return
+
+        columns = ', '.join(COCKTAIL_FIELDS)
+        placeholders = ', '.join('?' for _ in COCKTAIL_FIELDS)
+        self.db.execute_many(
+            f"INSERT INTO cocktails ({columns}) VALUES ({placeholders})",
+            [tuple(cocktail[key] for key in COCKTAIL_FIELDS) for _, cocktail in inserts]
+        )
+        self.db.execute_many(
+            f"UPDATE cocktails SET {', '.join(f'{key} = ?' for key in COCKTAIL_FIELDS)} WHERE id = ?",
+            [tuple(cocktail[key] for key in COCKTAIL_FIELDS) + (existing[key][0],) for key, cocktail in updates]
+        )
+
+        # Look up the IDs of the new cocktails
+        new_ids = {}
+        names = [cocktail['name'] for _, cocktail in inserts]
+        for i in range(0, len(names), MAX_SQL_PARAMS):
+            chunk = names[i:i + MAX_SQL_PARAMS]
+            rows = self.db.execute_query(
+                f"SELECT id, name FROM cocktails WHERE name IN ({', '.join('?' for _ in chunk)})",
+                tuple(chunk)
+            )
+            new_ids.update({row['name'].lower(): row['id'] for row in rows})
+
+        cocktail_ids = {key: new_ids[key] for key, _ in inserts}
+        cocktail_ids.update({key: existing[key][0] for key, _ in updates})
+
+        # Replace the ingredient lists of updated cocktails
+        self.db.execute_many(
+            "DELETE FROM cocktail_ingredients WHERE cocktail_id = ?",
+            [(existing[key][0],) for key, _ in updates]
+        )
+        self.db.execute_many(
+            "INSERT INTO cocktail_ingredients (cocktail_id, liquid_id, amount, unit, is_optional) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (cocktail_ids[key], ing['liquid_id'], ing['amount'], ing['unit'], ing['is_optional'])
+                for key, (_, ingredients) in batch.items()
+                for ing in ingredients
+            ]
+        )
+
+        for key, (cocktail, ingredients) in batch.items():
+            existing[key] = (cocktail_ids[key], self._comparable(cocktail, ingredients))
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import cocktail recipes")
+    parser.add_argument('file', help="JSON, JSON Lines, YAML or CSV file (JSON arrays and JSON Lines are streamed, "
+                                     "a {\"cocktails\": [...]} object is read whole)")
+    parser.add_argument('--db', default='database/cocktails.db', help="Database path")
+    parser.add_argument('--format', choices=sorted(READERS), help="Override format detection")
+    parser.add_argument('--skip-existing', action='store_true', help="Do not update existing cocktails")
+    parser.add_argument('--missing-liquids', choices=MISSING_LIQUID_POLICIES, default='create',
+                        help="What to do with unknown liquids (default: create them)")
+    parser.add_argument('--dry-run', action='store_true', help="Report changes without writing")
+    args = parser.parse_args(argv)
+
+    print(f"🍸 Importing {args.file} into {args.db}\n")
+    db = DatabaseManager(args.db)
+    importer = CatalogImporter(db, skip_existing=args.skip_existing, missing_liquids=args.missing_liquids)
+    report = importer.import_records(read_records(args.file, args.format), dry_run=args.dry_run)
+    db.close()
+
+    print(report.summary())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
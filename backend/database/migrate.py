@@ -4,7 +4,11 @@ Migration script to convert YAML data to SQLite database
 import sys
 import yaml
 from pathlib import Path
-from db_manager import DatabaseManager
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.db_manager import DatabaseManager  # noqa: E402
+from database.importer import CatalogImporter  # noqa: E402
 
 def migrate_data(db_path: str, cocktails_yaml: str, config_yaml: str):
     """Migrate data from YAML files to SQLite database"""
@@ -20,55 +24,20 @@ def migrate_data(db_path: str, cocktails_yaml: str, config_yaml: str):
     with open(config_yaml, 'r', encoding='utf-8') as f:
         config_data = yaml.safe_load(f)
 
-    # Migrate liquids from cocktails
-    print("\n1. Migrating liquids...")
-    liquid_ids = {}
-
-    # Collect all unique liquids from cocktails
-    for cocktail in cocktails_data:
-        for ing in cocktail.get('ingredients', []):
-            liquid_name = ing['ingredient']
-            if liquid_name not in liquid_ids:
-                liquid_id = db.get_or_create_liquid(liquid_name)
-                liquid_ids[liquid_name] = liquid_id
-                print(f"   - {liquid_name} (ID: {liquid_id})")
-
-    print(f"   Total liquids: {len(liquid_ids)}")
-
-    # Migrate cocktails
-    print("\n2. Migrating cocktails...")
-    for cocktail in cocktails_data:
-        name = cocktail['name']
-
-        # Check if cocktail already exists
-        existing = db.get_cocktail_by_name(name)
-        if existing:
-            print(f"   - {name} (already exists)")
-            continue
-
-        cocktail_id = db.add_cocktail(
-            name=name,
-            timing=cocktail.get('timing'),
-            taste=cocktail.get('taste'),
-            preparation=cocktail.get('preparation')
-        )
-
-        # Add ingredients
-        for ing in cocktail.get('ingredients', []):
-            liquid_name = ing['ingredient']
-            liquid_id = liquid_ids[liquid_name]
-
-            db.add_cocktail_ingredient(
-                cocktail_id=cocktail_id,
-                liquid_id=liquid_id,
-                amount=ing['amount'],
-                unit=ing['unit']
-            )
-
-        print(f"   - {name} (ID: {cocktail_id}) with {len(cocktail.get('ingredients', []))} ingredients")
+    # Migrate liquids and cocktails in one bulk import (existing cocktails are kept)
+    print("\n1. Migrating liquids and cocktails...")
+    report = CatalogImporter(db, skip_existing=True).import_records(cocktails_data or [])
+    for liquid_name in report.liquids_added:
+        print(f"   - Liquid {liquid_name}")
+    for name in report.added:
+        print(f"   - {name}")
+    for name in report.skipped:
+        print(f"   - {name} (already exists)")
+    print(f"   Total: {len(report.liquids_added)} liquids, {len(report.added)} cocktails "
+          f"({report.rows} rows in {report.seconds:.2f}s)")
 
     # Migrate pumps
-    print("\n3. Migrating pumps...")
+    print("\n2. Migrating pumps...")
 
     # First, create pump entries if they don't exist
     for pump_data in config_data.get('pumps', []):
@@ -99,7 +68,7 @@ def migrate_data(db_path: str, cocktails_yaml: str, config_yaml: str):
         print(f"   - Pump {pump_id}: {liquid_name or 'Empty'} @ {ml_per_second} ml/s")
 
     # Migrate settings
-    print("\n4. Migrating settings...")
+    print("\n3. Migrating settings...")
     if 'conversion' in config_data:
         cl_to_ml = config_data['conversion'].get('cl_to_ml', 10)
         db.set_setting('cl_to_ml', str(cl_to_ml))
@@ -113,7 +82,7 @@ def migrate_data(db_path: str, cocktails_yaml: str, config_yaml: str):
         print(f"   - Arduino: {arduino.get('port')} @ {arduino.get('baudrate')}")
 
     # Migrate liquid flow rates to calibrations
-    print("\n5. Migrating liquid flow rates...")
+    print("\n4. Migrating liquid flow rates...")
     if 'liquid_flow_rates' in config_data:
         for liquid_name, flow_rate in config_data['liquid_flow_rates'].items():
             liquid_id = db.get_or_create_liquid(liquid_name)
@@ -1,4 +1,8 @@
 -- CocktailMixer Database Schema
+-- Migration 0001: initial schema
+--
+-- Databases created before versioned migrations have user_version 0 and
+-- already contain these tables, so every statement here must stay idempotent.
 
 -- Liquids master table
 CREATE TABLE IF NOT EXISTS liquids (
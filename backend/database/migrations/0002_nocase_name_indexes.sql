@@ -0,0 +1,5 @@
+-- Migration 0002: case-insensitive name lookups
+-- Queries must compare with "name = ? COLLATE NOCASE" to use these indexes.
+
+CREATE INDEX IF NOT EXISTS idx_liquids_name_nocase ON liquids(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_cocktails_name_nocase ON cocktails(name COLLATE NOCASE);
@@ -0,0 +1,18 @@
+-- Migration 0003: latest-calibration index and compacted calibration history
+-- get_latest_calibration orders by (created_at DESC, id DESC) within a liquid,
+-- which this index serves without a sort.
+
+DROP INDEX IF EXISTS idx_calibrations_liquid;
+CREATE INDEX IF NOT EXISTS idx_calibrations_liquid_created ON calibrations(liquid_id, created_at DESC, id DESC);
+
+-- Statistics of calibration rows removed by compaction (one row per liquid)
+CREATE TABLE IF NOT EXISTS calibration_summaries (
+    liquid_id INTEGER PRIMARY KEY,
+    sample_count INTEGER NOT NULL,
+    mean_ml_per_second REAL NOT NULL,
+    sum_squared_deviation REAL NOT NULL,
+    first_calibrated_at TIMESTAMP,
+    last_calibrated_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (liquid_id) REFERENCES liquids(id) ON DELETE CASCADE
+);
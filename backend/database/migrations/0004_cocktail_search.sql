@@ -0,0 +1,67 @@
+-- Migration 0004: full-text cocktail search
+-- One FTS5 row per cocktail (rowid = cocktails.id) over its name, description,
+-- garnish and ingredient names, ranked by BM25 (see DatabaseManager.search_cocktails).
+--
+-- Rewriting an FTS row is expensive and a new cocktail touches its row once per
+-- ingredient, so the triggers only queue the affected cocktail ids in
+-- cocktail_search_pending. DatabaseManager re-indexes the queue in one pass
+-- when the write commits (and before searching, for writes made elsewhere).
+--
+-- Requires: ENABLE_FTS5
+
+CREATE VIRTUAL TABLE IF NOT EXISTS cocktail_search USING fts5(
+    name,
+    description,
+    garnish,
+    ingredients,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+INSERT INTO cocktail_search (rowid, name, description, garnish, ingredients)
+SELECT c.id, c.name, c.description, c.garnish,
+       (SELECT group_concat(l.name, ' ')
+        FROM cocktail_ingredients ci JOIN liquids l ON l.id = ci.liquid_id
+        WHERE ci.cocktail_id = c.id)
+FROM cocktails c;
+
+-- Cocktails whose search row is out of date
+CREATE TABLE IF NOT EXISTS cocktail_search_pending (
+    cocktail_id INTEGER PRIMARY KEY
+);
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_cocktail_insert AFTER INSERT ON cocktails
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_cocktail_update AFTER UPDATE OF id, name, description, garnish ON cocktails
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id) VALUES (OLD.id), (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_cocktail_delete AFTER DELETE ON cocktails
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id) VALUES (OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_ingredient_insert AFTER INSERT ON cocktail_ingredients
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id) VALUES (NEW.cocktail_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_ingredient_update AFTER UPDATE OF cocktail_id, liquid_id ON cocktail_ingredients
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id) VALUES (OLD.cocktail_id), (NEW.cocktail_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_ingredient_delete AFTER DELETE ON cocktail_ingredients
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id) VALUES (OLD.cocktail_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cocktail_search_liquid_rename AFTER UPDATE OF name ON liquids
+BEGIN
+    INSERT OR IGNORE INTO cocktail_search_pending (cocktail_id)
+    SELECT cocktail_id FROM cocktail_ingredients WHERE liquid_id = NEW.id;
+END;
@@ -0,0 +1,13 @@
+-- Migration 0005: alternative names for liquids
+-- Aliases are offered by the liquid autocomplete (GET /liquids/suggest),
+-- e.g. 'OJ' for 'Orange Juice' or 'Cointreau' for 'Triple Sec'.
+
+CREATE TABLE IF NOT EXISTS liquid_aliases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    liquid_id INTEGER NOT NULL,
+    alias TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (liquid_id) REFERENCES liquids(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_liquid_aliases_liquid ON liquid_aliases(liquid_id);
@@ -0,0 +1,19 @@
+-- Migration 0006: interchangeable liquids
+-- A row lets substitute_id be poured when a recipe asks for liquid_id (one
+-- direction only: soda water can stand in for ginger beer, not the reverse).
+-- ratio is the ml of substitute poured per ml of the original. Chains are
+-- followed transitively, multiplying the ratios.
+
+CREATE TABLE IF NOT EXISTS liquid_substitutions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    liquid_id INTEGER NOT NULL,
+    substitute_id INTEGER NOT NULL,
+    ratio REAL NOT NULL DEFAULT 1.0 CHECK (ratio > 0),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (liquid_id) REFERENCES liquids(id) ON DELETE CASCADE,
+    FOREIGN KEY (substitute_id) REFERENCES liquids(id) ON DELETE CASCADE,
+    UNIQUE(liquid_id, substitute_id),
+    CHECK (liquid_id != substitute_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_liquid_substitutions_substitute ON liquid_substitutions(substitute_id);
@@ -0,0 +1,55 @@
+-- Migration 0007: persistent catalog revision
+-- Changes on every write to the tables DatabaseManager.get_all_cocktails() reads.
+-- Unlike the in-memory data generations it survives restarts and is shared by
+-- all processes, so the binary catalog snapshot (services/catalog_snapshot.py)
+-- written for one revision can be reused by any process until the catalog
+-- changes again. Revisions are random rather than counted, so a restored or
+-- copied database never matches a snapshot of a different catalog.
+
+CREATE TABLE IF NOT EXISTS catalog_revision (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    revision INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO catalog_revision (id, revision) VALUES (1, random());
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_cocktail_insert AFTER INSERT ON cocktails
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_cocktail_update AFTER UPDATE ON cocktails
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_cocktail_delete AFTER DELETE ON cocktails
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_ingredient_insert AFTER INSERT ON cocktail_ingredients
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_ingredient_update AFTER UPDATE ON cocktail_ingredients
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_ingredient_delete AFTER DELETE ON cocktail_ingredients
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+-- Ingredient names come from liquids; new liquids are not used by any recipe yet
+CREATE TRIGGER IF NOT EXISTS catalog_revision_liquid_update AFTER UPDATE OF name ON liquids
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
+
+CREATE TRIGGER IF NOT EXISTS catalog_revision_liquid_delete AFTER DELETE ON liquids
+BEGIN
+    UPDATE catalog_revision SET revision = random();
+END;
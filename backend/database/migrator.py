@@ -0,0 +1,131 @@
+"""
+Versioned schema migrations
+
+Migrations live in database/migrations/ as numbered SQL files
+(NNNN_description.sql). The number of the last applied migration is stored
+in PRAGMA user_version, so starting against an up-to-date database costs a
+single PRAGMA read.
+
+A migration that needs an optional SQLite feature names the compile option
+in a "-- Requires: OPTION" line; pending migrations are checked against the
+SQLite library before anything is written.
+"""
+import re
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+REQUIRES_PATTERN = re.compile(r"^--\s*Requires:\s*(.+)$", re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def load_migrations() -> Tuple[Tuple[int, str, str], ...]:
+    """Load (version, name, sql) for every migration file, ordered by version"""
+    migrations = []
+    for path in MIGRATIONS_DIR.iterdir():
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path.read_text(encoding='utf-8')))
+
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if versions != list(range(1, len(versions) + 1)):
+        raise RuntimeError(f"Migration versions must be consecutive starting at 1, found {versions}")
+
+    return tuple(migrations)
+
+
+def latest_version() -> int:
+    """Schema version the code expects"""
+    migrations = load_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def split_statements(script: str) -> List[str]:
+    """Split a SQL script into complete statements (trigger bodies stay intact)"""
+    statements = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+
+    remainder = "\n".join(line for line in current.splitlines() if not line.strip().startswith("--"))
+    if remainder.strip():
+        raise ValueError(f"Incomplete SQL statement: {remainder.strip()[:80]}")
+    return statements
+
+
+def required_options(sql: str) -> List[str]:
+    """SQLite compile options a migration script declares with "-- Requires:" lines"""
+    return [option for line in REQUIRES_PATTERN.findall(sql) for option in line.replace(",", " ").split()]
+
+
+def check_requirements(conn: sqlite3.Connection, current: int):
+    """
+    Check that the SQLite library supports every migration after version current
+
+    Raises:
+        RuntimeError: Naming the migration and the missing compile option
+    """
+    for version, name, sql in load_migrations():
+        if version <= current:
+            continue
+        for option in required_options(sql):
+            if not conn.execute("SELECT sqlite_compileoption_used(?)", (option,)).fetchone()[0]:
+                raise RuntimeError(
+                    f"Migration {version:04d}_{name} needs SQLite compiled with {option}, "
+                    f"which SQLite {sqlite3.sqlite_version} (used by Python) is not; "
+                    f"install a Python/SQLite build with {option} to upgrade this database"
+                )
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Read the applied schema version"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply all pending migrations in a single transaction
+
+    Returns:
+        List of applied migration versions (empty if the schema was current)
+    """
+    target = latest_version()
+    current = get_schema_version(conn)
+    if current >= target:
+        return []
+    check_requirements(conn, current)
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # Manage the transaction explicitly
+    try:
+        # IMMEDIATE takes the write lock up front so concurrent starters wait here
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = get_schema_version(conn)
+            applied = []
+            for version, name, sql in load_migrations():
+                if version <= current:
+                    continue
+                logger.info(f"Applying migration {version:04d}_{name}")
+                for statement in split_statements(sql):
+                    conn.execute(statement)
+                applied.append(version)
+
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.execute("COMMIT")
+            return applied
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.isolation_level = previous_isolation
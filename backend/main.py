@@ -5,13 +5,14 @@ import os
 from pathlib import Path
 import serial.tools.list_ports
 
-from services import DatabaseService, MixerService, ArduinoService
+from services import DatabaseService, AsyncDatabaseService, MixerService, ArduinoService
 from services.gpio_controller import GPIOController
 from api import pumps, cocktails, status, liquids
 
 
 # Global service instances
 db_service: DatabaseService = None
+async_db_service: AsyncDatabaseService = None
 gpio_controller: GPIOController = None
 mixer_service: MixerService = None
 arduino_service: ArduinoService = None
@@ -20,7 +21,7 @@ arduino_service: ArduinoService = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    global db_service, gpio_controller, mixer_service, arduino_service
+    global db_service, async_db_service, gpio_controller, mixer_service, arduino_service
 
     # Startup
     print("Starting CocktailMixer Backend...")
@@ -28,10 +29,17 @@ async def lifespan(app: FastAPI):
     # Initialize services
     db_path = os.getenv("DB_PATH", "./database/cocktails.db")
 
-    db_service = DatabaseService(db_path)
+    db_service = DatabaseService(db_path, os.getenv("CATALOG_SNAPSHOT_PATH"))
+    async_db_service = AsyncDatabaseService(db_service)
 
-    # Load initial data
+    # Load initial data (maps the catalog snapshot if it is up to date)
     db_service.load_cocktails()
+    db_service.get_units()
+
+    # Keep the calibration history small on the SD card
+    compacted = db_service.compact_calibrations()
+    if compacted['rows']:
+        print(f"Compacted {compacted['rows']} old calibrations of {compacted['liquids']} liquids")
 
     # Initialize GPIO Controller
     gpio_controller = GPIOController()
@@ -81,6 +89,12 @@ async def lifespan(app: FastAPI):
         gpio_controller.stop_all_pumps()
         gpio_controller.disconnect()
 
+    if async_db_service:
+        async_db_service.shutdown()
+
+    if db_service:
+        db_service.close()
+
     print("Backend stopped.")
 
 
@@ -106,7 +120,7 @@ app.add_middleware(
 
 # Dependency injection
 def get_db_service():
-    return db_service
+    return async_db_service
 
 
 def get_gpio_controller():
@@ -120,6 +134,8 @@ def get_mixer_service():
 # Update routers to use dependency injection
 pumps.get_pumps.__defaults__ = (Depends(get_db_service),)
 pumps.get_pump.__defaults__ = (None, Depends(get_db_service))
+pumps.update_pumps.__defaults__ = (None, Depends(
+    get_db_service), Depends(get_gpio_controller))
 pumps.update_pump.__defaults__ = (None, None, Depends(
     get_db_service), Depends(get_gpio_controller))
 pumps.update_pump_liquid.__defaults__ = (None, None, Depends(get_db_service))
@@ -127,16 +143,24 @@ pumps.test_pump.__defaults__ = (None, None, Depends(
     get_db_service), Depends(get_gpio_controller))
 pumps.stop_pump.__defaults__ = (None, Depends(
     get_db_service), Depends(get_gpio_controller))
+pumps.preview_pumps.__defaults__ = (None, Depends(get_db_service))
+pumps.optimize_pumps.__defaults__ = (None, Depends(
+    get_db_service), Depends(get_gpio_controller))
 pumps.stop_all_pumps.__defaults__ = (Depends(get_gpio_controller),)
 pumps.test_all_pumps.__defaults__ = (None, Depends(
     get_db_service), Depends(get_gpio_controller))
 pumps.purge_all_pumps.__defaults__ = (None, Depends(
     get_db_service), Depends(get_gpio_controller))
 
-cocktails.get_all_cocktails.__defaults__ = (Depends(get_mixer_service),)
-cocktails.get_available_cocktails.__defaults__ = (Depends(get_mixer_service),)
-cocktails.get_cocktail.__defaults__ = (None, Depends(get_mixer_service))
-cocktails.make_cocktail.__defaults__ = (None, None, Depends(get_mixer_service))
+cocktails.get_all_cocktails.__defaults__ = (Depends(get_db_service),)
+cocktails.search_cocktails.__defaults__ = (Depends(get_db_service),)
+cocktails.get_available_cocktails.__defaults__ = (
+    Depends(get_mixer_service), Depends(get_db_service))
+cocktails.get_cocktail.__defaults__ = (None, Depends(get_db_service))
+cocktails.get_similar_cocktails.__defaults__ = (None, Depends(get_db_service))
+cocktails.import_cocktails.__defaults__ = (None, Depends(get_db_service))
+cocktails.make_cocktail.__defaults__ = (None, None, Depends(
+    get_mixer_service), Depends(get_db_service))
 
 status.get_status.__defaults__ = (Depends(get_mixer_service), Depends(
     get_db_service), Depends(get_gpio_controller))
@@ -147,6 +171,13 @@ status.get_diagnostics.__defaults__ = (
 
 liquids.get_all_liquids.__defaults__ = (Depends(get_db_service),)
 liquids.get_installed_liquids.__defaults__ = (Depends(get_db_service),)
+liquids.suggest_liquids.__defaults__ = (Depends(get_db_service),)
+liquids.get_liquid_recommendations.__defaults__ = (Depends(get_db_service),)
+liquids.add_liquid_alias.__defaults__ = (None, None, Depends(get_db_service))
+liquids.get_liquid_substitutes.__defaults__ = (None, Depends(get_db_service))
+liquids.set_liquid_substitute.__defaults__ = (None, None, None, Depends(get_db_service))
+liquids.delete_liquid_substitute.__defaults__ = (None, None, Depends(get_db_service))
+liquids.get_liquid_calibration.__defaults__ = (None, Depends(get_db_service))
 
 
 # Include routers
@@ -33,6 +33,16 @@ class CocktailWithAvailability(Cocktail):
     missing_ingredients: List[str] = Field(default_factory=list)
 
 
+class CocktailSearchResult(CocktailWithAvailability):
+    """Cocktail search hit"""
+    score: float  # BM25 relevance, higher is better
+
+
+class SimilarCocktail(CocktailWithAvailability):
+    """Cocktail with ingredients similar to a given one"""
+    score: float  # Jaccard similarity of the liquids, 0-1
+
+
 class Pump(BaseModel):
     """Pump configuration"""
     id: int
@@ -1,6 +1,7 @@
 from services.database import DatabaseService
+from services.async_database import AsyncDatabaseService
 from services.arduino import ArduinoService
 from services.gpio_controller import GPIOController
 from services.mixer import MixerService
 
-__all__ = ['DatabaseService', 'ArduinoService', 'GPIOController', 'MixerService']
+__all__ = ['DatabaseService', 'AsyncDatabaseService', 'ArduinoService', 'GPIOController', 'MixerService']
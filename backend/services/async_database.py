@@ -0,0 +1,73 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from services.database import DatabaseService
+
+# Number of dedicated database threads (each keeps its own pooled SQLite connection)
+DB_WORKERS = int(os.getenv("DB_WORKERS", "4"))
+# Threads for CPU-heavy catalog work; kept small so it cannot starve quick queries
+DB_BULK_WORKERS = int(os.getenv("DB_BULK_WORKERS", "1"))
+# Threads for long searches (pump optimizer) that may use their whole time budget
+DB_SEARCH_WORKERS = int(os.getenv("DB_SEARCH_WORKERS", "1"))
+
+
+class AsyncDatabaseService:
+    """
+    Awaitable facade over DatabaseService
+
+    Every DatabaseService method is available as a coroutine that runs on a
+    dedicated database thread pool, so slow queries and fsyncs never block
+    the event loop:
+
+        pumps = await db_service.get_pumps()
+
+    Other blocking work that touches the database can be offloaded with
+    run(); whole-catalog builds go through run_bulk() on their own threads so
+    quick lookups such as the /status pump query never queue behind them, and
+    searches that run for seconds go through run_search() so the catalog
+    endpoints never queue behind those.
+    """
+
+    def __init__(self, db_service: DatabaseService, max_workers: int = DB_WORKERS,
+                 bulk_workers: int = DB_BULK_WORKERS, search_workers: int = DB_SEARCH_WORKERS):
+        self.sync = db_service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._bulk_executor = ThreadPoolExecutor(max_workers=bulk_workers, thread_name_prefix="db-bulk")
+        self._search_executor = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="db-search")
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on a database thread and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def run_bulk(self, func: Callable, *args, **kwargs) -> Any:
+        """Run CPU-heavy database work (e.g. building the whole catalog) on the bulk threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._bulk_executor, functools.partial(func, *args, **kwargs))
+
+    async def run_search(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a time-budgeted search (e.g. the pump optimizer) on the search threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._search_executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        # Cache the wrapper so __getattr__ only runs once per method
+        setattr(self, name, method)
+        return method
+
+    def shutdown(self):
+        """Wait for running queries and stop the database threads"""
+        self._executor.shutdown(wait=True)
+        self._bulk_executor.shutdown(wait=True)
+        self._search_executor.shutdown(wait=True)
@@ -0,0 +1,411 @@
+import base64
+import bisect
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from services.substitutions import SubstitutionClosure
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Cocktail attributes that can be filtered on (exact, case-insensitive)
+FILTER_FIELDS = ('taste', 'timing', 'preparation', 'glass_type')
+# Fields of a /cocktails item, in response order
+RESPONSE_FIELDS = ('name', 'timing', 'taste', 'ingredients', 'preparation', 'is_available', 'missing_ingredients')
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive form of a cocktail name"""
+    return " ".join(name.casefold().split())
+
+
+def slugify(name: str) -> str:
+    """URL-friendly form of a cocktail name, e.g. 'Vodka Cranberry (Cape Codder)' -> 'vodka-cranberry-cape-codder'"""
+    return _NON_WORD.sub("-", name.casefold()).strip("-")
+
+
+@dataclass
+class CatalogEntry:
+    """One cocktail with its recipe and current availability"""
+    cocktail: dict  # Catalog recipe, ingredients include liquid_id and is_optional
+    is_available: bool
+    missing_ingredients: List[str] = field(default_factory=list)
+    response: dict = field(default_factory=dict)  # Same shape as the /cocktails items
+
+    @property
+    def name(self) -> str:
+        return self.cocktail['name']
+
+
+@dataclass
+class CocktailPage:
+    """One page of a filtered cocktail listing"""
+    items: List[dict]
+    total: int  # Matches over all pages
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
+
+
+def encode_cursor(sort_key: Tuple[str, int]) -> str:
+    """Opaque cursor for the position after a cocktail (by name, id)"""
+    return base64.urlsafe_b64encode(json.dumps(sort_key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        name, cocktail_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(name), int(cocktail_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class AvailabilityIndex:
+    """
+    Which cocktails can be made with the installed liquids
+
+    Built once per catalog generation. Every cocktail's required
+    (non-optional) liquids are stored as a bitmask, and an inverted index
+    liquid_id -> cocktails keeps a per-cocktail count of missing liquids, so
+    set_installed() only touches the cocktails using a liquid that changed.
+    Single cocktails are found by normalized name or slug in O(1), and
+    listings are filtered through per-attribute and per-liquid indexes.
+
+    With substitution rules, a required liquid also counts as installed when
+    one of its substitutes is: the installed set is widened to everything it
+    covers (a union of precomputed sets) before it reaches the bitmasks.
+
+    Cocktails one or two liquids short are also tracked per missing liquid,
+    updated along with the missing counts, so next_bottles() can rank the
+    liquids to buy without scanning the catalog.
+    """
+
+    def __init__(self, cocktails: List[dict], substitutions: Optional[SubstitutionClosure] = None):
+        self._substitutions = substitutions
+        self._bits: Dict[int, int] = {}  # liquid_id -> bit
+        self._bit_liquids: Dict[int, int] = {}  # bit -> liquid_id
+        self._liquid_names: Dict[int, str] = {}
+        self._positions: Dict[int, int] = {}  # cocktail id -> position in catalog order
+        self._required: List[int] = []  # Required-liquid bitmask per cocktail
+        self._ingredient_names: List[Tuple[Tuple[int, str], ...]] = []
+        self._by_liquid: Dict[int, List[int]] = {}  # liquid_id -> positions of cocktails requiring it
+        self._bases: List[dict] = []  # Response fields that do not depend on pumps
+        self._cocktails = cocktails
+        self._names: Dict[str, int] = {}  # Normalized name or slug -> position
+        self._sort_keys: List[Tuple[str, int]] = []  # (name, id) per position, ascending
+        self._facets: Dict[str, Dict[str, List[int]]] = {name: {} for name in FILTER_FIELDS}
+        self._with_liquid: Dict[int, List[int]] = {}  # liquid_id -> positions of cocktails using it at all
+
+        for position, cocktail in enumerate(cocktails):
+            self._positions[cocktail['id']] = position
+            self._names.setdefault(normalize_name(cocktail['name']), position)
+            self._sort_keys.append((cocktail['name'], cocktail['id']))
+            for facet, values in self._facets.items():
+                if cocktail.get(facet):
+                    values.setdefault(cocktail[facet].casefold(), []).append(position)
+
+            mask = 0
+            names = {}
+            for ingredient in cocktail.get('ingredients', []):
+                liquid_id = ingredient.get('liquid_id')
+                if liquid_id is not None:
+                    positions = self._with_liquid.setdefault(liquid_id, [])
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+                if liquid_id is None or ingredient.get('is_optional'):
+                    continue
+                if liquid_id not in names:
+                    names[liquid_id] = ingredient['ingredient']
+                    self._liquid_names.setdefault(liquid_id, ingredient['ingredient'])
+                    self._by_liquid.setdefault(liquid_id, []).append(position)
+                mask |= self._bit(liquid_id)
+
+            self._required.append(mask)
+            self._ingredient_names.append(tuple(names.items()))
+            self._bases.append({
+                'name': cocktail['name'],
+                'timing': cocktail.get('timing'),
+                'taste': cocktail.get('taste'),
+                'ingredients': [
+                    {'ingredient': ing['ingredient'], 'amount': float(ing['amount']), 'unit': ing['unit']}
+                    for ing in cocktail.get('ingredients', [])
+                ],
+                'preparation': cocktail.get('preparation'),
+            })
+
+        # Slugs never shadow a real name
+        for position, (name, _) in enumerate(self._sort_keys):
+            self._names.setdefault(slugify(name), position)
+
+        # Nothing installed yet: every required liquid is missing
+        self._missing = [len(names) for names in self._ingredient_names]
+        self._installed: frozenset = frozenset()
+        self._installed_mask = 0
+        self._available_count = self._missing.count(0)
+        self._lock = threading.Lock()
+
+        self._one_away: Dict[int, set] = {}  # liquid_id -> positions missing only that liquid
+        self._two_away: Dict[int, int] = {}  # liquid_id -> number of cocktails missing it and one other
+        for position in range(len(self._required)):
+            self._track_near_miss(position, 1)
+
+    def _bit(self, liquid_id: int) -> int:
+        bit = self._bits.get(liquid_id)
+        if bit is None:
+            bit = self._bits[liquid_id] = 1 << len(self._bits)
+            self._bit_liquids[bit] = liquid_id
+        return bit
+
+    def _track_near_miss(self, position: int, sign: int):
+        """Add (sign=1) or remove (sign=-1) a cocktail's near-miss entries for the current state"""
+        missing = self._missing[position]
+        if missing > 2 or missing == 0:
+            return
+        missing_mask = self._required[position] & ~self._installed_mask
+        if missing == 1:
+            positions = self._one_away.setdefault(self._bit_liquids[missing_mask], set())
+            if sign > 0:
+                positions.add(position)
+            else:
+                positions.discard(position)
+        else:
+            low = missing_mask & -missing_mask
+            for bit in (low, missing_mask ^ low):
+                liquid_id = self._bit_liquids[bit]
+                self._two_away[liquid_id] = self._two_away.get(liquid_id, 0) + sign
+
+    def _covered(self, liquid_ids: Iterable[int]) -> frozenset:
+        """Liquids usable by recipes: the installed ones plus those they substitute for"""
+        if self._substitutions:
+            return self._substitutions.covered(liquid_ids)
+        return frozenset(liquid_ids)
+
+    def set_installed(self, liquid_ids: Iterable[int]):
+        """Update availability for the liquids now installed in pumps"""
+        installed = self._covered(liquid_ids)
+        with self._lock:
+            if installed == self._installed:
+                return
+
+            added = installed - self._installed
+            removed = self._installed - installed
+            changed = [self._by_liquid.get(liquid_id, ()) for liquid_id in added | removed]
+            missing = self._missing
+
+            # Only cocktails at most two liquids short have near-miss entries
+            for position in {position for positions in changed for position in positions if missing[position] <= 2}:
+                self._track_near_miss(position, -1)
+
+            for liquid_id in added:
+                for position in self._by_liquid.get(liquid_id, ()):
+                    missing[position] -= 1
+                    if not missing[position]:
+                        self._available_count += 1
+            for liquid_id in removed:
+                for position in self._by_liquid.get(liquid_id, ()):
+                    if not missing[position]:
+                        self._available_count -= 1
+                    missing[position] += 1
+
+            self._installed = installed
+            self._installed_mask = 0
+            for liquid_id in installed:
+                self._installed_mask |= self._bits.get(liquid_id, 0)
+
+            for position in {position for positions in changed for position in positions if missing[position] <= 2}:
+                self._track_near_miss(position, 1)
+
+    def _missing_names(self, position: int) -> List[str]:
+        missing_mask = self._required[position] & ~self._installed_mask
+        return sorted(name for liquid_id, name in self._ingredient_names[position]
+                      if self._bits[liquid_id] & missing_mask)
+
+    def check(self, cocktail_id: int) -> Optional[Tuple[bool, List[str]]]:
+        """Return (can_make, missing ingredient names), or None for an unknown cocktail"""
+        position = self._positions.get(cocktail_id)
+        if position is None:
+            return None
+        with self._lock:
+            if self._required[position] & ~self._installed_mask == 0:
+                return True, []
+            return False, self._missing_names(position)
+
+    def lookup(self, name: str) -> Optional[CatalogEntry]:
+        """Find a cocktail by name (case/whitespace-insensitive) or slug"""
+        position = self._names.get(normalize_name(name))
+        if position is None:
+            position = self._names.get(slugify(name))
+        if position is None:
+            return None
+
+        with self._lock:
+            available = self._required[position] & ~self._installed_mask == 0
+            missing = [] if available else self._missing_names(position)
+
+        return CatalogEntry(
+            cocktail=self._cocktails[position],
+            is_available=available,
+            missing_ingredients=missing,
+            response={**self._bases[position], 'is_available': available, 'missing_ingredients': missing}
+        )
+
+    def query(self, filters: Optional[Dict[str, str]] = None, available: Optional[bool] = None,
+              liquid_ids: Sequence[int] = (), cursor: Optional[str] = None, limit: Optional[int] = None,
+              fields: Optional[Sequence[str]] = None) -> CocktailPage:
+        """
+        Filtered, paginated and projected cocktail listing
+
+        Args:
+            filters: FILTER_FIELDS values to match (case-insensitive)
+            available: Only makeable (True) or only unavailable (False) cocktails
+            liquid_ids: Cocktails must use all of these liquids
+            cursor: next_cursor of the previous page
+            limit: Page size (all remaining matches if None)
+            fields: RESPONSE_FIELDS to include (all if None)
+        """
+        candidates: Optional[set] = None
+        for facet, value in (filters or {}).items():
+            matches = self._facets[facet].get(value.casefold(), ())
+            candidates = set(matches) if candidates is None else candidates.intersection(matches)
+        for liquid_id in liquid_ids:
+            matches = self._with_liquid.get(liquid_id, ())
+            candidates = set(matches) if candidates is None else candidates.intersection(matches)
+
+        positions = range(len(self._bases)) if candidates is None else sorted(candidates)
+        start = bisect.bisect_right(self._sort_keys, decode_cursor(cursor)) if cursor else 0
+
+        items = []
+        total = 0
+        has_more = False
+        with self._lock:
+            for position in positions:
+                is_available = self._missing[position] == 0
+                if available is not None and is_available != available:
+                    continue
+                total += 1
+                if position < start:
+                    continue
+                if limit is not None and len(items) >= limit:
+                    has_more = True
+                    continue
+
+                item = {**self._bases[position], 'is_available': is_available,
+                        'missing_ingredients': [] if is_available else self._missing_names(position)}
+                items.append({key: item[key] for key in fields} if fields else item)
+                last = position
+
+        next_cursor = encode_cursor(self._sort_keys[last]) if has_more else None
+        return CocktailPage(items=items, total=total, next_cursor=next_cursor)
+
+    def ranked(self, hits: Iterable[Dict[str, Any]], available: Optional[bool] = None,
+               limit: Optional[int] = None) -> List[dict]:
+        """
+        /cocktails items for search hits, in hit order
+
+        Args:
+            hits: {'id', 'score'} dicts, best first (see DatabaseManager.search_cocktails)
+            available: Only makeable (True) or only unavailable (False) cocktails
+            limit: Maximum number of items (all if None)
+        """
+        items = []
+        with self._lock:
+            for hit in hits:
+                if limit is not None and len(items) >= limit:
+                    break
+                position = self._positions.get(hit['id'])
+                if position is None:  # Written after this index was built
+                    continue
+                is_available = self._missing[position] == 0
+                if available is not None and is_available != available:
+                    continue
+                items.append({**self._bases[position], 'is_available': is_available,
+                              'missing_ingredients': [] if is_available else self._missing_names(position),
+                              'score': round(hit['score'], 4)})
+        return items
+
+    def preview(self, liquid_ids: Iterable[int]) -> Dict[str, Any]:
+        """
+        Availability changes if exactly these liquids were installed (nothing is modified)
+
+        Only cocktails requiring a liquid that would be added or removed can
+        change, so the cost depends on those liquids, not the catalog size.
+
+        Returns:
+            Dict with the 'gained' and 'lost' cocktail names and the makeable
+            count before ('current_makeable_count') and after ('makeable_count')
+        """
+        installed = self._covered(liquid_ids)
+        new_mask = 0
+        for liquid_id in installed:
+            new_mask |= self._bits.get(liquid_id, 0)
+
+        with self._lock:
+            mask = self._installed_mask
+            affected = set()
+            for liquid_id in installed ^ self._installed:
+                affected.update(self._by_liquid.get(liquid_id, ()))
+
+            gained, lost = [], []
+            for position in affected:
+                required = self._required[position]
+                before = required & ~mask == 0
+                after = required & ~new_mask == 0
+                if after and not before:
+                    gained.append(self._bases[position]['name'])
+                elif before and not after:
+                    lost.append(self._bases[position]['name'])
+            current = self._available_count
+
+        return {
+            'gained': sorted(gained),
+            'lost': sorted(lost),
+            'makeable_count': current + len(gained) - len(lost),
+            'current_makeable_count': current,
+        }
+
+    def next_bottles(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Liquids to buy next, ranked by the cocktails each would make possible
+
+        Returns:
+            {'liquid_id', 'liquid', 'unlocks', 'cocktails', 'closer'} dicts: unlocks
+            counts the cocktails missing only this liquid (named in cocktails),
+            closer those it would leave one liquid short. Sorted by unlocks,
+            then closer, then name.
+        """
+        with self._lock:
+            liquid_ids = [liquid_id for liquid_id, positions in self._one_away.items() if positions]
+            liquid_ids += [liquid_id for liquid_id, count in self._two_away.items()
+                           if count and not self._one_away.get(liquid_id)]
+            ranked = sorted(liquid_ids, key=lambda liquid_id: (
+                -len(self._one_away.get(liquid_id, ())), -self._two_away.get(liquid_id, 0),
+                self._liquid_names[liquid_id].casefold(), liquid_id
+            ))
+            if limit is not None:
+                ranked = ranked[:limit]
+
+            return [
+                {
+                    'liquid_id': liquid_id,
+                    'liquid': self._liquid_names[liquid_id],
+                    'unlocks': len(self._one_away.get(liquid_id, ())),
+                    'cocktails': sorted(self._bases[position]['name']
+                                        for position in self._one_away.get(liquid_id, ())),
+                    'closer': self._two_away.get(liquid_id, 0),
+                }
+                for liquid_id in ranked
+            ]
+
+    def cocktails(self, available_only: bool = False) -> List[dict]:
+        """Cocktails in catalog order with is_available and missing_ingredients"""
+        result = []
+        with self._lock:
+            for position, base in enumerate(self._bases):
+                available = self._missing[position] == 0
+                if available:
+                    result.append({**base, 'is_available': True, 'missing_ingredients': []})
+                elif not available_only:
+                    result.append({**base, 'is_available': False,
+                                   'missing_ingredients': self._missing_names(position)})
+        return result
@@ -0,0 +1,231 @@
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from services.availability import normalize_name, slugify
+
+MAGIC = b"KCAT"
+VERSION = 1
+
+# magic, version, catalog revision, counts (cocktails, ingredients, strings, names),
+# then the file offsets of the string offsets, string data, cocktail, ingredient
+# and name sections
+_HEADER = struct.Struct("<4sIq4I5Q")
+# id, string ids of name/timing/taste/preparation/glass_type/garnish/description,
+# first ingredient row, ingredient count
+_COCKTAIL = struct.Struct("<q7I2I")
+# liquid_id, amount, string ids of the liquid name and unit, is_optional
+_INGREDIENT = struct.Struct("<qd2IB")
+# string id of a normalized name or slug, cocktail position
+_NAME = struct.Struct("<2I")
+_OFFSET = struct.Struct("<I")
+_NONE = 0xFFFFFFFF  # String id of NULL values
+
+_COCKTAIL_FIELDS = ('name', 'timing', 'taste', 'preparation', 'glass_type', 'garnish', 'description')
+
+
+def write_snapshot(path, cocktails: List[dict], revision: int):
+    """
+    Write cocktails (as returned by DatabaseManager.get_all_cocktails) to a snapshot file
+
+    The file is written next to path and renamed over it, so processes that
+    mapped the previous snapshot keep reading a complete file.
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        string_id = strings.get(value)
+        if string_id is None:
+            string_id = strings[value] = len(strings)
+        return string_id
+
+    cocktail_rows = bytearray()
+    ingredient_rows = bytearray()
+    ingredient_count = 0
+    for cocktail in cocktails:
+        ingredients = cocktail.get('ingredients', [])
+        cocktail_rows += _COCKTAIL.pack(
+            cocktail['id'], *(intern(cocktail.get(name)) for name in _COCKTAIL_FIELDS),
+            ingredient_count, len(ingredients)
+        )
+        for ingredient in ingredients:
+            ingredient_rows += _INGREDIENT.pack(
+                ingredient['liquid_id'], float(ingredient['amount']), intern(ingredient['ingredient']),
+                intern(ingredient['unit']), 1 if ingredient['is_optional'] else 0
+            )
+        ingredient_count += len(ingredients)
+
+    # Same precedence as AvailabilityIndex.lookup: names before slugs, first cocktail wins
+    keys = sorted(
+        [(normalize_name(cocktail['name']), 0, position) for position, cocktail in enumerate(cocktails)] +
+        [(slugify(cocktail['name']), 1, position) for position, cocktail in enumerate(cocktails)]
+    )
+    name_rows = bytearray()
+    previous = None
+    name_count = 0
+    for key, _, position in keys:
+        if key != previous:
+            name_rows += _NAME.pack(intern(key), position)
+            name_count += 1
+            previous = key
+
+    encoded = [value.encode() for value in strings]
+    string_offsets = bytearray()
+    offset = 0
+    for value in encoded:
+        string_offsets += _OFFSET.pack(offset)
+        offset += len(value)
+    string_offsets += _OFFSET.pack(offset)
+    string_data = b"".join(encoded)
+
+    sections = [string_offsets, string_data, cocktail_rows, ingredient_rows, name_rows]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position += -position % 8  # Keep every section 8-byte aligned
+        offsets.append(position)
+        position += len(section)
+
+    header = _HEADER.pack(MAGIC, VERSION, revision, len(cocktails), ingredient_count, len(strings),
+                          name_count, *offsets)
+
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for section_offset, section in zip(offsets, sections):
+                f.write(b"\0" * (section_offset - f.tell()))
+                f.write(section)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)  # mkstemp creates it private; any process may map it
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class CatalogSnapshot(Sequence):
+    """
+    Read-only, memory-mapped cocktail catalog
+
+    The catalog as written by write_snapshot(): an interned string table,
+    fixed-size cocktail and ingredient rows, and a sorted name/slug index.
+    Opening only maps the file and reads the header, so it costs the same
+    for any catalog size; cocktails are decoded when they are accessed, and
+    every process mapping the file shares the same pages of the page cache.
+
+    Items are the same dicts DatabaseManager.get_all_cocktails() returns.
+    """
+
+    def __init__(self, path):
+        """
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If it is empty, truncated or not a snapshot of this version
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"Catalog snapshot {path} is truncated")
+            (magic, version, self.revision, self._count, _, self._string_count, self._name_count,
+             self._string_offsets, self._string_data, self._cocktails, self._ingredients,
+             self._names) = _HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} catalog snapshot")
+            if self._names + self._name_count * _NAME.size > len(self._map):
+                raise ValueError(f"Catalog snapshot {path} is truncated")
+        except ValueError:
+            self._map.close()
+            raise
+
+        self._view = memoryview(self._map)
+
+    def close(self):
+        """Unmap the file; the snapshot cannot be read afterwards"""
+        self._view.release()
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == _NONE:
+            return None
+        start, end = struct.unpack_from("<2I", self._map, self._string_offsets + string_id * _OFFSET.size)
+        return str(self._view[self._string_data + start:self._string_data + end], "utf-8")
+
+    def _decode(self, row: tuple, strings) -> dict:
+        """Cocktail dict for a cocktail row, strings resolving string ids"""
+        cocktail = {'id': row[0]}
+        for name, string_id in zip(_COCKTAIL_FIELDS, row[1:8]):
+            cocktail[name] = strings(string_id)
+
+        first, count = row[8], row[9]
+        start = self._ingredients + first * _INGREDIENT.size
+        cocktail['ingredients'] = [
+            {
+                'ingredient': strings(name),
+                'amount': amount,
+                'unit': strings(unit),
+                'is_optional': is_optional,
+                'liquid_id': liquid_id,
+            }
+            for liquid_id, amount, name, unit, is_optional
+            in _INGREDIENT.iter_unpack(self._view[start:start + count * _INGREDIENT.size])
+        ]
+        return cocktail
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("cocktail position out of range")
+        row = _COCKTAIL.unpack_from(self._map, self._cocktails + position * _COCKTAIL.size)
+        return self._decode(row, self._string)
+
+    def __iter__(self) -> Iterator[dict]:
+        # Decode the whole string table once per pass
+        offsets = [offset for offset, in _OFFSET.iter_unpack(
+            self._view[self._string_offsets:self._string_offsets + (self._string_count + 1) * _OFFSET.size])]
+        data = self._view[self._string_data:self._string_data + offsets[-1]]
+        strings = {string_id: str(data[start:end], "utf-8")
+                   for string_id, (start, end) in enumerate(zip(offsets, offsets[1:]))}
+        strings[_NONE] = None
+
+        rows = self._view[self._cocktails:self._cocktails + self._count * _COCKTAIL.size]
+        for row in _COCKTAIL.iter_unpack(rows):
+            yield self._decode(row, strings.__getitem__)
+
+    def _find_position(self, key: str) -> Optional[int]:
+        """Binary search of the name index"""
+        low, high = 0, self._name_count
+        while low < high:
+            middle = (low + high) // 2
+            string_id, position = _NAME.unpack_from(self._map, self._names + middle * _NAME.size)
+            value = self._string(string_id)
+            if value == key:
+                return position
+            if value < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def find(self, name: str) -> Optional[dict]:
+        """Find a cocktail by name (case/whitespace-insensitive) or slug"""
+        position = self._find_position(normalize_name(name))
+        if position is None:
+            position = self._find_position(slugify(name))
+        return None if position is None else self[position]
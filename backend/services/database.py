@@ -1,38 +1,242 @@
-from typing import List, Optional
-from database.db_manager import DatabaseManager
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from database.db_manager import DatabaseManager, CALIBRATION_HISTORY_KEEP
+from database.importer import CatalogImporter
+from models import Pump
+from services.availability import AvailabilityIndex, CatalogEntry, CocktailPage
+from services.catalog_snapshot import CatalogSnapshot, write_snapshot
+from services.liquid_index import LiquidSuggestIndex
+from services.optimizer import PumpOptimizer
+from services.similarity import SimilarityIndex
+from services.substitutions import SubstitutionClosure
+from services.units import UnitRegistry
 
 
 class DatabaseService:
     """Service for reading cocktails and managing pump configuration using SQLite"""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, snapshot_path: Optional[str] = None):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            snapshot_path: Catalog snapshot file shared by all processes (default: db_path with a .catalog suffix)
+        """
         self.db = DatabaseManager(db_path)
-        self._cocktails_cache = None
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.db.db_path.with_suffix('.catalog')
+        # Cached query results: key -> (data generation, value)
+        self._cache: Dict[str, Tuple[tuple, Any]] = {}
+        # Availability index and the pumps generation its installed set was read at
+        self._availability_lock = threading.Lock()
+        self._installed_for: Tuple[Optional[AvailabilityIndex], Optional[tuple]] = (None, None)
+        self.units = UnitRegistry(self.get_all_settings, lambda: self.db.get_generation('settings'))
 
-    def load_cocktails(self) -> List[dict]:
-        """Load all cocktails from database"""
-        self._cocktails_cache = self.db.get_all_cocktails()
-        return self._cocktails_cache
+    def _cached(self, key: str, groups: Tuple[str, ...], loader: Callable[[], Any]) -> Any:
+        """
+        Return loader() memoized until a write to one of the table groups
 
-    def get_cocktails(self) -> List[dict]:
-        """Get all cocktails (use cache if available)"""
-        if self._cocktails_cache is None:
-            return self.load_cocktails()
-        return self._cocktails_cache
+        Cached values are shared between callers and must not be modified.
+        """
+        generation = self.db.get_generation(*groups)  # Read before loading, see get_generation
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == generation:
+            return entry[1]
+
+        value = loader()
+        self._cache[key] = (generation, value)
+        return value
+
+    def get_generation(self, *groups: str) -> tuple:
+        """Get the data generation of table groups, for keying derived caches"""
+        return self.db.get_generation(*groups)
+
+    def load_cocktails(self) -> Sequence[dict]:
+        """Load all cocktails, from the catalog snapshot if it is up to date"""
+        self._cache.pop('cocktails', None)
+        return self.get_cocktails()
+
+    def get_cocktails(self) -> Sequence[dict]:
+        """Get all cocktails (cached until the catalog changes)"""
+        return self._cached('cocktails', ('catalog',), self._load_catalog)
+
+    def _load_catalog(self) -> Sequence[dict]:
+        """
+        Map the catalog snapshot, or load the catalog from the database and rewrite the snapshot
+
+        The snapshot is used as long as it was written for the current catalog
+        revision, so a restart (or a second process) does not query the
+        catalog at all.
+        """
+        revision = self.db.get_catalog_revision()  # Read before loading, see get_generation
+        try:
+            snapshot = CatalogSnapshot(self.snapshot_path)
+            if snapshot.revision == revision:
+                return snapshot
+            snapshot.close()
+        except (OSError, ValueError):
+            pass
+
+        cocktails = self.db.get_all_cocktails()
+        try:
+            write_snapshot(self.snapshot_path, cocktails, revision)
+        except OSError as e:
+            print(f"Warning: Could not write catalog snapshot {self.snapshot_path}: {e}")
+        return cocktails
+
+    def get_availability(self) -> AvailabilityIndex:
+        """
+        Get the availability index, updated for the current pump assignment
+
+        The index is shared, so the installed set is read and applied under
+        one lock, and only when the pumps generation moved: a request can
+        never apply a set older than the one another request applied, and
+        the index is never older than a generation read before calling this
+        (see conditional_json).
+        """
+        index = self._cached('availability', ('catalog',), lambda: AvailabilityIndex(
+            self.get_cocktails(), self.get_substitutions()))
+        with self._availability_lock:
+            generation = self.db.get_generation('pumps')  # Read before loading, see get_generation
+            if self._installed_for != (index, generation):
+                index.set_installed(self.get_installed_liquid_ids())
+                self._installed_for = (index, generation)
+        return index
+
+    def get_substitutions(self) -> SubstitutionClosure:
+        """Get the transitive closure of the liquid substitution rules"""
+        return self._cached('substitutions', ('catalog',), lambda: SubstitutionClosure(
+            self.db.get_liquid_substitutions()))
+
+    def get_liquid_substitutes(self, liquid_id: int) -> List[dict]:
+        """Liquids that may be poured instead of a liquid (direct and via chains), nearest first"""
+        names = {liquid['id']: liquid['name'] for liquid in self.get_all_liquids_with_ids()}
+        return [
+            {'liquid_id': substitute_id, 'liquid': names.get(substitute_id), 'ratio': ratio}
+            for substitute_id, ratio in self.get_substitutions().substitutes(liquid_id).items()
+        ]
+
+    def set_liquid_substitution(self, liquid_id: int, substitute_id: int, ratio: float = 1.0):
+        """Allow substitute_id to be poured instead of liquid_id"""
+        if liquid_id == substitute_id:
+            raise ValueError("A liquid cannot substitute for itself")
+        self.db.set_liquid_substitution(liquid_id, substitute_id, ratio)
+
+    def delete_liquid_substitution(self, liquid_id: int, substitute_id: int) -> bool:
+        """Remove a substitution rule"""
+        return self.db.delete_liquid_substitution(liquid_id, substitute_id)
+
+    def route_liquid(self, liquid_id: int) -> Optional[dict]:
+        """
+        Pump to pour a liquid from, using a substitute if the liquid itself is not installed
+
+        Returns:
+            Pump dict with the poured 'liquid_id'/'liquid' and the amount 'ratio', or None
+        """
+        pumps = {pump['liquid_id']: pump for pump in self.get_pumps()
+                 if pump['liquid_id'] is not None and pump.get('is_active', True)}
+        route = self.get_substitutions().route(liquid_id, pumps.keys())
+        if route is None:
+            return None
+        poured_id, ratio = route
+        return {**pumps[poured_id], 'ratio': ratio}
+
+    def query_cocktails(self, **query) -> CocktailPage:
+        """Filter, paginate and project the cocktail list (see AvailabilityIndex.query)"""
+        return self.get_availability().query(**query)
+
+    def search_cocktails(self, text: str, available: Optional[bool] = None, limit: int = 20) -> List[dict]:
+        """Full-text cocktail search, best match first, with availability and a relevance score"""
+        index = self.get_availability()
+        hits = self.db.search_cocktails(text, limit=limit, available=available)
+        return index.ranked(hits, available=available, limit=limit)
+
+    def get_similarity_index(self) -> SimilarityIndex:
+        """Get the ingredient similarity index, updated from the previous one when the catalog changes"""
+        previous = self._cache.get('similarity')
+        return self._cached('similarity', ('catalog',), lambda: SimilarityIndex(
+            self.get_cocktails(), previous[1] if previous else None))
+
+    def find_similar_cocktails(self, name: str, available: Optional[bool] = True,
+                               limit: int = 5) -> Optional[List[dict]]:
+        """
+        Cocktails with the most similar ingredients, with availability and a similarity score
+
+        Returns:
+            Up to limit cocktails, most similar first, or None if the cocktail does not exist
+        """
+        index = self.get_availability()
+        entry = index.lookup(name)
+        if entry is None:
+            return None
+        hits = self.get_similarity_index().similar(entry.cocktail['id'])
+        return index.ranked(hits, available=available, limit=limit)
+
+    def preview_pumps(self, changes: List[dict]) -> dict:
+        """
+        Cocktails gained and lost if pumps were reassigned, without writing anything
+
+        Args:
+            changes: One dict per pump with 'id' and 'liquid_id' (None empties the pump)
+
+        Raises:
+            ValueError: If a pump does not exist
+        """
+        pumps = {pump['id']: pump for pump in self.get_pumps()}
+        unknown = [change['id'] for change in changes if change['id'] not in pumps]
+        if unknown:
+            raise ValueError(f"Pumps not found: {', '.join(str(pump_id) for pump_id in unknown)}")
+
+        assignment = {pump_id: pump['liquid_id'] for pump_id, pump in pumps.items() if pump.get('is_active', True)}
+        assignment.update({change['id']: change['liquid_id'] for change in changes if change['id'] in assignment})
+        return self.get_availability().preview(
+            liquid_id for liquid_id in assignment.values() if liquid_id is not None)
+
+    def get_next_bottles(self, limit: Optional[int] = None) -> List[dict]:
+        """Liquids not installed, ranked by how many cocktails each would make possible"""
+        return self.get_availability().next_bottles(limit)
+
+    def find_cocktail(self, name: str) -> Optional[CatalogEntry]:
+        """Find one cocktail by name or slug, with its recipe and availability"""
+        return self.get_availability().lookup(name)
+
+    def get_connection_stats(self) -> dict:
+        """Get database connection pool counters"""
+        return self.db.get_connection_stats()
+
+    def close(self):
+        """Close all database connections"""
+        self.db.close()
+
+    def import_cocktails(self, records: List[dict], skip_existing: bool = False,
+                         missing_liquids: str = 'create', dry_run: bool = False) -> dict:
+        """Bulk import cocktail records and reload the cocktail cache"""
+        importer = CatalogImporter(self.db, skip_existing=skip_existing, missing_liquids=missing_liquids)
+        report = importer.import_records(records, dry_run=dry_run)
+
+        if not dry_run:
+            self.load_cocktails()
+
+        return report.to_dict()
 
     def get_cocktail_by_name(self, name: str) -> Optional[dict]:
-        """Get a specific cocktail by name"""
-        return self.db.get_cocktail_by_name(name)
+        """Get a specific cocktail by name (or slug)"""
+        cocktails = self.get_cocktails()
+        if isinstance(cocktails, CatalogSnapshot):
+            return cocktails.find(name)
+        entry = self.find_cocktail(name)
+        return entry.cocktail if entry else None
 
     def get_all_unique_ingredients(self) -> List[str]:
         """Get all unique ingredients (liquid names) sorted"""
-        liquids = self.db.get_all_liquids()
+        liquids = self.get_all_liquids_with_ids()
         return [liquid['name'] for liquid in liquids]
 
     def get_liquid_id_map(self) -> dict:
         """Get mapping of liquid names to IDs (lowercase name -> id)"""
-        liquids = self.db.get_all_liquids()
-        return {liquid['name'].lower(): liquid['id'] for liquid in liquids}
+        return self._cached('liquid_id_map', ('catalog',), lambda: {
+            liquid['name'].lower(): liquid['id'] for liquid in self.db.get_all_liquids()
+        })
 
     def get_liquid_by_id(self, liquid_id: int) -> Optional[str]:
         """Get liquid name by ID"""
@@ -41,16 +245,41 @@ class DatabaseService:
 
     def get_all_liquids_with_ids(self) -> List[dict]:
         """Get all unique liquids with their IDs"""
-        return self.db.get_all_liquids()
+        return self._cached('liquids', ('catalog',), self.db.get_all_liquids)
+
+    def get_liquid_suggest_index(self) -> LiquidSuggestIndex:
+        """Get the liquid autocomplete index (rebuilt after catalog writes)"""
+        return self._cached('liquid_suggest', ('catalog',), lambda: LiquidSuggestIndex(
+            self.db.get_liquid_usage(), self.db.get_liquid_aliases()))
+
+    def suggest_liquids(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Liquids matching a name or alias prefix, most used first"""
+        return self.get_liquid_suggest_index().suggest(prefix, limit)
+
+    def add_liquid_alias(self, liquid_id: int, alias: str) -> int:
+        """Add an alternative name for a liquid; raises ValueError if the alias is taken"""
+        try:
+            return self.db.add_liquid_alias(liquid_id, alias)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Alias '{alias}' is already in use") from e
 
     def get_id_for_liquid(self, liquid_name: str) -> Optional[int]:
         """Get ID for a liquid name (case-insensitive)"""
-        liquid = self.db.get_liquid_by_name(liquid_name)
-        return liquid['id'] if liquid else None
+        return self.get_liquid_id_map().get(liquid_name.lower())
 
     def get_pumps(self) -> List[dict]:
         """Get all pump configurations"""
-        return self.db.get_all_pumps()
+        return self._cached('pumps', ('pumps', 'catalog'), self.db.get_all_pumps)
+
+    def get_pump_records(self) -> List[dict]:
+        """
+        Get all pumps as the Pump model serializes them (for API responses)
+
+        Validated once per data generation, so responses can be encoded
+        from them without building models on every request.
+        """
+        return self._cached('pump_records', ('pumps', 'catalog'),
+                            lambda: [Pump(**pump).model_dump(mode='json') for pump in self.get_pumps()])
 
     def get_pump_by_id(self, pump_id: int) -> Optional[dict]:
         """Get a specific pump by ID"""
@@ -58,66 +287,219 @@ class DatabaseService:
 
     def update_pump_liquid(self, pump_id: int, liquid_id: Optional[int]) -> bool:
         """Update the liquid assigned to a pump"""
-        success = self.db.update_pump_liquid(pump_id, liquid_id)
+        with self.db.transaction():
+            success = self.db.update_pump_liquid(pump_id, liquid_id)
 
-        if success and liquid_id:
-            # Auto-apply saved flow rate from latest calibration
-            calibration = self.db.get_latest_calibration(liquid_id)
-            if calibration:
-                self.db.update_pump_flow_rate(pump_id, calibration['ml_per_second'])
+            if success and liquid_id:
+                # Auto-apply saved flow rate from latest calibration
+                calibration = self.get_latest_calibration(liquid_id)
+                if calibration:
+                    self.db.update_pump_flow_rate(pump_id, calibration['ml_per_second'])
 
         return success
 
     def update_pump_flow_rate(self, pump_id: int, ml_per_second: float) -> bool:
         """Update the flow rate (ml/sec) for a pump and save as calibration"""
-        success = self.db.update_pump_flow_rate(pump_id, ml_per_second)
-
-        if success:
-            # Get pump to find liquid
-            pump = self.db.get_pump_by_id(pump_id)
-            if pump and pump.get('liquid_id'):
-                # Record calibration
-                self.db.add_calibration(
-                    liquid_id=pump['liquid_id'],
-                    ml_per_second=ml_per_second,
-                    test_duration=10.0,  # Default
-                    measured_volume=ml_per_second * 10.0,
-                    notes="Flow rate update"
-                )
+        with self.db.transaction():
+            success = self.db.update_pump_flow_rate(pump_id, ml_per_second)
+
+            if success:
+                # Get pump to find liquid
+                pump = self.db.get_pump_by_id(pump_id)
+                if pump and pump.get('liquid_id'):
+                    # Record calibration (unless the liquid already has this rate)
+                    latest = self.get_latest_calibration(pump['liquid_id'])
+                    if not latest or latest['ml_per_second'] != ml_per_second:
+                        self.add_calibration(
+                            liquid_id=pump['liquid_id'],
+                            ml_per_second=ml_per_second,
+                            test_duration=10.0,  # Default
+                            measured_volume=ml_per_second * 10.0,
+                            notes="Flow rate update"
+                        )
 
         return success
 
+    def update_pumps(self, updates: List[dict]) -> List[dict]:
+        """
+        Apply liquid and/or flow rate changes to several pumps in one transaction
+
+        Args:
+            updates: One dict per pump with 'id' and optionally 'liquid_id'
+                and/or 'ml_per_second' (only the keys present are applied)
+
+        Returns:
+            Updated pump configurations, in the order of updates
+
+        Raises:
+            ValueError: If a pump or liquid does not exist (nothing is written)
+        """
+        with self.db.transaction():
+            for update in updates:
+                pump_id = update['id']
+
+                liquid_id = update.get('liquid_id')
+                if liquid_id is not None and not self.db.get_liquid_by_id(liquid_id):
+                    raise ValueError(f"Liquid {liquid_id} not found")
+
+                if 'liquid_id' in update and not self.update_pump_liquid(pump_id, update['liquid_id']):
+                    raise ValueError(f"Pump {pump_id} not found")
+
+                if 'ml_per_second' in update and not self.update_pump_flow_rate(pump_id, update['ml_per_second']):
+                    raise ValueError(f"Pump {pump_id} not found")
+
+            return [self.db.get_pump_by_id(update['id']) for update in updates]
+
+    def get_pump_optimizer(self, use_popularity: bool = False) -> PumpOptimizer:
+        """Get the pump assignment optimizer, optionally weighting cocktails by 1 + completed mixes"""
+        if not use_popularity:
+            return self._cached('pump_optimizer', ('catalog',), lambda: PumpOptimizer(
+                self.get_cocktails(), substitutions=self.get_substitutions()))
+
+        def build() -> PumpOptimizer:
+            mixes = self.db.get_mix_counts()
+            return PumpOptimizer(self.get_cocktails(), {
+                cocktail['id']: 1.0 + mixes.get(cocktail['id'], 0) for cocktail in self.get_cocktails()
+            }, self.get_substitutions())
+        return self._cached('pump_optimizer_popular', ('catalog', 'history'), build)
+
+    def optimize_pumps(self, pinned_pump_ids: List[int] = (), time_budget: float = 2.0,
+                       use_popularity: bool = False) -> dict:
+        """
+        Suggest liquids for the active pumps that make the most cocktails
+
+        Args:
+            pinned_pump_ids: Pumps that keep their current liquid
+            time_budget: Seconds the search may take
+            use_popularity: Weight cocktails by how often they were mixed
+
+        Returns:
+            Dict with the suggested assignments (liquids already loaded stay on
+            their pump, each liquid on one pump only) and the makeable count
+            and score before and after
+        """
+        pinned_ids = set(pinned_pump_ids)
+        pumps = [pump for pump in self.get_pumps() if pump.get('is_active', True)]
+        pinned = [pump for pump in pumps if pump['id'] in pinned_ids]
+        free = [pump for pump in pumps if pump['id'] not in pinned_ids]
+
+        # A liquid that no longer exists counts as an empty pump (and is cleared when applied)
+        liquid_names = {liquid['id']: liquid['name'] for liquid in self.get_all_liquids_with_ids()}
+        loaded = {pump['id']: pump['liquid_id'] if pump['liquid_id'] in liquid_names else None for pump in pumps}
+        pinned_liquids = [loaded[pump['id']] for pump in pinned if loaded[pump['id']] is not None]
+
+        optimizer = self.get_pump_optimizer(use_popularity)
+        current = optimizer.evaluate(liquid_id for liquid_id in loaded.values() if liquid_id is not None)
+        plan = optimizer.optimize(len(free), pinned=pinned_liquids, time_budget=time_budget)
+
+        # Keep chosen liquids on the first pump they are already on, fill the other pumps in order.
+        # Pumps left over when the plan has fewer liquids than free pumps keep their liquid,
+        # unless another pump already has it.
+        new_liquids = [liquid_id for liquid_id in plan.liquid_ids if liquid_id not in pinned_liquids]
+        kept: Dict[int, int] = {}  # liquid_id -> pump_id
+        for pump in free:
+            if loaded[pump['id']] in new_liquids:
+                kept.setdefault(loaded[pump['id']], pump['id'])
+        unplaced = iter([liquid_id for liquid_id in new_liquids if liquid_id not in kept])
+        assigned = {pump['id']: loaded[pump['id']] for pump in pinned}
+        taken = set(pinned_liquids) | set(kept)
+        for pump in free:
+            liquid_id = loaded[pump['id']]
+            if kept.get(liquid_id) == pump['id']:
+                assigned[pump['id']] = liquid_id
+            else:
+                assigned[pump['id']] = next(unplaced, None if liquid_id in taken else liquid_id)
+                taken.add(assigned[pump['id']])
+        # Kept liquids can only add cocktails; report what the assignment makes
+        suggested = optimizer.evaluate(liquid_id for liquid_id in assigned.values() if liquid_id is not None)
+
+        names = {cocktail['id']: cocktail['name'] for cocktail in self.get_cocktails()}
+        return {
+            'assignments': [
+                {
+                    'pump_id': pump['id'],
+                    'liquid_id': assigned[pump['id']],
+                    'liquid': liquid_names.get(assigned[pump['id']]),
+                    'changed': assigned[pump['id']] != pump['liquid_id'],
+                    'pinned': pump['id'] in pinned_ids,
+                }
+                for pump in pumps
+            ],
+            'makeable_count': len(suggested.makeable),
+            'current_makeable_count': len(current.makeable),
+            'score': suggested.score,
+            'current_score': current.score,
+            'makeable_cocktails': sorted(names[cocktail_id] for cocktail_id in suggested.makeable),
+            'evaluations': plan.evaluations,
+            'elapsed_ms': round(plan.elapsed_seconds * 1000, 1),
+        }
+
+    def add_mix_history(self, cocktail_id: int, size_multiplier: float = 1.0) -> int:
+        """Record the start of mixing a cocktail"""
+        return self.db.add_mix_history(cocktail_id, size_multiplier)
+
+    def update_mix_history_status(self, history_id: int, status: str, error_message: Optional[str] = None) -> bool:
+        """Record how mixing a cocktail ended ('completed', 'failed' or 'cancelled')"""
+        return self.db.update_mix_history_status(history_id, status, error_message)
+
     def get_liquid_flow_rate(self, liquid_id: int) -> Optional[float]:
         """Get the saved flow rate for a specific liquid"""
-        calibration = self.db.get_latest_calibration(liquid_id)
+        calibration = self.get_latest_calibration(liquid_id)
         return calibration['ml_per_second'] if calibration else None
 
+    def get_latest_calibration(self, liquid_id: int) -> Optional[dict]:
+        """Get the most recent calibration for a liquid (served from memory)"""
+        if self.db.in_transaction():
+            # Calibrations written in this transaction are not committed (or cached) yet
+            return self.db.get_latest_calibration(liquid_id)
+
+        calibrations = self._cached('latest_calibrations', ('calibrations',), lambda: {
+            calibration['liquid_id']: calibration for calibration in self.db.get_latest_calibrations()
+        })
+        return calibrations.get(liquid_id)
+
+    def add_calibration(self, liquid_id: int, ml_per_second: float, test_duration: float,
+                        measured_volume: float, notes: Optional[str] = None) -> int:
+        """Record a calibration"""
+        return self.db.add_calibration(liquid_id, ml_per_second, test_duration, measured_volume, notes)
+
+    def get_calibration_stats(self, liquid_id: int) -> Optional[dict]:
+        """Get flow rate mean/stddev over the full calibration history of a liquid"""
+        return self.db.get_calibration_stats(liquid_id)
+
+    def compact_calibrations(self, keep: int = CALIBRATION_HISTORY_KEEP) -> Dict[str, int]:
+        """Fold old calibration history into per-liquid summary statistics"""
+        return self.db.compact_calibrations(keep)
+
     def get_installed_liquids(self) -> List[str]:
         """Get list of liquids currently installed in pumps"""
-        liquids = self.db.get_installed_liquids()
+        liquids = self.get_installed_liquids_with_ids()
         return [liquid['name'] for liquid in liquids]
 
     def get_installed_liquid_ids(self) -> List[int]:
         """Get list of liquid IDs currently installed in pumps"""
-        return self.db.get_installed_liquid_ids()
+        return self._cached('installed_liquid_ids', ('pumps',), self.db.get_installed_liquid_ids)
 
     def get_installed_liquids_with_ids(self) -> List[dict]:
         """Get installed liquids with their IDs"""
-        return self.db.get_installed_liquids()
+        return self._cached('installed_liquids', ('pumps', 'catalog'), self.db.get_installed_liquids)
+
+    def get_all_settings(self) -> Dict[str, str]:
+        """Get all settings as a key -> value dict"""
+        return self._cached('settings', ('settings',), self.db.get_all_settings)
+
+    def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a setting value"""
+        return self.get_all_settings().get(key, default)
+
+    def set_setting(self, key: str, value: str) -> bool:
+        """Set a setting value"""
+        return self.db.set_setting(key, value)
+
+    def get_units(self) -> dict:
+        """Get milliliters per unit for all known units"""
+        return self.units.get_units()
 
     def convert_to_ml(self, amount: float, unit: str) -> float:
-        """Convert ingredient amount to milliliters"""
-        cl_to_ml_str = self.db.get_setting('cl_to_ml', '10')
-        cl_to_ml = float(cl_to_ml_str) if cl_to_ml_str else 10.0
-
-        unit_lower = unit.lower()
-        if unit_lower == 'cl':
-            return amount * cl_to_ml
-        elif unit_lower == 'ml':
-            return amount
-        elif unit_lower in ['dash', 'dashes']:
-            return 2.0  # Approximate: 1 dash ≈ 2ml
-        elif unit_lower == 'splash':
-            return 5.0  # Approximate: 1 splash ≈ 5ml
-        else:
-            return amount  # Default fallback
+        """Convert ingredient amount to milliliters (served from memory)"""
+        return self.units.to_ml(amount, unit)
@@ -0,0 +1,93 @@
+import bisect
+import heapq
+import re
+from typing import Dict, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+# Sorts after every character, so prefix + _KEY_END bounds all keys starting with prefix
+_KEY_END = "\U0010ffff"
+
+
+def search_key(text: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a liquid name, e.g. 'Ginger-Ale' -> 'ginger ale'"""
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+def _word_suffixes(key: str) -> List[str]:
+    """The key from each word start: 'fresh lime juice' -> 'fresh lime juice', 'lime juice', 'juice'"""
+    words = key.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class LiquidSuggestIndex:
+    """
+    Prefix autocomplete over liquid names and aliases
+
+    Built once per catalog generation. Every name and alias is stored from
+    each of its word starts in one sorted array, so 'jui' finds 'Lime Juice'
+    with a bisect plus a scan over the matching keys only. Suggestions are
+    ranked by how many cocktails use the liquid.
+    """
+
+    def __init__(self, liquids: List[dict], aliases: List[dict] = ()):
+        """
+        Args:
+            liquids: {'id', 'name', 'cocktail_count'} dicts (see DatabaseManager.get_liquid_usage)
+            aliases: {'liquid_id', 'alias'} dicts
+        """
+        self._liquids: Dict[int, dict] = {liquid['id']: liquid for liquid in liquids}
+        # Most used first, then alphabetical
+        self._rank: Dict[int, tuple] = {
+            liquid['id']: (-liquid['cocktail_count'], search_key(liquid['name']), liquid['id'])
+            for liquid in liquids
+        }
+
+        # (key, liquid_id, alias or '' for the liquid's own name)
+        entries: List[Tuple[str, int, str]] = []
+        for liquid in liquids:
+            for key in _word_suffixes(search_key(liquid['name'])):
+                entries.append((key, liquid['id'], ''))
+        for alias in aliases:
+            if alias['liquid_id'] in self._liquids:
+                for key in _word_suffixes(search_key(alias['alias'])):
+                    entries.append((key, alias['liquid_id'], alias['alias']))
+
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._matches = [(liquid_id, alias) for _, liquid_id, alias in entries]
+
+    def __len__(self) -> int:
+        return len(self._liquids)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Liquids whose name or alias has a word starting with prefix
+
+        Returns:
+            Up to limit {'id', 'name', 'cocktail_count', 'alias'} dicts, most used
+            first; alias is set when only an alias matched
+        """
+        key = search_key(prefix)
+        if not key:
+            return []
+
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_left(self._keys, key + _KEY_END, start)
+
+        matched_alias: Dict[int, Optional[str]] = {}
+        for liquid_id, alias in self._matches[start:end]:
+            if not alias:
+                matched_alias[liquid_id] = None  # A name match wins over an alias
+            else:
+                matched_alias.setdefault(liquid_id, alias)
+
+        ranked = heapq.nsmallest(limit, matched_alias, key=self._rank.__getitem__)
+        return [
+            {
+                'id': liquid_id,
+                'name': self._liquids[liquid_id]['name'],
+                'cocktail_count': self._liquids[liquid_id]['cocktail_count'],
+                'alias': matched_alias[liquid_id],
+            }
+            for liquid_id in ranked
+        ]
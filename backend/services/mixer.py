@@ -1,8 +1,9 @@
 from typing import List, Optional, Dict
 from services.database import DatabaseService
+from services.availability import CatalogEntry
 from services.gpio_controller import GPIOController
 from services.arduino import ArduinoService
-from models import MixerState, Cocktail, CocktailWithAvailability, Ingredient
+from models import MixerState
 import threading
 import time
 
@@ -31,56 +32,13 @@ class MixerService:
             "error_message": self.error_message
         }
 
-    def get_available_cocktails(self) -> List[CocktailWithAvailability]:
+    def get_available_cocktails(self) -> List[dict]:
         """Get all cocktails with availability based on installed liquids (using IDs)"""
-        cocktails = self.db.get_cocktails()
-        installed_liquid_ids = set(self.db.get_installed_liquid_ids())
-
-        result = []
-        for cocktail_data in cocktails:
-            # Parse ingredients
-            ingredients = [
-                Ingredient(**ing) for ing in cocktail_data.get('ingredients', [])
-            ]
-
-            # Create cocktail object
-            cocktail = Cocktail(
-                name=cocktail_data['name'],
-                timing=cocktail_data.get('timing'),
-                taste=cocktail_data.get('taste'),
-                ingredients=ingredients,
-                preparation=cocktail_data.get('preparation')
-            )
-
-            # Get required liquid IDs (case-insensitive lookup)
-            required_liquid_ids = set()
-            ingredient_name_to_id = {}
-            for ing in ingredients:
-                liquid_id = self.db.get_id_for_liquid(ing.ingredient)
-                if liquid_id:
-                    required_liquid_ids.add(liquid_id)
-                    ingredient_name_to_id[liquid_id] = ing.ingredient
-
-            # Check availability by comparing IDs
-            missing_ids = required_liquid_ids - installed_liquid_ids
-
-            # Get original ingredient names for missing items
-            missing_original = [ingredient_name_to_id[lid] for lid in missing_ids if lid in ingredient_name_to_id]
-
-            cocktail_with_avail = CocktailWithAvailability(
-                **cocktail.model_dump(),
-                is_available=len(missing_ids) == 0,
-                missing_ingredients=sorted(missing_original)
-            )
-
-            result.append(cocktail_with_avail)
-
-        return result
-
-    def get_makeable_cocktails(self) -> List[CocktailWithAvailability]:
+        return self.db.get_availability().cocktails()
+
+    def get_makeable_cocktails(self) -> List[dict]:
         """Get only cocktails that can be made with current liquids"""
-        all_cocktails = self.get_available_cocktails()
-        return [c for c in all_cocktails if c.is_available]
+        return self.db.get_availability().cocktails(available_only=True)
 
     def can_make_cocktail(self, cocktail_name: str) -> tuple[bool, List[str]]:
         """
@@ -89,34 +47,21 @@ class MixerService:
         Returns:
             Tuple of (can_make: bool, missing_ingredients: List[str])
         """
-        cocktail_data = self.db.get_cocktail_by_name(cocktail_name)
-        if not cocktail_data:
+        entry = self.db.find_cocktail(cocktail_name)
+        if not entry:
             return False, ["Cocktail not found"]
 
-        installed_liquid_ids = set(self.db.get_installed_liquid_ids())
-
-        # Get required liquid IDs
-        required_liquid_ids = set()
-        ingredient_map = {}
-
-        for ing in cocktail_data.get('ingredients', []):
-            liquid_id = self.db.get_id_for_liquid(ing['ingredient'])
-            if liquid_id:
-                required_liquid_ids.add(liquid_id)
-                ingredient_map[liquid_id] = ing['ingredient']
-
-        missing_ids = required_liquid_ids - installed_liquid_ids
-        missing_names = [ingredient_map[lid] for lid in missing_ids if lid in ingredient_map]
+        return entry.is_available, entry.missing_ingredients
 
-        return len(missing_ids) == 0, sorted(missing_names)
-
-    def make_cocktail(self, cocktail_name: str, size_multiplier: float = 1.0) -> bool:
+    def make_cocktail(self, cocktail_name: str, size_multiplier: float = 1.0,
+                      entry: Optional[CatalogEntry] = None) -> bool:
         """
         Start making a cocktail (non-blocking)
 
         Args:
             cocktail_name: Name of the cocktail to make
             size_multiplier: Multiplier for recipe (1.0 = normal size)
+            entry: Catalog entry already looked up by the caller (skips the lookup)
 
         Returns:
             True if mixing started, False otherwise
@@ -126,45 +71,46 @@ class MixerService:
             return False
 
         # Check if cocktail can be made
-        can_make, missing = self.can_make_cocktail(cocktail_name)
-        if not can_make:
-            self.error_message = f"Cannot make cocktail. Missing: {', '.join(missing)}"
+        entry = entry or self.db.find_cocktail(cocktail_name)
+        if not entry:
+            self.error_message = "Cocktail not found"
+            return False
+        if not entry.is_available:
+            self.error_message = f"Cannot make cocktail. Missing: {', '.join(entry.missing_ingredients)}"
             return False
 
         # Start mixing in background thread
         self.cancel_flag = False
         self.mixing_thread = threading.Thread(
             target=self._mix_cocktail_thread,
-            args=(cocktail_name, size_multiplier)
+            args=(entry.cocktail, size_multiplier)
         )
         self.mixing_thread.start()
 
         return True
 
-    def _mix_cocktail_thread(self, cocktail_name: str, size_multiplier: float):
+    def _mix_cocktail_thread(self, cocktail_data: dict, size_multiplier: float):
         """Background thread for mixing cocktail"""
+        cocktail_name = cocktail_data['name']
+        history_id = None
         try:
             self.state = MixerState.MIXING
             self.current_cocktail = cocktail_name
             self.progress_percent = 0.0
             self.error_message = None
+            history_id = self.db.add_mix_history(cocktail_data['id'], size_multiplier)
 
             # Indicate that mixing has started (arduino will show mixing LED)
             # self.arduino.send_command("1") # Deactivate for now because cables are a mess
 
-            # Get cocktail recipe
-            cocktail_data = self.db.get_cocktail_by_name(cocktail_name)
-            if not cocktail_data:
-                raise Exception("Cocktail not found")
-
             ingredients = cocktail_data.get('ingredients', [])
-            pumps = {p['liquid']: p for p in self.db.get_pumps() if p.get('liquid')}
 
             # Calculate steps
             total_steps = len(ingredients)
 
             for idx, ingredient in enumerate(ingredients):
                 if self.cancel_flag:
+                    self.db.update_mix_history_status(history_id, 'cancelled')
                     self.state = MixerState.IDLE
                     self.current_cocktail = None
                     self.progress_percent = 0.0
@@ -183,15 +129,18 @@ class MixerService:
                     time.sleep(2)  # Simulate 2 seconds per ingredient
                 else:
                     # Real mode - use GPIO controller
-                    # Find pump for this liquid
-                    if liquid not in pumps:
+                    # Find pump for this liquid, or for an installed substitute
+                    pump = self.db.route_liquid(ingredient['liquid_id'])
+                    if pump is None:
                         print(f"Warning: No pump found for {liquid}, skipping")
                         continue
 
-                    pump = pumps[liquid]
+                    if pump['liquid_id'] != ingredient['liquid_id']:
+                        print(f"Substituting {pump['liquid']} for {liquid} (ratio {pump['ratio']:g})")
+                        liquid = pump['liquid']
 
                     # Convert to ml
-                    ml = self.db.convert_to_ml(amount, unit) * size_multiplier
+                    ml = self.db.convert_to_ml(amount, unit) * size_multiplier * pump['ratio']
 
                     # Calculate duration
                     duration_ms = self.controller.calculate_duration_ms(ml, pump['id'])
@@ -211,6 +160,7 @@ class MixerService:
                 self.progress_percent = ((idx + 1) / total_steps) * 100
 
             # Mixing complete
+            self.db.update_mix_history_status(history_id, 'completed')
             self.state = MixerState.IDLE
             self.current_cocktail = None
             self.progress_percent = 100.0
@@ -233,6 +183,9 @@ class MixerService:
                 self.controller.stop_all_pumps()
                 self.controller.stop_mixer()
 
+            if history_id is not None:
+                self.db.update_mix_history_status(history_id, 'failed', str(e))
+
     def cancel_mixing(self) -> bool:
         """Cancel current mixing operation"""
         if self.state != MixerState.MIXING:
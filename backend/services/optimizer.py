@@ -0,0 +1,244 @@
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from services.substitutions import SubstitutionClosure
+
+
+# Score changes smaller than this are rounding noise
+EPSILON = 1e-9
+# Restarts in a row without a better selection after which the search stops early
+PATIENCE = 10
+
+
+def _improves(delta: tuple) -> bool:
+    """Whether a (value, potential) change is an improvement, value first"""
+    value, potential = delta
+    return value > EPSILON or (value > -EPSILON and potential > EPSILON)
+
+
+@dataclass
+class PumpPlan:
+    """Liquid selection found by PumpOptimizer"""
+    liquid_ids: List[int]  # Chosen liquids, pinned ones included
+    makeable: List[int]  # Ids of the cocktails the selection can make
+    score: float  # Summed weight of the makeable cocktails
+    evaluations: int = 0  # Candidate moves scored
+    elapsed_seconds: float = 0.0
+    stats: Dict[str, int] = field(default_factory=dict)
+
+
+class PumpOptimizer:
+    """
+    Choose which liquids to load so the most cocktails can be made
+
+    Liquids are bits and every cocktail's required (non-optional) liquids a
+    bitmask, as in AvailabilityIndex. A cocktail is makeable when its mask
+    is a subset of the selection and, for each required liquid that has
+    substitutes, the selection holds the liquid or one of them (the same
+    rule as AvailabilityIndex, so the counts agree with /cocktails/available).
+    The search starts from a greedy selection and improves it by swapping
+    one free liquid for another (local search), then restarts from
+    perturbed copies of the best selection until a run of restarts finds
+    nothing better or the time budget is spent. Moves are scored
+    incrementally: swapping liquid a for b only changes the cocktails that
+    require a or b.
+
+    Since most cocktails need two or more liquids, adding a single liquid
+    often makes nothing new; ties are broken by a potential that rewards
+    cocktails for each of their liquids already selected.
+    """
+
+    def __init__(self, cocktails: List[dict], weights: Optional[Dict[int, float]] = None,
+                 substitutions: Optional[SubstitutionClosure] = None):
+        """
+        Args:
+            cocktails: Catalog cocktails, ingredients with liquid_id and is_optional
+            weights: Weight per cocktail id (default 1.0 each)
+            substitutions: Substitution rules; a required liquid is also served by its substitutes
+        """
+        self._bits: Dict[int, int] = {}  # liquid_id -> bit
+        self._ids: List[int] = []
+        self._required: List[int] = []  # Required liquids without substitutes
+        self._alternatives: List[Tuple[int, ...]] = []  # Per required liquid with substitutes: it or any of them
+        self._sizes: List[int] = []
+        self._weights: List[float] = []
+        self._uses: Dict[int, List[int]] = {}  # liquid bit -> cocktail positions requiring it
+
+        for cocktail in cocktails:
+            mask = 0
+            alternatives: Dict[int, int] = {}
+            for ingredient in cocktail.get('ingredients', []):
+                liquid_id = ingredient.get('liquid_id')
+                if liquid_id is None or ingredient.get('is_optional'):
+                    continue
+                substitutes = substitutions.substitutes(liquid_id) if substitutions else {}
+                if substitutes:
+                    alternatives[liquid_id] = self._bit(liquid_id)
+                    for substitute_id in substitutes:
+                        alternatives[liquid_id] |= self._bit(substitute_id)
+                else:
+                    mask |= self._bit(liquid_id)
+
+            position = len(self._ids)
+            self._ids.append(cocktail['id'])
+            self._required.append(mask)
+            self._alternatives.append(tuple(alternatives.values()))
+            self._sizes.append(bin(mask).count("1") + len(alternatives))
+            self._weights.append(float((weights or {}).get(cocktail['id'], 1.0)))
+            bits = mask
+            for alternative in alternatives.values():
+                bits |= alternative
+            while bits:
+                bit = bits & -bits
+                self._uses.setdefault(bit, []).append(position)
+                bits ^= bit
+
+    def _bit(self, liquid_id: int) -> int:
+        bit = self._bits.get(liquid_id)
+        if bit is None:
+            bit = self._bits[liquid_id] = 1 << len(self._bits)
+        return bit
+
+    def _mask(self, liquid_ids: Iterable[int]) -> int:
+        mask = 0
+        for liquid_id in liquid_ids:
+            mask |= self._bits.get(liquid_id, 0)
+        return mask
+
+    def _liquid_ids(self, mask: int) -> List[int]:
+        return [liquid_id for liquid_id, bit in self._bits.items() if mask & bit]
+
+    def _missing(self, position: int, selection: int) -> int:
+        """Number of required liquids a selection does not serve"""
+        missing = bin(self._required[position] & ~selection).count("1")
+        for alternative in self._alternatives[position]:
+            if not alternative & selection:
+                missing += 1
+        return missing
+
+    def _contribution(self, position: int, selection: int) -> tuple:
+        """(weight if makeable, potential) of one cocktail under a selection"""
+        missing = bin(self._required[position] & ~selection).count("1")
+        for alternative in self._alternatives[position]:  # Inlined _missing, this is the hot loop
+            if not alternative & selection:
+                missing += 1
+        weight = self._weights[position]
+        if missing == 0:
+            return weight, weight
+        return 0.0, weight / (1 << missing) / self._sizes[position]
+
+    def _score(self, selection: int, positions: Iterable[int]) -> tuple:
+        value = potential = 0.0
+        for position in positions:
+            v, p = self._contribution(position, selection)
+            value += v
+            potential += p
+        return value, potential
+
+    def _affected(self, *bits: int) -> set:
+        affected = set()
+        for bit in bits:
+            affected.update(self._uses.get(bit, ()))
+        return affected
+
+    def _delta(self, selection: int, remove: int, add: int) -> tuple:
+        """Score change of replacing bit remove with bit add (either may be 0)"""
+        affected = self._affected(remove, add)
+        before = self._score(selection, affected)
+        after = self._score((selection & ~remove) | add, affected)
+        return after[0] - before[0], after[1] - before[1]
+
+    def evaluate(self, liquid_ids: Iterable[int]) -> PumpPlan:
+        """Makeable cocktails and score of a given selection"""
+        liquid_ids = list(liquid_ids)
+        selection = self._mask(liquid_ids)
+        positions = [position for position in range(len(self._ids)) if not self._missing(position, selection)]
+        makeable = [self._ids[position] for position in positions]
+        score = sum(self._weights[position] for position in positions)
+        return PumpPlan(liquid_ids=sorted(set(liquid_ids)), makeable=makeable, score=score)
+
+    def optimize(self, slots: int, pinned: Sequence[int] = (), candidates: Optional[Iterable[int]] = None,
+                 time_budget: float = 2.0, seed: int = 0, patience: int = PATIENCE) -> PumpPlan:
+        """
+        Pick liquids for the free pump slots
+
+        Args:
+            slots: Number of free pumps (pinned liquids are not counted)
+            pinned: Liquids that stay loaded
+            candidates: Liquids that may be chosen (every recipe liquid if None)
+            time_budget: Seconds to spend at most; the best selection so far is returned
+            seed: Seed for the restart perturbations (same seed, same search)
+            patience: Stop after this many restarts in a row without improvement
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget
+        rng = random.Random(seed)
+        evaluations = 0
+
+        fixed = self._mask(pinned)
+        allowed = None if candidates is None else set(candidates)
+        pool = [bit for liquid_id, bit in self._bits.items()
+                if not bit & fixed and (allowed is None or liquid_id in allowed)]
+        slots = max(0, min(slots, len(pool)))
+
+        # Greedy: repeatedly add the liquid with the best (value, potential) gain
+        selection = fixed
+        for _ in range(slots):
+            best_bit, best_gain = 0, None
+            for bit in pool:
+                if bit & selection:
+                    continue
+                gain = self._delta(selection, 0, bit)
+                evaluations += 1
+                if best_gain is None or gain > best_gain:
+                    best_bit, best_gain = bit, gain
+            selection |= best_bit
+
+        def local_search(selection: int) -> int:
+            """First-improvement swaps until no swap improves or time is up"""
+            nonlocal evaluations
+            improved = True
+            while improved and time.perf_counter() < deadline:
+                improved = False
+                chosen = [bit for bit in pool if bit & selection]
+                for remove in chosen:
+                    for add in pool:
+                        if add & selection:
+                            continue
+                        evaluations += 1
+                        if _improves(self._delta(selection, remove, add)):
+                            selection = (selection & ~remove) | add
+                            improved = True
+                            break
+                    if improved or time.perf_counter() >= deadline:
+                        break
+            return selection
+
+        selection = local_search(selection)
+        best = selection
+        best_score = self._score(best, range(len(self._ids)))
+        restarts = stale = 0
+
+        # Iterated local search: kick out a few free liquids at random and re-optimize
+        while slots and len(pool) > slots and stale < patience and time.perf_counter() < deadline:
+            restarts += 1
+            stale += 1
+            chosen = [bit for bit in pool if bit & best]
+            unchosen = [bit for bit in pool if not bit & best]
+            kicks = rng.randint(1, max(1, min(3, slots, len(unchosen))))
+            candidate = best
+            for remove, add in zip(rng.sample(chosen, kicks), rng.sample(unchosen, kicks)):
+                candidate = (candidate & ~remove) | add
+            candidate = local_search(candidate)
+            score = self._score(candidate, range(len(self._ids)))
+            if _improves((score[0] - best_score[0], score[1] - best_score[1])):
+                best, best_score = candidate, score
+                stale = 0
+
+        plan = self.evaluate(self._liquid_ids(best))
+        plan.evaluations = evaluations
+        plan.elapsed_seconds = time.perf_counter() - start
+        plan.stats = {'restarts': restarts, 'candidates': len(pool), 'cocktails': len(self._ids)}
+        return plan
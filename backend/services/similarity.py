@@ -0,0 +1,137 @@
+import random
+from typing import Dict, List, Optional, Tuple
+
+# Signature length = BANDS * ROWS. Two cocktails with ingredient-set Jaccard
+# similarity s share at least one band with probability 1 - (1 - s^ROWS)^BANDS:
+# about 87% at s=0.25 and over 99% from s=0.4.
+BANDS = 32
+ROWS = 2
+_PRIME = (1 << 61) - 1  # Mersenne prime for the universal hash family
+_SEED = 1
+
+
+class SimilarityIndex:
+    """
+    Cocktails with similar ingredients (MinHash with locality-sensitive hashing)
+
+    Built once per catalog generation. Every cocktail's set of liquids gets a
+    MinHash signature that is cut into bands; cocktails sharing a band land
+    in the same bucket. similar() only compares a cocktail with the others
+    in its buckets, using the exact Jaccard similarity of the liquid sets,
+    instead of with the whole catalog.
+
+    The hash values per liquid are fixed, so a signature only depends on the
+    cocktail's liquids: a rebuild starts from the previous index and only
+    re-buckets cocktails that were added, removed or given other liquids.
+    """
+
+    def __init__(self, cocktails: List[dict], previous: Optional['SimilarityIndex'] = None):
+        """
+        Args:
+            cocktails: Catalog cocktails, ingredients with liquid_id
+            previous: Index of the previous catalog generation to update instead of rebuilding
+        """
+        rng = random.Random(_SEED)
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(BANDS * ROWS)]
+        self._liquid_hashes: Dict[int, Tuple[int, ...]] = previous._liquid_hashes if previous else {}
+        self._sets: Dict[int, frozenset] = {}  # cocktail id -> liquid ids
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(BANDS)]
+        self._copied: Optional[set] = None  # (band, key) of bucket lists copied by an incremental build
+        self.changed = 0  # Cocktails (re)hashed by this build
+
+        sets = {}
+        for cocktail in cocktails:
+            liquids = frozenset(ingredient['liquid_id'] for ingredient in cocktail.get('ingredients', [])
+                                if ingredient.get('liquid_id') is not None)
+            if liquids:
+                sets[cocktail['id']] = liquids
+
+        if previous is None:
+            for cocktail_id, liquids in sets.items():
+                self._add(cocktail_id, liquids, self._signature(liquids))
+            self.changed = len(sets)
+            return
+
+        # Start from the previous buckets and only move the cocktails that changed.
+        # The previous index may still be serving requests, so bucket lists are
+        # copied before they are modified (once per build).
+        self._sets = dict(previous._sets)
+        self._signatures = dict(previous._signatures)
+        self._buckets = [dict(buckets) for buckets in previous._buckets]
+        self._copied = set()
+        for cocktail_id, liquids in previous._sets.items():
+            if sets.get(cocktail_id) != liquids:
+                self._remove(cocktail_id)
+        for cocktail_id, liquids in sets.items():
+            if cocktail_id not in self._sets:
+                self._add(cocktail_id, liquids, self._signature(liquids))
+                self.changed += 1
+        self._copied = None
+
+    def _bucket(self, band: int, key: Tuple[int, ...]) -> List[int]:
+        """Bucket list of a band, copied on first modification during an incremental build"""
+        buckets = self._buckets[band]
+        if self._copied is None:
+            return buckets.setdefault(key, [])
+        if (band, key) not in self._copied:
+            self._copied.add((band, key))
+            buckets[key] = list(buckets.get(key, ()))
+        return buckets[key]
+
+    def _add(self, cocktail_id: int, liquids: frozenset, signature: Tuple[int, ...]):
+        self._sets[cocktail_id] = liquids
+        self._signatures[cocktail_id] = signature
+        for band in range(BANDS):
+            self._bucket(band, signature[band * ROWS:(band + 1) * ROWS]).append(cocktail_id)
+
+    def _remove(self, cocktail_id: int):
+        signature = self._signatures.pop(cocktail_id)
+        del self._sets[cocktail_id]
+        for band in range(BANDS):
+            key = signature[band * ROWS:(band + 1) * ROWS]
+            bucket = self._bucket(band, key)
+            bucket.remove(cocktail_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def _liquid_hash(self, liquid_id: int) -> Tuple[int, ...]:
+        hashes = self._liquid_hashes.get(liquid_id)
+        if hashes is None:
+            hashes = self._liquid_hashes[liquid_id] = tuple(
+                (a * liquid_id + b) % _PRIME for a, b in self._coefficients)
+        return hashes
+
+    def _signature(self, liquids: frozenset) -> Tuple[int, ...]:
+        """Element-wise minimum of the liquids' hash values"""
+        hashes = [self._liquid_hash(liquid_id) for liquid_id in liquids]
+        return tuple(map(min, *hashes)) if len(hashes) > 1 else hashes[0]
+
+    def similar(self, cocktail_id: int) -> List[dict]:
+        """
+        Cocktails sharing a bucket with a cocktail, most similar first
+
+        Returns:
+            {'id', 'score'} dicts, score being the Jaccard similarity of the
+            liquid sets; empty for unknown cocktails or ones without liquids
+        """
+        signature = self._signatures.get(cocktail_id)
+        if signature is None:
+            return []
+
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            candidates.update(buckets[signature[band * ROWS:(band + 1) * ROWS]])
+        candidates.discard(cocktail_id)
+
+        liquids = self._sets[cocktail_id]
+        hits = []
+        for other in candidates:
+            other_liquids = self._sets[other]
+            shared = len(liquids & other_liquids)
+            hits.append({'id': other, 'score': shared / (len(liquids) + len(other_liquids) - shared)})
+        hits.sort(key=lambda hit: (-hit['score'], hit['id']))
+        return hits
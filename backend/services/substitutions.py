@@ -0,0 +1,70 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class SubstitutionClosure:
+    """
+    Transitive closure of the liquid substitution rules
+
+    Built once per catalog generation. For every liquid it lists all liquids
+    that may be poured in its place, nearest first, with the combined ratio
+    along the chain (fewest hops wins; equal hops keep the rule order). The
+    inverse, which liquids an installed liquid can stand in for, turns
+    "what can the pumps serve" into a union of precomputed sets.
+    """
+
+    def __init__(self, rules: Iterable[dict] = ()):
+        """
+        Args:
+            rules: {'liquid_id', 'substitute_id', 'ratio'} dicts (see DatabaseManager.get_liquid_substitutions)
+        """
+        edges: Dict[int, List[Tuple[int, float]]] = {}
+        for rule in rules:
+            edges.setdefault(rule['liquid_id'], []).append((rule['substitute_id'], float(rule['ratio'])))
+
+        # liquid_id -> {substitute_id: ratio}, in breadth-first order
+        self._substitutes: Dict[int, Dict[int, float]] = {}
+        # substitute_id -> liquids it can replace
+        self._replaces: Dict[int, set] = {}
+        for liquid_id in edges:
+            reachable: Dict[int, float] = {}
+            queue = deque([(liquid_id, 1.0)])
+            while queue:
+                current, ratio = queue.popleft()
+                for substitute_id, step in edges.get(current, ()):
+                    if substitute_id != liquid_id and substitute_id not in reachable:
+                        reachable[substitute_id] = ratio * step
+                        queue.append((substitute_id, ratio * step))
+            self._substitutes[liquid_id] = reachable
+            for substitute_id in reachable:
+                self._replaces.setdefault(substitute_id, set()).add(liquid_id)
+
+    def __bool__(self) -> bool:
+        return bool(self._substitutes)
+
+    def substitutes(self, liquid_id: int) -> Dict[int, float]:
+        """Liquids that may be poured instead of liquid_id, nearest first, with their ratios"""
+        return self._substitutes.get(liquid_id, {})
+
+    def covered(self, installed: Iterable[int]) -> frozenset:
+        """Liquids a recipe can use with these liquids installed (themselves plus what they replace)"""
+        covered = set(installed)
+        for liquid_id in list(covered):
+            covered |= self._replaces.get(liquid_id, set())
+        return frozenset(covered)
+
+    def route(self, liquid_id: int, installed: Iterable[int]) -> Optional[Tuple[int, float]]:
+        """
+        Installed liquid to pour for liquid_id
+
+        Returns:
+            (liquid_id, 1.0) if it is installed itself, the nearest installed
+            substitute with its ratio, or None if neither is installed
+        """
+        installed = installed if isinstance(installed, (set, frozenset)) else set(installed)
+        if liquid_id in installed:
+            return liquid_id, 1.0
+        for substitute_id, ratio in self.substitutes(liquid_id).items():
+            if substitute_id in installed:
+                return substitute_id, ratio
+        return None
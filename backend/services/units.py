@@ -0,0 +1,85 @@
+from typing import Callable, Dict, Optional, Tuple
+
+# Milliliters per unit (dash and splash are approximations, see FIXED_VOLUME_UNITS)
+DEFAULT_UNITS = {
+    'ml': 1.0,
+    'cl': 10.0,
+    'oz': 29.5735,
+    'dash': 2.0,
+    'splash': 5.0,
+    'barspoon': 5.0,
+}
+
+# Units that pour their volume once, whatever the amount: recipes were written
+# against the mixer always pouring 2 ml for any number of dashes and 5 ml for a
+# splash, so "3 dashes" is still 2 ml
+FIXED_VOLUME_UNITS = frozenset({'dash', 'splash'})
+
+UNIT_ALIASES = {
+    'milliliter': 'ml',
+    'milliliters': 'ml',
+    'centiliter': 'cl',
+    'centiliters': 'cl',
+    'ounce': 'oz',
+    'ounces': 'oz',
+    'dashes': 'dash',
+    'splashes': 'splash',
+    'barspoons': 'barspoon',
+    'bsp': 'barspoon',
+}
+
+# Settings key suffix for per-unit overrides, e.g. 'dash_to_ml' = '1.5'
+SETTING_SUFFIX = '_to_ml'
+
+
+class UnitRegistry:
+    """
+    In-memory unit conversion table
+
+    Factors are built from DEFAULT_UNITS plus '<unit>_to_ml' rows in the
+    settings table (so the existing 'cl_to_ml' setting still drives 'cl') and
+    kept until the settings data generation changes. For FIXED_VOLUME_UNITS
+    the factor is the volume poured, not a volume per unit.
+    """
+
+    def __init__(self, load_settings: Callable[[], Dict[str, str]], get_generation: Callable[[], tuple]):
+        self._load_settings = load_settings
+        self._get_generation = get_generation
+        self._table: Optional[Tuple[tuple, Dict[str, float]]] = None
+
+    def get_units(self) -> Dict[str, float]:
+        """Get milliliters per unit for all known units (without aliases)"""
+        factors = self._factors()
+        return {unit: factor for unit, factor in sorted(factors.items()) if unit not in UNIT_ALIASES}
+
+    def to_ml(self, amount: float, unit: str) -> float:
+        """Convert an amount to milliliters (unknown units are taken as ml)"""
+        unit = unit.strip().lower()
+        factor = self._factors().get(unit)
+        if factor is None:
+            return amount
+        if UNIT_ALIASES.get(unit, unit) in FIXED_VOLUME_UNITS:
+            return factor
+        return amount * factor
+
+    def _factors(self) -> Dict[str, float]:
+        generation = self._get_generation()
+        table = self._table
+        if table is not None and table[0] == generation:
+            return table[1]
+
+        factors = dict(DEFAULT_UNITS)
+        for key, value in self._load_settings().items():
+            if not key.endswith(SETTING_SUFFIX):
+                continue
+            unit = key[:-len(SETTING_SUFFIX)].lower()
+            try:
+                factors[UNIT_ALIASES.get(unit, unit)] = float(value)
+            except (TypeError, ValueError):
+                print(f"Warning: Ignoring invalid unit setting {key}={value!r}")
+
+        for alias, unit in UNIT_ALIASES.items():
+            factors[alias] = factors[unit]
+
+        self._table = (generation, factors)
+        return factors
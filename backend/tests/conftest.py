@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import the backend packages (database, services, ...) like main.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.database import DatabaseService  # noqa: E402
+
+CATALOG = [
+    {"name": "Cuba Libre", "ingredients": [
+        {"ingredient": "Rum", "amount": 5, "unit": "cl"},
+        {"ingredient": "Cola", "amount": 12, "unit": "cl"},
+    ]},
+    {"name": "Screwdriver", "ingredients": [
+        {"ingredient": "Vodka", "amount": 5, "unit": "cl"},
+        {"ingredient": "Orange Juice", "amount": 10, "unit": "cl"},
+    ]},
+    {"name": "Vodka Cola", "ingredients": [
+        {"ingredient": "Vodka", "amount": 5, "unit": "cl"},
+        {"ingredient": "Cola", "amount": 12, "unit": "cl"},
+    ]},
+    {"name": "Rum Punch", "ingredients": [
+        {"ingredient": "Rum", "amount": 5, "unit": "cl"},
+        {"ingredient": "Orange Juice", "amount": 8, "unit": "cl"},
+        {"ingredient": "Grenadine", "amount": 1, "unit": "cl"},
+    ]},
+]
+PUMP_COUNT = 4
+
+
+@pytest.fixture
+def service(tmp_path):
+    """A DatabaseService on a fresh database holding CATALOG and PUMP_COUNT empty pumps"""
+    service = DatabaseService(str(tmp_path / "test.db"))
+    service.import_cocktails(CATALOG)
+    with service.db.transaction():
+        for pump_id in range(1, PUMP_COUNT + 1):
+            service.db.execute_update("INSERT INTO pumps (id, pin) VALUES (?, ?)", (pump_id, pump_id + 1))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def liquid_ids(service):
+    """Liquid name -> id"""
+    return {liquid['name']: liquid['id'] for liquid in service.get_all_liquids_with_ids()}
+
+
+@pytest.fixture
+def client(service, tmp_path, monkeypatch):
+    """A TestClient of the app, serving the database of the service fixture"""
+    from fastapi.testclient import TestClient
+    import main
+    from api.responses import response_cache
+
+    # Every test database starts at generation 0, so cached bodies would match across tests
+    response_cache.clear()
+    monkeypatch.setenv("DB_PATH", str(service.db.db_path))
+    monkeypatch.setenv("CATALOG_SNAPSHOT_PATH", str(tmp_path / "client.catalog"))
+    monkeypatch.setenv("ARDUINO_PORT", str(tmp_path / "no-arduino"))
+    with TestClient(main.app) as client:
+        yield client
@@ -0,0 +1,48 @@
+"""Calibrations: latest per liquid from memory, compaction without losing statistics"""
+import statistics
+
+import pytest
+
+
+def calibrate(service, liquid_id, rates):
+    for rate in rates:
+        service.add_calibration(liquid_id, rate, 10.0, rate * 10.0)
+
+
+def test_latest_calibration_follows_writes(service, liquid_ids):
+    rum = liquid_ids['Rum']
+    assert service.get_latest_calibration(rum) is None
+
+    calibrate(service, rum, [10.0, 11.0])
+    assert service.get_latest_calibration(rum)['ml_per_second'] == 11.0
+
+    calibrate(service, rum, [12.0])
+    assert service.get_liquid_flow_rate(rum) == 12.0
+
+
+def test_compaction_keeps_newest_rows_and_statistics(service, liquid_ids):
+    rum, cola = liquid_ids['Rum'], liquid_ids['Cola']
+    rates = [10.0, 10.5, 9.5, 11.0, 10.2, 9.8]
+    calibrate(service, rum, rates[:3])
+    calibrate(service, cola, [5.0])
+    assert service.compact_calibrations(keep=2) == {'liquids': 1, 'rows': 1}
+
+    calibrate(service, rum, rates[3:])
+    assert service.compact_calibrations(keep=2) == {'liquids': 1, 'rows': 3}
+    assert service.compact_calibrations(keep=2) == {'liquids': 0, 'rows': 0}
+
+    remaining = service.db.execute_query(
+        "SELECT ml_per_second FROM calibrations WHERE liquid_id = ? ORDER BY id", (rum,))
+    assert [row['ml_per_second'] for row in remaining] == rates[-2:]
+    assert service.get_latest_calibration(rum)['ml_per_second'] == rates[-1]
+
+    stats = service.get_calibration_stats(rum)
+    assert stats['sample_count'] == len(rates)
+    assert stats['mean_ml_per_second'] == pytest.approx(statistics.mean(rates))
+    assert stats['stddev_ml_per_second'] == pytest.approx(statistics.stdev(rates))
+    assert service.get_calibration_stats(cola)['sample_count'] == 1
+
+
+def test_compaction_keeps_at_least_one(service):
+    with pytest.raises(ValueError):
+        service.compact_calibrations(keep=0)
@@ -0,0 +1,69 @@
+"""Catalog snapshot: same cocktails as the database, rebuilt when stale or corrupt"""
+import mmap
+
+import pytest
+
+from services import catalog_snapshot
+from services.catalog_snapshot import CatalogSnapshot, write_snapshot
+from services.database import DatabaseService
+
+
+@pytest.fixture
+def maps(monkeypatch):
+    """Every mmap the snapshot module opens"""
+    opened = []
+    real_mmap = mmap.mmap
+
+    def tracking_mmap(*args, **kwargs):
+        opened.append(real_mmap(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(catalog_snapshot.mmap, 'mmap', tracking_mmap)
+    return opened
+
+
+def test_snapshot_matches_database(service, tmp_path):
+    cocktails = service.db.get_all_cocktails()
+    write_snapshot(tmp_path / "test.catalog", cocktails, 7)
+
+    snapshot = CatalogSnapshot(tmp_path / "test.catalog")
+    assert snapshot.revision == 7
+    assert list(snapshot) == cocktails
+    assert snapshot[1] == cocktails[1]
+    assert snapshot.find("cuba-libre")['name'] == "Cuba Libre"
+    assert snapshot.find("Nope") is None
+    snapshot.close()
+
+
+def test_restart_maps_snapshot_and_rebuilds_after_catalog_change(service):
+    service.close()
+    restarted = DatabaseService(str(service.db.db_path))
+    assert isinstance(restarted.load_cocktails(), CatalogSnapshot)
+
+    restarted.import_cocktails([{"name": "Rum Cola", "ingredients": [
+        {"ingredient": "Rum", "amount": 5, "unit": "cl"}, {"ingredient": "Cola", "amount": 10, "unit": "cl"}]}])
+
+    assert "Rum Cola" in [cocktail['name'] for cocktail in restarted.get_cocktails()]
+    assert CatalogSnapshot(restarted.snapshot_path).revision == restarted.db.get_catalog_revision()
+    restarted.close()
+
+
+@pytest.mark.parametrize("content", [b"", b"KCAT", b"XXXX" + bytes(200)], ids=["empty", "truncated", "magic"])
+def test_corrupt_snapshot_is_closed_and_rebuilt(service, maps, content):
+    service.snapshot_path.write_bytes(content)
+
+    cocktails = service.load_cocktails()
+
+    assert [cocktail['name'] for cocktail in cocktails] == [
+        cocktail['name'] for cocktail in service.db.get_all_cocktails()]
+    assert all(opened.closed for opened in maps)
+    assert CatalogSnapshot(service.snapshot_path).revision == service.db.get_catalog_revision()
+
+
+def test_stale_snapshot_is_closed(service, maps):
+    write_snapshot(service.snapshot_path, [], service.db.get_catalog_revision() - 1)
+
+    cocktails = service.load_cocktails()
+
+    assert len(cocktails) == 4
+    assert len(maps) == 1 and maps[0].closed
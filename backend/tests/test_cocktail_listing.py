@@ -0,0 +1,44 @@
+"""GET /cocktails: filters, cursor pagination and field projection"""
+
+
+def test_cursor_pages_cover_the_catalog_once(client):
+    names = []
+    url = '/api/v1/cocktails?limit=3&fields=name'
+    while True:
+        response = client.get(url)
+        assert response.headers['X-Total-Count'] == "4"
+        names += [item['name'] for item in response.json()]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        url = f'/api/v1/cocktails?limit=3&fields=name&cursor={cursor}'
+
+    assert names == ['Cuba Libre', 'Rum Punch', 'Screwdriver', 'Vodka Cola']
+
+
+def test_cursor_survives_catalog_changes(service):
+    first = service.query_cocktails(limit=2)
+    service.import_cocktails([{"name": "Aaa Shot", "ingredients": [{"ingredient": "Rum", "amount": 2, "unit": "cl"}]}])
+
+    rest = service.query_cocktails(cursor=first.next_cursor)
+
+    assert [item['name'] for item in rest.items] == ['Screwdriver', 'Vodka Cola']
+    assert rest.next_cursor is None
+
+
+def test_filters_and_projection(client, liquid_ids):
+    client.put('/api/v1/pumps', json={'pumps': [
+        {'id': 1, 'liquid_id': liquid_ids['Vodka']}, {'id': 2, 'liquid_id': liquid_ids['Cola']}]})
+
+    with_vodka = client.get(f'/api/v1/cocktails?contains_liquid_id={liquid_ids["Vodka"]}&fields=name,is_available')
+    assert with_vodka.json() == [{'name': 'Screwdriver', 'is_available': False},
+                                 {'name': 'Vodka Cola', 'is_available': True}]
+
+    unavailable = client.get('/api/v1/cocktails?available=false&fields=name,missing_ingredients')
+    assert unavailable.json()[0] == {'name': 'Cuba Libre', 'missing_ingredients': ['Rum']}
+    assert unavailable.headers['X-Total-Count'] == "3"
+
+
+def test_bad_fields_and_cursor_are_rejected(client):
+    assert client.get('/api/v1/cocktails?fields=name,secret').status_code == 400
+    assert client.get('/api/v1/cocktails?cursor=not-a-cursor').status_code == 400
@@ -0,0 +1,51 @@
+"""ETag / If-None-Match on the read endpoints (see api/responses.py conditional_json)"""
+import main
+
+
+def test_unchanged_resource_is_not_modified(client):
+    response = client.get('/api/v1/pumps')
+    etag = response.headers['ETag']
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == "no-cache"
+
+    revalidated = client.get('/api/v1/pumps', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers['ETag'] == etag
+
+    weak_in_list = client.get('/api/v1/pumps', headers={'If-None-Match': f'"other", W/{etag}'})
+    assert weak_in_list.status_code == 304
+
+
+def test_write_changes_etag_and_body(client, liquid_ids):
+    etag = client.get('/api/v1/pumps').headers['ETag']
+
+    client.put('/api/v1/pumps/1', json={'liquid_id': liquid_ids['Rum']})
+
+    response = client.get('/api/v1/pumps', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json()[0]['liquid'] == "Rum"
+
+
+def test_write_to_other_group_keeps_etag(client):
+    etag = client.get('/api/v1/pumps').headers['ETag']
+
+    main.db_service.set_setting('cl_to_ml', '9')
+
+    assert client.get('/api/v1/pumps', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_etags_are_per_url(client):
+    everything = client.get('/api/v1/cocktails')
+    page = client.get('/api/v1/cocktails?limit=2')
+
+    assert everything.headers['ETag'] != page.headers['ETag']
+    assert client.get('/api/v1/cocktails?limit=2',
+                      headers={'If-None-Match': everything.headers['ETag']}).status_code == 200
+
+
+def test_if_none_match_star_only_for_existing_resources(client):
+    assert client.get('/api/v1/cocktails/cuba-libre', headers={'If-None-Match': '*'}).status_code == 304
+    assert client.get('/api/v1/cocktails/nope', headers={'If-None-Match': '*'}).status_code == 404
@@ -0,0 +1,53 @@
+"""Data generations: bumped by our writes, and by other processes' writes in the background"""
+import sqlite3
+import threading
+import time
+
+from database import db_manager
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_write_bumps_only_its_group(service):
+    before = dict(zip(db_manager.GENERATION_GROUPS, service.db.get_generation()))
+
+    service.db.update_pump_liquid(1, None)
+
+    after = dict(zip(db_manager.GENERATION_GROUPS, service.db.get_generation()))
+    assert [group for group in after if after[group] != before[group]] == ['pumps']
+
+
+def test_external_write_is_detected_off_the_calling_thread(service, monkeypatch):
+    monkeypatch.setattr(db_manager, 'EXTERNAL_WRITE_POLL_SECONDS', 0.05)
+    db = service.db
+    readers = set()
+    read_data_version = db._read_data_version
+
+    def tracking_read():
+        readers.add(threading.current_thread())
+        return read_data_version()
+
+    monkeypatch.setattr(db, '_read_data_version', tracking_read)
+    before = db.get_generation()
+
+    other = sqlite3.connect(str(db.db_path))
+    other.execute("UPDATE settings SET value = '11' WHERE key = 'cl_to_ml'")
+    other.commit()
+    other.close()
+
+    wait_for(lambda: all(new > old for new, old in zip(db.get_generation(), before)))
+    assert threading.current_thread() not in readers
+
+
+def test_close_stops_the_watcher(service):
+    service.db.get_generation()
+    thread = service.db._watch_thread
+
+    service.db.close()
+
+    assert thread is not None and not thread.is_alive()
@@ -0,0 +1,88 @@
+"""Bulk catalog import: missing-liquid policies, upsert modes and the file readers"""
+import io
+import json
+
+import pytest
+
+from database.importer import CatalogImporter, _iter_json_array, read_records
+
+NEGRONI = {"name": "Negroni", "ingredients": [
+    {"ingredient": "Gin", "amount": 3, "unit": "cl"},
+    {"ingredient": "Campari", "amount": 3, "unit": "cl"},
+]}
+
+
+def recipe(service, name):
+    return next((cocktail for cocktail in service.db.get_all_cocktails() if cocktail['name'] == name), None)
+
+
+@pytest.mark.parametrize("policy, ingredients, liquids_added, missing", [
+    ('create', ['Campari', 'Gin'], ['Gin', 'Campari'], []),
+    ('drop', [], [], ['Campari', 'Gin']),
+    ('skip', None, [], ['Gin']),  # The first missing liquid already skips the cocktail
+])
+def test_missing_liquid_policies(service, policy, ingredients, liquids_added, missing):
+    report = CatalogImporter(service.db, missing_liquids=policy).import_records([NEGRONI])
+
+    assert report.liquids_added == liquids_added
+    assert sorted(report.missing_liquids) == missing
+    cocktail = recipe(service, "Negroni")
+    if ingredients is None:
+        assert cocktail is None
+    else:
+        assert sorted(ing['ingredient'] for ing in cocktail['ingredients']) == ingredients
+
+
+def test_upsert_modes(service):
+    changed = {"name": "Cuba Libre", "ingredients": [
+        {"ingredient": "Rum", "amount": 6, "unit": "cl"}, {"ingredient": "Cola", "amount": 12, "unit": "cl"}]}
+    same = {"name": "Screwdriver", "ingredients": [
+        {"ingredient": "Vodka", "amount": 5, "unit": "cl"}, {"ingredient": "Orange Juice", "amount": 10, "unit": "cl"}]}
+
+    skipped = CatalogImporter(service.db, skip_existing=True).import_records([changed])
+    assert skipped.skipped == ["Cuba Libre"]
+    assert recipe(service, "Cuba Libre")['ingredients'][0]['amount'] == 5
+
+    dry = CatalogImporter(service.db).import_records([changed, NEGRONI], dry_run=True)
+    assert (dry.updated, dry.added) == (["Cuba Libre"], ["Negroni"])
+    assert recipe(service, "Negroni") is None
+
+    report = CatalogImporter(service.db).import_records([changed, same])
+    assert (report.updated, report.unchanged) == (["Cuba Libre"], ["Screwdriver"])
+    assert recipe(service, "Cuba Libre")['ingredients'][0]['amount'] == 6
+
+
+def test_import_is_all_or_nothing(service):
+    broken = {"name": "Broken", "ingredients": [{"ingredient": "Rum", "amount": "lots", "unit": "cl"}]}
+
+    with pytest.raises(ValueError):
+        CatalogImporter(service.db).import_records([NEGRONI, broken])
+
+    assert recipe(service, "Negroni") is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64])
+def test_json_array_is_streamed_in_chunks(chunk_size):
+    items = [{"name": "A", "amount": 1.5e3}, 12345, "x, y", [1, [2]], None, -0.25]
+
+    text = " [ " + " , ".join(json.dumps(item) for item in items) + " ] "
+
+    assert list(_iter_json_array(io.StringIO(text), chunk_size)) == items
+
+
+@pytest.mark.parametrize("suffix, content", [
+    (".json", json.dumps([NEGRONI])),
+    (".json", json.dumps({"cocktails": [NEGRONI]})),
+    (".jsonl", json.dumps(NEGRONI) + "\n\n"),
+    (".yaml", "- name: Negroni\n  ingredients:\n    - {ingredient: Gin, amount: 3, unit: cl}\n"
+              "    - {ingredient: Campari, amount: 3, unit: cl}\n"),
+    (".csv", "name,ingredient,amount,unit\nNegroni,Gin,3,cl\n,Campari,3,cl\n"),
+])
+def test_readers(tmp_path, suffix, content):
+    path = tmp_path / f"recipes{suffix}"
+    path.write_text(content, encoding="utf-8")
+
+    records = list(read_records(str(path)))
+
+    assert [record['name'] for record in records] == ["Negroni"]
+    assert [ing['ingredient'] for ing in records[0]['ingredients']] == ["Gin", "Campari"]
@@ -0,0 +1,34 @@
+"""Schema migrations: optional SQLite features are checked before anything is written"""
+import sqlite3
+
+import pytest
+
+from database import migrator
+
+
+def test_migrations_apply_and_are_idempotent():
+    conn = sqlite3.connect(":memory:")
+
+    assert migrator.apply_migrations(conn) == list(range(1, migrator.latest_version() + 1))
+    assert migrator.apply_migrations(conn) == []
+    assert migrator.get_schema_version(conn) == migrator.latest_version()
+
+
+def test_search_migration_requires_fts5():
+    sql = next(sql for _, name, sql in migrator.load_migrations() if name == "cocktail_search")
+
+    assert migrator.required_options(sql) == ["ENABLE_FTS5"]
+
+
+def test_missing_compile_option_fails_before_writing(monkeypatch):
+    migrations = migrator.load_migrations() + (
+        (migrator.latest_version() + 1, "needs_feature", "-- Requires: ENABLE_NO_SUCH_FEATURE\nCREATE TABLE t (x);"),
+    )
+    monkeypatch.setattr(migrator, "load_migrations", lambda: migrations)
+    conn = sqlite3.connect(":memory:")
+
+    with pytest.raises(RuntimeError, match=r"needs_feature needs SQLite compiled with ENABLE_NO_SUCH_FEATURE"):
+        migrator.apply_migrations(conn)
+
+    assert migrator.get_schema_version(conn) == 0
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
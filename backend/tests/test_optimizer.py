@@ -0,0 +1,69 @@
+"""Pump assignment optimizer: best selection, substitutions and the suggested assignments"""
+from services.optimizer import PumpOptimizer
+
+
+def makeable_names(service):
+    return sorted(cocktail['name'] for cocktail in service.get_availability().cocktails(available_only=True))
+
+
+def test_evaluate_accepts_generators(service, liquid_ids):
+    optimizer = PumpOptimizer(service.get_cocktails())
+    plan = optimizer.evaluate(liquid_ids[name] for name in ('Rum', 'Cola'))
+
+    assert plan.liquid_ids == sorted([liquid_ids['Rum'], liquid_ids['Cola']])
+    assert len(plan.makeable) == 1
+
+
+def test_optimize_finds_best_selection(service, liquid_ids):
+    plan = PumpOptimizer(service.get_cocktails()).optimize(4, time_budget=5)
+
+    assert sorted(plan.liquid_ids) == sorted(liquid_ids[name] for name in ('Rum', 'Cola', 'Vodka', 'Orange Juice'))
+    assert len(plan.makeable) == 3
+
+
+def test_optimizer_counts_substitutes_like_availability(service, liquid_ids):
+    service.set_liquid_substitution(liquid_ids['Vodka'], liquid_ids['Rum'])
+    service.update_pumps([{'id': 1, 'liquid_id': liquid_ids['Rum']}, {'id': 2, 'liquid_id': liquid_ids['Cola']}])
+
+    result = service.optimize_pumps(pinned_pump_ids=[1, 2, 3, 4])
+
+    assert makeable_names(service) == ['Cuba Libre', 'Vodka Cola']
+    assert result['current_makeable_count'] == result['makeable_count'] == 2
+
+
+def test_optimize_pumps_places_each_liquid_once(service, liquid_ids):
+    service.update_pumps([{'id': 1, 'liquid_id': liquid_ids['Rum']}, {'id': 2, 'liquid_id': liquid_ids['Rum']}])
+
+    result = service.optimize_pumps(time_budget=5)
+
+    assigned = [assignment['liquid'] for assignment in result['assignments']]
+    assert sorted(assigned) == ['Cola', 'Orange Juice', 'Rum', 'Vodka']
+    assert result['assignments'][0]['liquid'] == 'Rum' and not result['assignments'][0]['changed']
+    assert result['makeable_count'] == 3
+
+
+def test_optimize_pumps_keeps_leftover_liquids_unless_duplicated(service, liquid_ids):
+    service.update_pumps([
+        {'id': 1, 'liquid_id': liquid_ids['Grenadine']},
+        {'id': 2, 'liquid_id': liquid_ids['Rum']},
+        {'id': 3, 'liquid_id': liquid_ids['Rum']},
+    ])
+    service.db.execute_update("INSERT INTO pumps (id, pin) VALUES (5, 6)")
+    service.db.execute_update("INSERT INTO pumps (id, pin, liquid_id) VALUES (6, 7, ?)", (liquid_ids['Cola'],))
+
+    # Five liquids for six pumps: pump 1 keeps its grenadine, the second cola pump is emptied
+    result = service.optimize_pumps(pinned_pump_ids=[1], time_budget=5)
+
+    assigned = [assignment['liquid'] for assignment in result['assignments']]
+    assert sorted(filter(None, assigned)) == ['Cola', 'Grenadine', 'Orange Juice', 'Rum', 'Vodka']
+    assert assigned.count(None) == 1
+
+
+def test_optimize_pumps_drops_deleted_pinned_liquid(service):
+    service.db.update_pump_liquid(1, 9999)
+
+    result = service.optimize_pumps(pinned_pump_ids=[1], time_budget=5)
+
+    pump = result['assignments'][0]
+    assert (pump['liquid_id'], pump['changed']) == (None, True)
+    assert 9999 not in [assignment['liquid_id'] for assignment in result['assignments']]
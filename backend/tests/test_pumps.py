@@ -0,0 +1,51 @@
+"""Bulk pump updates (PUT /pumps): all or nothing, bad input rejected before writing"""
+import pytest
+
+
+def test_update_pumps_applies_all_changes(service, liquid_ids):
+    pumps = service.update_pumps([
+        {'id': 1, 'liquid_id': liquid_ids['Rum']},
+        {'id': 2, 'liquid_id': liquid_ids['Cola'], 'ml_per_second': 12.5},
+    ])
+
+    assert [(pump['id'], pump['liquid'], pump['ml_per_second']) for pump in pumps] == [
+        (1, 'Rum', 10.0), (2, 'Cola', 12.5)]
+    makeable = service.get_availability().cocktails(available_only=True)
+    assert [cocktail['name'] for cocktail in makeable] == ['Cuba Libre']
+
+
+@pytest.mark.parametrize("bad_update, error", [
+    ({'id': 99, 'liquid_id': None}, "Pump 99 not found"),
+    ({'id': 3, 'liquid_id': 9999}, "Liquid 9999 not found"),
+])
+def test_update_pumps_rolls_back_on_error(service, liquid_ids, bad_update, error):
+    with pytest.raises(ValueError, match=error):
+        service.update_pumps([{'id': 1, 'liquid_id': liquid_ids['Rum'], 'ml_per_second': 5.0}, bad_update])
+
+    pump = service.get_pump_by_id(1)
+    assert (pump['liquid_id'], pump['ml_per_second']) == (None, 10.0)
+    assert service.db.get_latest_calibration(liquid_ids['Rum']) is None
+
+
+def test_bulk_endpoint_rejects_unknown_liquid(client):
+    response = client.put('/api/v1/pumps', json={'pumps': [{'id': 1, 'liquid_id': 9999}]})
+
+    assert response.status_code == 404
+    assert response.json()['detail'] == "Liquid 9999 not found"
+    assert client.get('/api/v1/pumps/1').json()['liquid_id'] is None
+
+
+@pytest.mark.parametrize("ml_per_second", [None, 0, -1])
+def test_bulk_endpoint_rejects_bad_flow_rate(client, ml_per_second):
+    response = client.put('/api/v1/pumps', json={'pumps': [{'id': 1, 'ml_per_second': ml_per_second}]})
+
+    assert response.status_code == 422
+    assert client.get('/api/v1/pumps/1').json()['ml_per_second'] == 10.0
+
+
+def test_bulk_endpoint_empties_pump_with_null_liquid(client, liquid_ids):
+    client.put('/api/v1/pumps', json={'pumps': [{'id': 1, 'liquid_id': liquid_ids['Rum']}]})
+    response = client.put('/api/v1/pumps', json={'pumps': [{'id': 1, 'liquid_id': None}]})
+
+    assert response.status_code == 200
+    assert response.json()['data']['pumps'][0]['liquid_id'] is None
@@ -0,0 +1,18 @@
+"""The hot lookup queries must be served by indexes (see database/check_query_plans.py)"""
+import pytest
+
+from database.check_query_plans import HOT_LOOKUPS, table_scans
+from database.db_manager import DatabaseManager
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    """A freshly migrated, empty database"""
+    db = DatabaseManager(str(tmp_path_factory.mktemp("plans") / "plans.db"))
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("description, method, args", HOT_LOOKUPS, ids=[lookup[0] for lookup in HOT_LOOKUPS])
+def test_hot_lookup_uses_index(db, description, method, args):
+    assert table_scans(db, method, args) == []
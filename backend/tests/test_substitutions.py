@@ -0,0 +1,66 @@
+"""Liquid substitutions: transitive closure, availability and pour routing"""
+from services.substitutions import SubstitutionClosure
+
+
+def rule(liquid_id, substitute_id, ratio=1.0):
+    return {'liquid_id': liquid_id, 'substitute_id': substitute_id, 'ratio': ratio}
+
+
+def test_closure_follows_chains_nearest_first():
+    closure = SubstitutionClosure([rule(1, 2, 0.5), rule(2, 3, 2.0), rule(1, 4), rule(3, 1)])
+
+    assert closure.substitutes(1) == {2: 0.5, 4: 1.0, 3: 1.0}
+    assert closure.substitutes(3) == {1: 1.0, 2: 0.5, 4: 1.0}
+    assert closure.substitutes(4) == {}
+    assert not SubstitutionClosure()
+
+
+def test_closure_covers_and_routes():
+    closure = SubstitutionClosure([rule(1, 2, 0.5), rule(2, 3, 2.0)])
+
+    assert closure.covered([3]) == {1, 2, 3}
+    assert closure.covered([1]) == {1}
+    assert closure.route(1, [1, 3]) == (1, 1.0)
+    assert closure.route(1, [3]) == (3, 1.0)
+    assert closure.route(1, [4]) is None
+
+
+def makeable_names(service):
+    return sorted(cocktail['name'] for cocktail in service.get_availability().cocktails(available_only=True))
+
+
+def test_substitute_makes_cocktails_available(service, liquid_ids):
+    service.update_pumps([{'id': 1, 'liquid_id': liquid_ids['Rum']}, {'id': 2, 'liquid_id': liquid_ids['Cola']}])
+    assert makeable_names(service) == ['Cuba Libre']
+
+    service.set_liquid_substitution(liquid_ids['Vodka'], liquid_ids['Rum'], 0.8)
+    assert makeable_names(service) == ['Cuba Libre', 'Vodka Cola']
+
+    service.delete_liquid_substitution(liquid_ids['Vodka'], liquid_ids['Rum'])
+    assert makeable_names(service) == ['Cuba Libre']
+
+
+def test_route_liquid_pours_nearest_installed_substitute(service, liquid_ids):
+    service.set_liquid_substitution(liquid_ids['Vodka'], liquid_ids['Rum'], 0.8)
+    assert service.route_liquid(liquid_ids['Vodka']) is None
+
+    service.update_pumps([{'id': 3, 'liquid_id': liquid_ids['Rum']}])
+    route = service.route_liquid(liquid_ids['Vodka'])
+    assert (route['id'], route['liquid'], route['ratio']) == (3, 'Rum', 0.8)
+
+    service.update_pumps([{'id': 4, 'liquid_id': liquid_ids['Vodka']}])
+    route = service.route_liquid(liquid_ids['Vodka'])
+    assert (route['id'], route['ratio']) == (4, 1.0)
+
+
+def test_substitutes_endpoint(client, liquid_ids):
+    vodka, rum = liquid_ids['Vodka'], liquid_ids['Rum']
+
+    response = client.put(f'/api/v1/liquids/{vodka}/substitutes/{rum}', json={'ratio': 0.8})
+    assert response.status_code == 200
+    assert client.get(f'/api/v1/liquids/{vodka}/substitutes').json() == [
+        {'liquid_id': rum, 'liquid': 'Rum', 'ratio': 0.8}]
+
+    assert client.put(f'/api/v1/liquids/{vodka}/substitutes/{vodka}', json={'ratio': 1}).status_code == 400
+    assert client.delete(f'/api/v1/liquids/{vodka}/substitutes/{rum}').status_code == 200
+    assert client.delete(f'/api/v1/liquids/{vodka}/substitutes/{rum}').status_code == 404
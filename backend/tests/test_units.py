@@ -0,0 +1,24 @@
+"""Unit conversion: per-unit factors, settings overrides and fixed-volume units"""
+import pytest
+
+
+@pytest.mark.parametrize("amount, unit, ml", [
+    (4.5, "cl", 45.0),
+    (2, "oz", 59.147),
+    (3, "ml", 3.0),
+    (2, "tsp", 2.0),  # Unknown units are taken as ml
+    (1, "dash", 2.0),
+    (4, "dashes", 2.0),  # Any number of dashes pours one dash, as before
+    (1, "splash", 5.0),
+    (5, "splashes", 5.0),
+])
+def test_convert_to_ml(service, amount, unit, ml):
+    assert service.convert_to_ml(amount, unit) == pytest.approx(ml)
+
+
+def test_settings_override_units(service):
+    service.set_setting('cl_to_ml', '9')
+    service.set_setting('dash_to_ml', '1.5')
+
+    assert service.convert_to_ml(2, "cl") == 18.0
+    assert service.convert_to_ml(3, "Dashes") == 1.5